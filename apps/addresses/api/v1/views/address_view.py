@@ -9,6 +9,16 @@ from drf_spectacular.utils import extend_schema_view, extend_schema, OpenApiPara
 from apps.addresses.models import Address
 from apps.addresses.api.v1.serializers import AddressSerializer
 from apps.addresses.permissions import IsOwnerOrAdmin
+from common.pagination import KeysetPagination
+from common.views import ReplicaReadMixin
+
+
+class AddressPagination(KeysetPagination):
+    """
+    Addresses, oldest first; keyset-paginated on ``created_at, id``.
+    """
+    ordering = ('created_at', 'id')
+    max_page_size = 100
 
 
 @extend_schema_view(
@@ -44,7 +54,7 @@ from apps.addresses.permissions import IsOwnerOrAdmin
         description="Delete an existing address profile.",
     ),
 )
-class AddressViewSet(ModelViewSet):
+class AddressViewSet(ReplicaReadMixin, ModelViewSet):
     """
     ViewSet for the Address model.
     
@@ -52,7 +62,8 @@ class AddressViewSet(ModelViewSet):
     Regular users can only see and modify their own addresses.
     Admin users can see and modify all addresses.
     """
-    queryset = Address.objects.all().order_by('id')
+    queryset = Address.objects.all().order_by('created_at', 'id')
+    pagination_class = AddressPagination
     serializer_class = AddressSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
 
@@ -0,0 +1,22 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('addresses', '0006_alter_address_coordinates'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='address',
+            index=models.Index(fields=['created_at', 'id'], name='addresses_created_id'),
+        ),
+        AddIndexConcurrently(
+            model_name='address',
+            index=models.Index(fields=['created_by', 'created_at', 'id'], name='addresses_owner_created_id'),
+        ),
+    ]
@@ -55,6 +55,9 @@ class Address(models.Model):
         verbose_name_plural = _('Addresses')
         indexes = [
             models.Index(fields=['city', 'state', 'country']),
+            # Keyset pagination on (created_at, id), for admins and owners.
+            models.Index(fields=['created_at', 'id'], name='addresses_created_id'),
+            models.Index(fields=['created_by', 'created_at', 'id'], name='addresses_owner_created_id'),
         ]
 
 
@@ -17,4 +17,4 @@ class IsOwnerOrAdmin(permissions.BasePermission):
             return True
             
         # Write permissions are only allowed to the owner of the address
-        return obj.created_by == request.user
\ No newline at end of file
+        return obj.created_by_id == request.user.id
\ No newline at end of file
@@ -1,5 +1,7 @@
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from apps.drivers.roles import driver_id_for
+
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """
@@ -10,4 +12,5 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         token = super().get_token(user)
         token['is_staff'] = user.is_staff
         token['is_superuser'] = user.is_superuser
-        return token
\ No newline at end of file
+        token['driver_id'] = driver_id_for(user)
+        return token
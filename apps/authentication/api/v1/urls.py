@@ -3,12 +3,14 @@ from django.urls import path, include
 
 
 from apps.authentication.api.v1 import views as v
+from common.views import offload_sync_view
 
 router = DefaultRouter()
 
 
 urlpatterns = [
-    path('login/', v.CustomTokenObtainPairView.as_view(), name='login'),
+    path('login/', offload_sync_view(v.CustomTokenObtainPairView.as_view()), name='login'),
     path('token/refresh/', v.CustomTokenRefreshView.as_view(), name='token_refresh'),
     path('token/verify/', v.CustomTokenVerifyView.as_view(), name='token_verify'),
+    path('hashing/stats/', v.PasswordHashingStatsView.as_view(), name='password_hashing_stats'),
 ]
@@ -1,3 +1,4 @@
 from .token_obtain_view import CustomTokenObtainPairView
 from .token_refresh_view import CustomTokenRefreshView
-from .token_verify_view import CustomTokenVerifyView
\ No newline at end of file
+from .token_verify_view import CustomTokenVerifyView
+from .password_hashing_view import PasswordHashingStatsView
\ No newline at end of file
@@ -0,0 +1,22 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema, OpenApiResponse
+
+from apps.authentication.hashing import password_hashing_pool
+
+
+class PasswordHashingStatsView(APIView):
+    """
+    Password hashing pool counters of this process, for admins.
+    """
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        tags=["Authentication JWT"],
+        summary="Password hashing pool counters",
+        description="Queue depth, rejections and hash latency percentiles of this process.",
+        responses={200: OpenApiResponse(description="Password hashing pool counters.")},
+    )
+    def get(self, request, *args, **kwargs):
+        return Response(password_hashing_pool.stats())
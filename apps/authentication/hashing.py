@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PasswordHashingBusy(APIException):
+    """
+    The password hashing pool is full; rendered as a 503 with ``Retry-After``.
+    """
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _('Too many sign-ins in progress, please retry shortly.')
+    default_code = 'password_hashing_busy'
+
+    def __init__(self, detail=None, code=None):
+        super().__init__(detail, code)
+        # Read by DRF's exception handler to set the Retry-After header.
+        self.wait = settings.PASSWORD_HASHING_RETRY_AFTER_SECONDS
+
+
+def _percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class PasswordHashingPool:
+    """
+    Bounded thread pool that runs password hashes.
+
+    PBKDF2 runs inside OpenSSL with the GIL released, so the threads hash in
+    parallel. At most ``workers`` hashes run at once and ``max_pending`` more
+    wait for a thread; past that :meth:`run` fails at once with
+    :class:`PasswordHashingBusy` instead of queueing requests behind a login
+    storm. The pool is per process.
+    """
+
+    def __init__(self, workers, max_pending, history_size=500):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._in_flight = 0
+
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        # (queue wait, hash time) in milliseconds of the latest hashes.
+        self._history = deque(maxlen=history_size)
+
+    def run(self, fn, *args):
+        """
+        Run ``fn(*args)`` on a pool thread and wait for its result.
+
+        :raises PasswordHashingBusy: When ``workers + max_pending`` hashes are already in flight.
+        """
+        if getattr(self._local, 'worker', False):
+            return fn(*args)
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_pending:
+                self.rejected += 1
+                raise PasswordHashingBusy()
+            self._in_flight += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='password-hashing')
+        try:
+            return self._executor.submit(self._call, fn, args, time.monotonic()).result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _call(self, fn, args, submitted):
+        self._local.worker = True
+        started = time.monotonic()
+        with self._lock:
+            self.running += 1
+        try:
+            return fn(*args)
+        finally:
+            finished = time.monotonic()
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+                self._history.append(((started - submitted) * 1000, (finished - started) * 1000))
+
+    def stats(self):
+        """
+        Counters for monitoring: queue depth, rejections and latency percentiles.
+        """
+        with self._lock:
+            history = list(self._history)
+            queued = self._in_flight - self.running
+            running = self.running
+        waits = [wait for wait, _ in history]
+        hashes = [elapsed for _, elapsed in history]
+        return {
+            'workers': self.workers,
+            'max_pending': self.max_pending,
+            'queued': queued,
+            'running': running,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'wait_ms_p50': _percentile(waits, 0.5),
+            'wait_ms_p99': _percentile(waits, 0.99),
+            'hash_ms_p50': _percentile(hashes, 0.5),
+            'hash_ms_p99': _percentile(hashes, 0.99),
+        }
+
+
+password_hashing_pool = PasswordHashingPool(workers=settings.PASSWORD_HASHING_WORKERS,
+                                            max_pending=settings.PASSWORD_HASHING_MAX_PENDING)
+
+
+class PooledPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    ``pbkdf2_sha256`` hasher that computes on :data:`password_hashing_pool`.
+
+    It uses the same algorithm name and encoding, so existing hashes keep
+    working. Verification goes through :meth:`encode` as well.
+    """
+
+    def encode(self, password, salt, iterations=None):
+        return password_hashing_pool.run(super().encode, password, salt, iterations)
@@ -0,0 +1,71 @@
+import threading
+from unittest import mock
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.authentication.hashing import (PasswordHashingBusy, PasswordHashingPool, PooledPBKDF2PasswordHasher,
+                                         password_hashing_pool)
+
+
+class PasswordHashingPoolTests(SimpleTestCase):
+    """Test suite for the bounded password hashing pool."""
+
+    def test_rejects_when_workers_and_queue_are_full(self):
+        """Test that a full pool fails fast and counts the rejection."""
+        pool = PasswordHashingPool(workers=1, max_pending=0)
+        started, release = threading.Event(), threading.Event()
+
+        def slow_hash():
+            started.set()
+            release.wait(5)
+            return 'hash'
+
+        results = []
+        thread = threading.Thread(target=lambda: results.append(pool.run(slow_hash)))
+        thread.start()
+        started.wait(5)
+        try:
+            with self.assertRaises(PasswordHashingBusy):
+                pool.run(lambda: 'other')
+            self.assertEqual(pool.stats()['running'], 1)
+        finally:
+            release.set()
+            thread.join()
+
+        stats = pool.stats()
+        self.assertEqual(results, ['hash'])
+        self.assertEqual((stats['completed'], stats['rejected'], stats['queued']), (1, 1, 0))
+        self.assertIsNotNone(stats['hash_ms_p99'])
+
+    def test_pooled_hasher_is_compatible_with_pbkdf2(self):
+        """Test that pooled hashes verify with the stock hasher and the other way round."""
+        pooled, stock = PooledPBKDF2PasswordHasher(), PBKDF2PasswordHasher()
+        encoded = pooled.encode('s3cret-pass', pooled.salt(), iterations=1000)
+
+        self.assertTrue(stock.verify('s3cret-pass', encoded))
+        self.assertTrue(pooled.verify('s3cret-pass', stock.encode('s3cret-pass', stock.salt(), iterations=1000)))
+
+
+@override_settings(PASSWORD_HASHERS=['apps.authentication.hashing.PooledPBKDF2PasswordHasher'])
+class PasswordHashingOverloadTests(APITestCase):
+    """Test suite for the response of hashing endpoints under overload."""
+
+    def test_register_returns_503_with_retry_after(self):
+        """Test that registration is shed with a 503 and Retry-After when the pool is full."""
+        data = {
+            'username': 'storm_user',
+            'email': 'storm_user@example.com',
+            'password': 'Str0ngPassw0rd!',
+            'password2': 'Str0ngPassw0rd!',
+            'first_name': 'Storm',
+            'last_name': 'User',
+            'phone_number': '+1234567899',
+        }
+        with mock.patch.object(password_hashing_pool, 'run', side_effect=PasswordHashingBusy):
+            response = self.client.post(reverse('urls-v1:register'), data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn('Retry-After', response)
@@ -1,7 +1,10 @@
 from django.urls import reverse
 from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from django.contrib.gis.geos import Point
 
 from apps.authentication.tests.test_base import AuthenticationBaseTestCase
+from apps.drivers.models import Driver
 
 
 class TokenObtainViewTests(AuthenticationBaseTestCase):
@@ -64,4 +67,24 @@ class TokenObtainViewTests(AuthenticationBaseTestCase):
         # We could decode the token and verify the claims here, but that would require
         # importing additional libraries and is more of an integration test.
         # For now, we'll just verify the token was obtained successfully.
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_token_contains_driver_id_claim(self):
+        """Test the access token carries the driver id, or None for non-drivers."""
+        response = self.client.post(self.url, {'username': self.username, 'password': self.password}, format='json')
+        self.assertIsNone(AccessToken(response.data['access'])['driver_id'])
+        
+        driver = Driver.objects.create_user(
+            username='claim_driver',
+            email='claim_driver@example.com',
+            password=self.password,
+            phone_number='+1234567891',
+            vehicle_plate='CLM001',
+            vehicle_model='Chevrolet Spark',
+            vehicle_year=2020,
+            vehicle_color='Red',
+            location_coordinates=Point((-74.0000, 4.7000), srid=4326),
+            is_available=True
+        )
+        response = self.client.post(self.url, {'username': 'claim_driver', 'password': self.password}, format='json')
+        self.assertEqual(AccessToken(response.data['access'])['driver_id'], driver.pk)
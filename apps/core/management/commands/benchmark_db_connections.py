@@ -0,0 +1,48 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+import numpy as np
+
+
+class Command(BaseCommand):
+    help = ('Measure the per-request database connection overhead: a fresh PostGIS connection per '
+            'request (CONN_MAX_AGE=0) against a connection checked out of the pool')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+
+    def _measure(self, wrapper, requests):
+        """
+        Time ``requests`` request-like cycles: connect or check out, run one query, close or return.
+        """
+        timings = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            with wrapper.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            wrapper.close()
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    def _report(self, name, timings):
+        p50, p99 = np.percentile(timings, [50, 99])
+        self.stdout.write(self.style.SUCCESS(
+            f'{name:>16}: mean {np.mean(timings):7.2f} ms | p50 {p50:7.2f} ms | p99 {p99:7.2f} ms'
+        ))
+
+    def handle(self, *args, **options):
+        if connection.pool is None:
+            raise CommandError('The default database has no pool; set DATABASE_POOL_ENABLED=True.')
+
+        # Same settings without the pool: every cycle opens a new connection.
+        unpooled = connection.copy('benchmark_unpooled')
+        unpooled.settings_dict = {**connection.settings_dict,
+                                  'OPTIONS': {key: value for key, value in connection.settings_dict['OPTIONS'].items()
+                                              if key != 'pool'},
+                                  'CONN_MAX_AGE': 0}
+        connection.pool.open(wait=True)
+
+        self.stdout.write(f"{options['requests']} requests, one SELECT 1 each")
+        self._report('new connection', self._measure(unpooled, options['requests']))
+        self._report('pooled', self._measure(connection, options['requests']))
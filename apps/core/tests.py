@@ -1,3 +1,95 @@
-from django.test import TestCase
+import time
+from unittest import mock, skipIf
+from django.conf import settings
+from django.http import HttpResponse
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
 
-# Create your tests here.
+from apps.services.models import Service
+from common.db import ReplicaRouter, close_connection_pools, replica_reads, warm_up_connection_pools
+from common.db.routers import PIN_COOKIE, is_pinned_to_primary, pin_to_primary
+
+
+@skipIf(not settings.DATABASE_POOL_ENABLED, 'Connection pooling is disabled.')
+class ConnectionPoolTestCase(TestCase):
+    """Test case for the pooled database connections."""
+
+    def test_warm_up_fills_the_pool(self):
+        """Test that warming up opens the default pool with at least its minimum size."""
+        self.assertEqual(warm_up_connection_pools(), ['default'])
+        self.assertGreaterEqual(connection.pool.get_stats()['pool_size'], connection.pool.min_size)
+
+
+@skipIf(not settings.DATABASE_POOL_ENABLED, 'Connection pooling is disabled.')
+class ConnectionPoolWarmUpTestCase(TransactionTestCase):
+    """Test case for warming up a pool no connection has opened yet."""
+
+    def test_warm_up_opens_a_fresh_pool(self):
+        """Test that warming up opens the pool Django creates closed, as at worker start."""
+        connection.close_pool()
+        self.assertTrue(connection.pool.closed)
+
+        self.assertEqual(warm_up_connection_pools(), ['default'])
+        self.assertFalse(connection.pool.closed)
+        self.assertGreaterEqual(connection.pool.get_stats()['pool_size'], connection.pool.min_size)
+
+    def test_close_connection_pools_before_fork(self):
+        """Test that the pool is closed and replaced, so forked workers never share its sockets."""
+        pool = connection.pool
+        pool.open(wait=True)
+
+        close_connection_pools()
+
+        self.assertTrue(pool.closed)
+        self.assertIsNot(connection.pool, pool)
+        self.assertTrue(connection.pool.closed)
+
+
+@override_settings(DATABASE_REPLICAS=['replica_0'])
+class ReplicaRouterTestCase(SimpleTestCase):
+    """Test case for routing reads to the read replicas."""
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_reads_outside_replica_block_use_primary(self):
+        """Test that reads default to the primary."""
+        self.assertEqual(self.router.db_for_read(Service), 'default')
+
+    def test_reads_in_replica_block_use_replica(self):
+        """Test that reads inside replica_reads go to a replica and writes to the primary."""
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Service), 'replica_0')
+            self.assertEqual(self.router.db_for_write(Service), 'default')
+        self.assertEqual(self.router.db_for_read(Service), 'default')
+
+    def test_reads_after_write_use_primary(self):
+        """Test that a write pins the rest of the block to the primary, but not the next block."""
+        with replica_reads():
+            self.router.db_for_write(Service)
+            self.assertEqual(self.router.db_for_read(Service), 'default')
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Service), 'replica_0')
+
+    def test_pin_to_primary(self):
+        """Test that a user's pin to the primary travels in a signed cookie until it expires."""
+        request = RequestFactory().get('/')
+        self.assertFalse(is_pinned_to_primary(request, 1))
+
+        response = HttpResponse()
+        pin_to_primary(response, 1)
+        request.COOKIES[PIN_COOKIE] = response.cookies[PIN_COOKIE].value
+        self.assertTrue(is_pinned_to_primary(request, 1))
+        self.assertFalse(is_pinned_to_primary(request, 2))
+
+        later = time.time() + settings.DATABASE_REPLICA_PIN_SECONDS + 1
+        with mock.patch('django.core.signing.time.time', return_value=later):
+            self.assertFalse(is_pinned_to_primary(request, 1))
+
+        request.COOKIES[PIN_COOKIE] = '1'
+        self.assertFalse(is_pinned_to_primary(request, 1))
+
+    def test_migrations_only_on_primary(self):
+        """Test that replicas are never migrated."""
+        self.assertTrue(self.router.allow_migrate('default', 'services'))
+        self.assertFalse(self.router.allow_migrate('replica_0', 'services'))
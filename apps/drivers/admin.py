@@ -8,9 +8,10 @@ from apps.drivers.models import Driver
 class DriverAdmin(admin.ModelAdmin):
     """Admin view for Driver model."""
     
-    list_display = ('username', 'email', 'first_name', 'last_name', 'phone_number', 'vehicle_model', 'vehicle_year', 'vehicle_color', 'is_available')
+    list_display = ('username', 'email', 'first_name', 'last_name', 'phone_number', 'vehicle_model', 'vehicle_year', 'vehicle_color', 'dispatch_state__is_available')
+    list_select_related = ('dispatch_state',)
     search_fields = ('username', 'email', 'first_name', 'last_name')
-    list_filter = ('is_available',)
+    list_filter = ('dispatch_state__is_available',)
     ordering = ('username',)
     readonly_fields = ('date_joined',)
     
\ No newline at end of file
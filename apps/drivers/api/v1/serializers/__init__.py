@@ -1 +1,2 @@
-from .driver_serializer import DriverRegistrationSerializer, DriverListSerializer, DriverDetailSerializer
\ No newline at end of file
+from .driver_serializer import DriverRegistrationSerializer, DriverListSerializer, DriverDetailSerializer
+from .location_serializer import DriverLocationBatchSerializer
\ No newline at end of file
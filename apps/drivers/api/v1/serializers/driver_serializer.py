@@ -3,7 +3,7 @@ from rest_framework.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from rest_framework_gis.serializers import GeoFeatureModelSerializer, GeometryField
 
-from apps.drivers.models import Driver
+from apps.drivers.models import Driver, DriverDispatchState
 from apps.users.models import User
 
 
@@ -110,11 +110,19 @@ class DriverRegistrationSerializer(serializers.ModelSerializer):
         if 'password2' in validated_data:
             validated_data.pop('password2')
             
+        # Position and availability live in the dispatch state only.
+        changes = {field: validated_data.pop(field) for field in DriverDispatchState.DISPATCH_FIELDS
+                   if field in validated_data}
+        
         # Update the rest of the fields
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
             
         instance.save()
+        
+        state = DriverDispatchState.apply(instance, changes)
+        instance.location_coordinates = state.location_coordinates
+        instance.is_available = state.is_available
         return instance
 
 class DriverListSerializer(serializers.ModelSerializer):
@@ -123,8 +131,11 @@ class DriverListSerializer(serializers.ModelSerializer):
     """
     
     location_coordinates = GeometryField(
+        source='dispatch_state.location_coordinates',
+        read_only=True,
         help_text=_("Coordinates of the driver's location."),
     )
+    is_available = serializers.BooleanField(source='dispatch_state.is_available', read_only=True)
     
     class Meta:
         model = Driver
@@ -139,8 +150,11 @@ class DriverDetailSerializer(serializers.ModelSerializer):
     """
     
     location_coordinates = GeometryField(
+        source='dispatch_state.location_coordinates',
+        read_only=True,
         help_text=_("Coordinates of the driver's location."),
     )
+    is_available = serializers.BooleanField(source='dispatch_state.is_available', read_only=True)
     
     class Meta:
         model = Driver
@@ -0,0 +1,69 @@
+import time
+from numbers import Real
+from rest_framework import serializers
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+
+from apps.drivers.locations import is_valid_timestamp
+
+
+class LocationBatchField(serializers.Field):
+    """
+    List of ``[driver_id, lon, lat, timestamp]`` tuples, timestamp in Unix seconds
+    within the accepted clock skew (see ``locations.is_valid_timestamp``).
+
+    Validated in a single pass without a nested serializer per item. Returns
+    the pings as ``(driver_id, lon, lat, timestamp)`` tuples.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list) or not data:
+            raise serializers.ValidationError(_("Expected a non-empty list of locations."))
+        if len(data) > settings.DRIVER_LOCATION_BATCH_MAX_SIZE:
+            raise serializers.ValidationError(
+                _("At most %(max)d locations are allowed per batch.") % {'max': settings.DRIVER_LOCATION_BATCH_MAX_SIZE})
+
+        now = time.time()
+        pings = []
+        for index, item in enumerate(data):
+            if not isinstance(item, (list, tuple)) or len(item) != 4:
+                raise serializers.ValidationError(
+                    _("Item %(index)d must be [driver_id, lon, lat, timestamp].") % {'index': index})
+            driver_id, lon, lat, timestamp = item
+            if not isinstance(driver_id, int) or isinstance(driver_id, bool) or \
+                    not all(isinstance(value, Real) and not isinstance(value, bool) for value in (lon, lat, timestamp)):
+                raise serializers.ValidationError(
+                    _("Item %(index)d has invalid types.") % {'index': index})
+            if not (-180 <= lon <= 180) or not (-90 <= lat <= 90):
+                raise serializers.ValidationError(
+                    _("Item %(index)d has coordinates out of range.") % {'index': index})
+
+            if not is_valid_timestamp(timestamp, now):
+                raise serializers.ValidationError(
+                    _("Item %(index)d has a timestamp outside the accepted range.") % {'index': index})
+
+            pings.append((driver_id, float(lon), float(lat), timestamp))
+        return pings
+
+    def to_representation(self, value):
+        return value
+
+
+class DriverLocationBatchSerializer(serializers.Serializer):
+    """
+    Serializer for bulk driver location pings.
+
+    ``latest`` maps each driver id to the ``(lon, lat, timestamp)`` of its most recent ping.
+    """
+    locations = LocationBatchField(
+        help_text=_("List of [driver_id, lon, lat, timestamp] tuples. Only the latest ping per driver is applied."),
+    )
+
+    def validate(self, attrs):
+        latest = {}
+        for driver_id, lon, lat, timestamp in attrs['locations']:
+            previous = latest.get(driver_id)
+            if previous is None or timestamp >= previous[2]:
+                latest[driver_id] = (lon, lat, timestamp)
+        attrs['latest'] = latest
+        return attrs
@@ -8,5 +8,6 @@ router.register(r'drivers', v.DriverViewSet, basename='driver')
 
 
 urlpatterns = [
+    path('locations/', v.DriverLocationBulkView.as_view(), name='driver-locations'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1 +1,2 @@
-from .driver_view import DriverViewSet
\ No newline at end of file
+from .driver_view import DriverViewSet
+from .location_view import DriverLocationBulkView
\ No newline at end of file
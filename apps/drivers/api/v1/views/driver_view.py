@@ -4,11 +4,33 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
 from drf_spectacular.utils import extend_schema_view, extend_schema
+from django_filters import rest_framework as filters
 from django_filters.rest_framework import DjangoFilterBackend
 
 from apps.drivers.models import Driver
 from apps.drivers.api.v1.serializers import DriverRegistrationSerializer, DriverListSerializer, DriverDetailSerializer
 from apps.drivers.permissions import IsAdminOrSelf
+from common.pagination import KeysetPagination
+from common.views import OffloadedViewMixin, ReplicaReadMixin
+
+
+class DriverFilter(filters.FilterSet):
+    """
+    Filters for the driver list; availability is read from the dispatch state.
+    """
+    is_available = filters.BooleanFilter(field_name='dispatch_state__is_available')
+
+    class Meta:
+        model = Driver
+        fields = ['is_available', 'vehicle_model', 'vehicle_year', 'vehicle_color', 'id', 'username', 'email']
+
+
+class DriverPagination(KeysetPagination):
+    """
+    Drivers, most recently joined first; keyset-paginated on ``-date_joined, -id``.
+    """
+    ordering = ('-date_joined', '-id')
+    max_page_size = 50
 
 
 @extend_schema_view(
@@ -44,7 +66,7 @@ from apps.drivers.permissions import IsAdminOrSelf
         description="Delete an existing driver profile.",
     ),
 )
-class DriverViewSet(ModelViewSet):
+class DriverViewSet(OffloadedViewMixin, ReplicaReadMixin, ModelViewSet):
     """
     ViewSet for the Driver model.
     
@@ -52,12 +74,16 @@ class DriverViewSet(ModelViewSet):
     - Admin users can perform any action (list, create, retrieve, update, delete)
     - Drivers can only retrieve and update their own information
     - Only admins can list all drivers
+    
+    Served off Django's single sync thread under ASGI (see ``OffloadedViewMixin``):
+    registration waits on the password hashing pool.
     """
-    queryset = Driver.objects.all().order_by('-date_joined')
+    queryset = Driver.objects.select_related('dispatch_state').order_by('-date_joined', '-id')
+    pagination_class = DriverPagination
     serializer_class = DriverListSerializer
     permission_classes = [IsAuthenticated, IsAdminOrSelf]
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ['is_available', 'vehicle_model', 'vehicle_year', 'vehicle_color', 'id', 'username', 'email']
+    filterset_class = DriverFilter
     search_fields = ['username', 'email', 'first_name', 'last_name']
     
     def get_serializer_class(self):
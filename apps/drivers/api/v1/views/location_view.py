@@ -0,0 +1,66 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.exceptions import PermissionDenied
+from rest_framework import status
+from drf_spectacular.utils import extend_schema, OpenApiResponse
+from django.conf import settings
+from django.db import transaction
+
+from apps.drivers.api.v1.serializers import DriverLocationBatchSerializer
+from apps.drivers.locations import bulk_update_locations
+from apps.drivers.location_buffer import location_buffer
+from apps.drivers.location_history import record_pings
+from common.views import OffloadedViewMixin
+
+
+class DriverLocationBulkView(OffloadedViewMixin, APIView):
+    """
+    Bulk ingestion of driver location pings.
+
+    Admins (e.g. a telemetry gateway) can post pings for any driver; drivers
+    can only post their own. Admins can read the location buffer counters.
+    Served off Django's single sync thread under ASGI.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get_permissions(self):
+        if self.request.method == 'GET':
+            return [IsAdminUser()]
+        return super().get_permissions()
+
+    @extend_schema(
+        tags=["Driver Management"],
+        summary="Location buffer counters",
+        description="Pending positions, flush latency and rows written per second of this process.",
+        responses={200: OpenApiResponse(description="Location buffer counters.")},
+    )
+    def get(self, request, *args, **kwargs):
+        return Response(location_buffer.stats())
+
+    @extend_schema(
+        tags=["Driver Management"],
+        summary="Bulk update driver locations",
+        description="Apply a batch of location pings, keeping the latest one per driver.",
+        request=DriverLocationBatchSerializer,
+        responses={204: OpenApiResponse(description="Locations applied.")},
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = DriverLocationBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        pings = serializer.validated_data['locations']
+        latest = serializer.validated_data['latest']
+
+        user = request.user
+        if not (user.is_staff or user.is_superuser) and set(latest) != {user.id}:
+            raise PermissionDenied("Drivers can only report their own location.")
+
+        if settings.DRIVER_LOCATION_BUFFER_ENABLED:
+            location_buffer.put_many(latest, pings=pings)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        with transaction.atomic():
+            bulk_update_locations(latest)
+            if settings.DRIVER_LOCATION_HISTORY_ENABLED:
+                record_pings(pings)
+        return Response(status=status.HTTP_204_NO_CONTENT)
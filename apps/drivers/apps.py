@@ -7,4 +7,6 @@ class DriversConfig(AppConfig):
     name = 'apps.drivers'
     verbose_name = _('Drivers')
     label = 'drivers'
-    
+
+    def ready(self):
+        from apps.drivers import signals
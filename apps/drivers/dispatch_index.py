@@ -0,0 +1,180 @@
+import math
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+from apps.services.utils import haversine_km
+
+
+KM_PER_DEGREE = 111.32
+
+
+def cell_for(lon, lat, cell_size_deg):
+    """
+    Return the ``(column, row)`` grid cell that contains a point.
+    """
+    return int(math.floor(lon / cell_size_deg)), int(math.floor(lat / cell_size_deg))
+
+
+class DriverGridIndex:
+    """
+    In-memory grid of available drivers bucketed by fixed-size lon/lat cells.
+
+    Nearest-driver lookups scan rings of cells outward from the pickup cell
+    and stop as soon as no unscanned cell can hold a closer driver. The index
+    is per process and only used to pick candidates: the final claim is always
+    re-checked against PostGIS, so stale entries cost a fallback, never a
+    double booking.
+    """
+
+    def __init__(self, cell_size_deg=0.01, max_age_seconds=None):
+        self.cell_size_deg = cell_size_deg
+        self.max_age_seconds = max_age_seconds
+        self._cells = defaultdict(dict)
+        self._positions = {}
+        self._lock = threading.RLock()
+        self._loaded_at = None
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, driver_id):
+        return driver_id in self._positions
+
+    def update(self, driver_id, lon, lat, is_available=True):
+        """
+        Insert, move or remove a driver depending on its availability.
+        """
+        if not is_available:
+            self.discard(driver_id)
+            return
+        cell = cell_for(lon, lat, self.cell_size_deg)
+        with self._lock:
+            previous = self._positions.get(driver_id)
+            if previous is not None and previous[2] != cell:
+                self._remove_from_cell(driver_id, previous[2])
+            self._positions[driver_id] = (lon, lat, cell)
+            self._cells[cell][driver_id] = (lon, lat)
+
+    def update_from_driver(self, driver):
+        """
+        Sync the index with a ``Driver`` or ``DriverDispatchState`` instance.
+        """
+        point = driver.location_coordinates
+        if point is None:
+            self.discard(driver.pk)
+            return
+        self.update(driver.pk, point.x, point.y, driver.is_available)
+
+    def move_many(self, rows):
+        """
+        Move ``(driver_id, lon, lat)`` rows for drivers already in the index.
+
+        Availability is unknown for raw location updates, so drivers that are
+        not indexed are left out rather than added.
+        """
+        with self._lock:
+            for driver_id, lon, lat in rows:
+                if driver_id in self._positions:
+                    self.update(driver_id, lon, lat)
+
+    def discard(self, driver_id):
+        """
+        Remove a driver from the index if present.
+        """
+        with self._lock:
+            previous = self._positions.pop(driver_id, None)
+            if previous is not None:
+                self._remove_from_cell(driver_id, previous[2])
+
+    def _remove_from_cell(self, driver_id, cell):
+        bucket = self._cells.get(cell)
+        if bucket is None:
+            return
+        bucket.pop(driver_id, None)
+        if not bucket:
+            del self._cells[cell]
+
+    def clear(self):
+        with self._lock:
+            self._cells.clear()
+            self._positions.clear()
+            self._loaded_at = None
+
+    def load(self, rows):
+        """
+        Replace the index content with ``(driver_id, lon, lat)`` rows.
+        """
+        with self._lock:
+            self._cells.clear()
+            self._positions.clear()
+            for driver_id, lon, lat in rows:
+                self.update(driver_id, lon, lat)
+            self._loaded_at = time.monotonic()
+
+    def is_stale(self):
+        if self._loaded_at is None:
+            return True
+        if self.max_age_seconds is None:
+            return False
+        return time.monotonic() - self._loaded_at > self.max_age_seconds
+
+    def ensure_loaded(self):
+        """
+        (Re)load available drivers from the database when the index is cold or too old.
+        """
+        if not self.is_stale():
+            return
+        from apps.drivers.models import DriverDispatchState
+
+        rows = DriverDispatchState.objects.filter(is_available=True) \
+            .values_list('pk', 'location_coordinates')
+        self.load((pk, point.x, point.y) for pk, point in rows if point is not None)
+
+    def _ring(self, center, radius):
+        cx, cy = center
+        if radius == 0:
+            yield center
+            return
+        for dx in range(-radius, radius + 1):
+            yield cx + dx, cy - radius
+            yield cx + dx, cy + radius
+        for dy in range(-radius + 1, radius):
+            yield cx - radius, cy + dy
+            yield cx + radius, cy + dy
+
+    def nearest(self, lon, lat, k=1, max_radius_km=50.0):
+        """
+        Return up to ``k`` ``(driver_id, distance_km)`` pairs closest to a point.
+
+        :param lon: Longitude of the pickup point.
+        :param lat: Latitude of the pickup point.
+        :param k: Number of drivers to return.
+        :param max_radius_km: Stop expanding rings past this distance.
+        """
+        center = cell_for(lon, lat, self.cell_size_deg)
+        # Width of a cell at this latitude, the shortest side of the cell.
+        cell_km = self.cell_size_deg * KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01)
+        max_rings = int(max_radius_km / cell_km) + 1
+
+        found = []
+        with self._lock:
+            for radius in range(max_rings + 1):
+                for cell in self._ring(center, radius):
+                    for driver_id, (d_lon, d_lat) in self._cells.get(cell, {}).items():
+                        found.append((driver_id, haversine_km(lon, lat, d_lon, d_lat)))
+                if len(found) >= k:
+                    found.sort(key=lambda item: item[1])
+                    # Every cell outside this ring is at least radius * cell_km away.
+                    if found[k - 1][1] <= radius * cell_km:
+                        break
+        found.sort(key=lambda item: item[1])
+        return [item for item in found[:k] if item[1] <= max_radius_km]
+
+
+driver_index = DriverGridIndex(
+    cell_size_deg=settings.DISPATCH_INDEX_CELL_SIZE_DEG,
+    max_age_seconds=settings.DISPATCH_INDEX_REFRESH_SECONDS,
+)
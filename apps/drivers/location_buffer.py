@@ -0,0 +1,231 @@
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.contrib.gis.geos import Point
+from django.contrib.gis.measure import D
+from django.db import close_old_connections, transaction
+
+from apps.drivers import locations, location_history
+from apps.drivers.dispatch_index import driver_index
+from apps.services.utils import haversine_km
+
+
+logger = logging.getLogger(__name__)
+
+
+class LocationBuffer:
+    """
+    Last-write-wins buffer of driver positions flushed to PostGIS in batches.
+
+    Positions are kept per driver id in process memory, newest ping first
+    by its timestamp, and written every
+    ``flush_interval_ms`` with one bulk statement by a daemon thread, so a
+    driver pinging every second costs one row write per interval. Readers use
+    :meth:`get` to see positions that are not flushed yet. The buffer is per
+    process: other workers only see a position once it has been flushed.
+
+    With ``DRIVER_LOCATION_HISTORY_ENABLED`` every ping (not only the latest)
+    is also kept and appended to the location history with ``COPY`` on flush.
+
+    Pings outside the accepted clock skew are discarded on arrival. A batch
+    that fails to flush is retried with the next one; after ``max_attempts``
+    failures in a row it is dropped and counted in ``dropped`` so a single
+    bad row cannot stall every later write.
+    """
+
+    def __init__(self, flush_interval_ms=500, history_size=120, max_attempts=3):
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_attempts = max_attempts
+        self._failed_attempts = 0
+        self._pending = {}
+        # Positions taken by the running flush, still readable until committed.
+        self._flushing = {}
+        self._pings = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._stopped = threading.Event()
+
+        self.flushes = 0
+        self.rows_written = 0
+        self.dropped = 0
+        self.last_flush_ms = None
+        self.max_flush_ms = 0.0
+        self._history = deque(maxlen=history_size)
+
+    def __len__(self):
+        return len(self._pending)
+
+    def put(self, driver_id, lon, lat, recorded_at=None):
+        if recorded_at is None:
+            recorded_at = time.time()
+        self.put_many({driver_id: (lon, lat, recorded_at)}, pings=[(driver_id, lon, lat, recorded_at)])
+
+    def put_many(self, positions, pings=None):
+        """
+        Buffer a mapping of driver id to ``(lon, lat, recorded_at)``.
+
+        A buffered position is only replaced by a ping recorded at the same
+        time or later. Positions and pings with an invalid ``recorded_at``
+        (see ``locations.is_valid_timestamp``) are discarded.
+
+        :param pings: Optional ``(driver_id, lon, lat, recorded_at)`` tuples for the history.
+        """
+        now = time.time()
+        valid = {driver_id: position for driver_id, position in positions.items()
+                 if locations.is_valid_timestamp(position[2], now)}
+        rejected = len(positions) - len(valid)
+        record_history = pings and settings.DRIVER_LOCATION_HISTORY_ENABLED
+        if record_history:
+            pings = [ping for ping in pings if locations.is_valid_timestamp(ping[3], now)]
+        if rejected:
+            logger.warning('Discarded %d driver locations with an invalid timestamp', rejected)
+
+        moved = []
+        with self._lock:
+            for driver_id, position in valid.items():
+                previous = self._pending.get(driver_id)
+                if previous is None or position[2] >= previous[2]:
+                    self._pending[driver_id] = position
+                    moved.append((driver_id, position[0], position[1]))
+            if record_history:
+                self._pings.extend(pings)
+        if settings.DISPATCH_INDEX_ENABLED:
+            driver_index.move_many(moved)
+        self._ensure_started()
+
+    def get(self, driver_id):
+        """
+        Return the buffered ``(lon, lat)`` of a driver, or None when the database is current.
+        """
+        with self._lock:
+            position = self._pending.get(driver_id) or self._flushing.get(driver_id)
+        return position[:2] if position is not None else None
+
+    def refresh(self, driver, point=None):
+        """
+        Apply a buffered position to a ``Driver`` instance and its ``distance`` to ``point``.
+        """
+        position = self.get(driver.pk)
+        if position is None:
+            return driver
+        driver.location_coordinates = Point(position, srid=4326)
+        if point is not None:
+            driver.distance = D(km=haversine_km(*position, point.x, point.y))
+        return driver
+
+    def flush(self):
+        """
+        Write every buffered position with one bulk statement.
+
+        :return: Number of rows updated.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                self._flushing, self._pending = self._pending, {}
+                pings, self._pings = self._pings, []
+
+            started = time.monotonic()
+            try:
+                if pings:
+                    with transaction.atomic():
+                        written = locations.bulk_update_locations(self._flushing)
+                        location_history.record_pings(pings)
+                else:
+                    written = locations.bulk_update_locations(self._flushing)
+            except Exception:
+                with self._lock:
+                    self._failed_attempts += 1
+                    if self._failed_attempts >= self.max_attempts:
+                        # Give up on the batch; drivers send a fresh position with their next ping.
+                        self.dropped += len(self._flushing) + len(pings)
+                        logger.error('Dropped %d driver locations and %d history pings after %d failed flushes',
+                                     len(self._flushing), len(pings), self._failed_attempts)
+                        self._failed_attempts = 0
+                    else:
+                        # Put the positions back unless newer ones arrived meanwhile.
+                        for driver_id, position in self._flushing.items():
+                            pending = self._pending.get(driver_id)
+                            if pending is None or position[2] > pending[2]:
+                                self._pending[driver_id] = position
+                        self._pings = pings + self._pings
+                    self._flushing = {}
+                raise
+            elapsed_ms = (time.monotonic() - started) * 1000
+
+            with self._lock:
+                self._flushing = {}
+                self._failed_attempts = 0
+                self.flushes += 1
+                self.rows_written += written
+                self.last_flush_ms = elapsed_ms
+                self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+                self._history.append((time.monotonic(), written))
+            logger.debug('Flushed %d driver locations in %.1f ms', written, elapsed_ms)
+            return written
+
+    def stats(self):
+        """
+        Counters for monitoring: flush latency and rows written per second.
+        """
+        with self._lock:
+            history = list(self._history)
+            pending = len(self._pending)
+        rows_per_second = 0.0
+        if len(history) > 1:
+            span = history[-1][0] - history[0][0]
+            if span > 0:
+                # Rows of the first flush were written before the window started.
+                rows_per_second = sum(rows for _, rows in history[1:]) / span
+        return {
+            'pending': pending,
+            'flushes': self.flushes,
+            'rows_written': self.rows_written,
+            'dropped': self.dropped,
+            'last_flush_ms': self.last_flush_ms,
+            'max_flush_ms': self.max_flush_ms,
+            'rows_per_second': rows_per_second,
+        }
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='driver-location-flush', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Driver location flush failed')
+            finally:
+                close_old_connections()
+
+    def stop(self):
+        """
+        Stop the flush thread and write what is left.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        try:
+            self.flush()
+        except Exception:
+            # Runs at interpreter exit, where raising only hides the cause.
+            logger.exception('Final driver location flush failed; %d positions lost', len(self._pending))
+
+
+location_buffer = LocationBuffer(flush_interval_ms=settings.DRIVER_LOCATION_FLUSH_MS)
+atexit.register(location_buffer.stop)
@@ -0,0 +1,123 @@
+import datetime
+import io
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+from apps.drivers.models import DriverLocationPing
+
+
+TABLE = DriverLocationPing._meta.db_table
+PARTITION_PREFIX = f'{TABLE}_p'
+
+
+def partition_name(day):
+    return f'{PARTITION_PREFIX}{day:%Y%m%d}'
+
+
+def ensure_partitions(days):
+    """
+    Create the daily partitions covering ``days`` (dates, UTC) when missing.
+
+    Only called by ``manage_location_partitions``; writers never run DDL.
+    """
+    with connection.cursor() as cursor:
+        for day in sorted(set(days)):
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS {connection.ops.quote_name(partition_name(day))} '
+                f'PARTITION OF {connection.ops.quote_name(TABLE)} '
+                f'FOR VALUES FROM (%s) TO (%s)',
+                [f'{day.isoformat()} 00:00:00+00', f'{(day + datetime.timedelta(days=1)).isoformat()} 00:00:00+00'],
+            )
+
+
+def accepted_days():
+    """
+    Return the first and last UTC day a ping may be recorded in.
+
+    That is the retention window plus tomorrow, whose partitions
+    ``manage_location_partitions`` keeps created ahead.
+    """
+    today = timezone.now().astimezone(datetime.timezone.utc).date()
+    return (today - datetime.timedelta(days=settings.DRIVER_LOCATION_HISTORY_RETENTION_DAYS - 1),
+            today + datetime.timedelta(days=1))
+
+
+def list_partitions():
+    """
+    Return ``(day, table_name)`` pairs of the existing daily partitions, oldest first.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class parent ON parent.oid = pg_inherits.inhparent '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE parent.relname = %s',
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        try:
+            day = datetime.datetime.strptime(name[len(PARTITION_PREFIX):], '%Y%m%d').date()
+        except ValueError:
+            continue
+        partitions.append((day, name))
+    return sorted(partitions)
+
+
+def drop_partitions_before(day):
+    """
+    Drop every daily partition older than ``day``. Returns the dropped table names.
+    """
+    dropped = []
+    with connection.cursor() as cursor:
+        for partition_day, name in list_partitions():
+            if partition_day >= day:
+                break
+            cursor.execute(f'DROP TABLE {connection.ops.quote_name(name)}')
+            dropped.append(name)
+    return dropped
+
+
+def record_pings(pings):
+    """
+    Append location pings to the history with a single ``COPY``.
+
+    Pings recorded outside :func:`accepted_days` are skipped, so the partitions
+    written to are the ones ``manage_location_partitions`` created ahead.
+
+    :param pings: Iterable of ``(driver_id, lon, lat, recorded_at)`` with an
+        aware ``datetime`` or Unix seconds as ``recorded_at``.
+    :return: Number of rows written.
+    """
+    first_day, last_day = accepted_days()
+    start = datetime.datetime.combine(first_day, datetime.time(), tzinfo=datetime.timezone.utc).timestamp()
+    end = start + ((last_day - first_day).days + 1) * 86400
+    buffer = io.StringIO()
+    count = 0
+    for driver_id, lon, lat, recorded_at in pings:
+        if isinstance(recorded_at, datetime.datetime):
+            recorded_at = recorded_at.timestamp()
+        # Also skips NaN, which no comparison accepts.
+        if not start <= recorded_at < end:
+            continue
+        recorded_at = datetime.datetime.fromtimestamp(recorded_at, tz=datetime.timezone.utc)
+        buffer.write(f'{int(driver_id)}\tSRID=4326;POINT({float(lon)!r} {float(lat)!r})\t{recorded_at.isoformat()}\n')
+        count += 1
+    if not count:
+        return 0
+
+    buffer.seek(0)
+    sql = f'COPY {connection.ops.quote_name(TABLE)} (driver_id, location, recorded_at) FROM STDIN'
+    with connection.cursor() as cursor:
+        # COPY lives on the driver cursor wrapped by Django's cursor.
+        if is_psycopg3:
+            with cursor.cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+        else:
+            cursor.cursor.copy_expert(sql, buffer)
+    return count
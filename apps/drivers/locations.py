@@ -0,0 +1,67 @@
+import math
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from apps.drivers.models import DriverDispatchState
+from apps.drivers.dispatch_index import driver_index
+
+
+def is_valid_timestamp(timestamp, now=None):
+    """
+    Return whether a ping time in Unix seconds is finite and within the
+    accepted clock skew: ``DRIVER_LOCATION_MAX_AGE_SECONDS`` in the past to
+    ``DRIVER_LOCATION_MAX_FUTURE_SECONDS`` in the future.
+    """
+    if now is None:
+        now = time.time()
+    return (math.isfinite(timestamp)
+            and now - settings.DRIVER_LOCATION_MAX_AGE_SECONDS
+            <= timestamp <= now + settings.DRIVER_LOCATION_MAX_FUTURE_SECONDS)
+
+
+def bulk_update_locations(locations, chunk_size=1000):
+    """
+    Move many drivers with ``UPDATE ... FROM (VALUES ...)`` statements.
+
+    Only ``location_coordinates`` and ``last_seen`` of the dispatch state are
+    written: no model ``save()``, no signals and no ``users``/``drivers`` row
+    update. ``last_seen`` is the time the ping was recorded, and a row is only
+    updated when its ``last_seen`` is older, so a delayed or retried batch
+    never moves a driver back to an older position. The dispatch index is
+    moved on commit for the updated drivers it already holds.
+
+    :param locations: Mapping of driver id to ``(lon, lat, recorded_at)``, with
+        ``recorded_at`` in Unix seconds or None for the current time.
+    :param chunk_size: Rows per statement.
+    :return: Number of driver rows updated.
+    """
+    opts = DriverDispatchState._meta
+    table = connection.ops.quote_name(opts.db_table)
+    pk_column = connection.ops.quote_name(opts.pk.column)
+    location_column = connection.ops.quote_name(opts.get_field('location_coordinates').column)
+    last_seen_column = connection.ops.quote_name(opts.get_field('last_seen').column)
+
+    rows = [(driver_id, lon, lat, recorded_at) for driver_id, (lon, lat, recorded_at) in locations.items()]
+    moved = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            values = ', '.join(['(%s::bigint, %s::float8, %s::float8, %s::float8)'] * len(chunk))
+            cursor.execute(
+                f'UPDATE {table} AS d '
+                f'SET {location_column} = ST_SetSRID(ST_MakePoint(v.lon, v.lat), 4326)::geography, '
+                f'{last_seen_column} = v.recorded_at '
+                f'FROM (SELECT id, lon, lat, COALESCE(to_timestamp(ts), now()) AS recorded_at '
+                f'      FROM (VALUES {values}) AS p(id, lon, lat, ts)) AS v '
+                f'WHERE d.{pk_column} = v.id '
+                f'AND (d.{last_seen_column} IS NULL OR d.{last_seen_column} < v.recorded_at) '
+                f'RETURNING v.id, v.lon, v.lat',
+                [param for row in chunk for param in row],
+            )
+            moved.extend(cursor.fetchall())
+
+        if settings.DISPATCH_INDEX_ENABLED and moved:
+            transaction.on_commit(lambda: driver_index.move_many(moved))
+    return len(moved)
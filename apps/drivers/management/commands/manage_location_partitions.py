@@ -0,0 +1,33 @@
+import datetime
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.drivers.location_history import drop_partitions_before, ensure_partitions
+
+
+class Command(BaseCommand):
+    help = 'Create upcoming daily partitions of the driver location history and drop expired ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-days', type=int, default=settings.DRIVER_LOCATION_HISTORY_RETENTION_DAYS,
+                            help='Days of history to keep, today included.')
+        parser.add_argument('--ahead', type=int, default=3,
+                            help='Days of partitions to create in advance (at least 1: pings up to '
+                                 'tomorrow are recorded).')
+
+    def handle(self, *args, **options):
+        today = timezone.now().astimezone(datetime.timezone.utc).date()
+        ahead = max(options['ahead'], 1)
+
+        with transaction.atomic():
+            ensure_partitions(today + datetime.timedelta(days=offset) for offset in range(ahead + 1))
+            # Dropping a partition is a metadata change: no DELETE, no vacuum, no bloat.
+            dropped = drop_partitions_before(today - datetime.timedelta(days=options['retention_days'] - 1))
+
+        for name in dropped:
+            self.stdout.write(f'Dropped {name}')
+        self.stdout.write(self.style.SUCCESS(
+            f"Partitions ready until {today + datetime.timedelta(days=ahead)}, {len(dropped)} dropped"
+        ))
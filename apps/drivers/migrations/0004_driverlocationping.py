@@ -0,0 +1,52 @@
+import django.contrib.gis.db.models.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drivers', '0003_remove_driver_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql="""
+                        CREATE TABLE drivers_driverlocationping (
+                            id bigint GENERATED BY DEFAULT AS IDENTITY,
+                            driver_id bigint NOT NULL,
+                            location geometry(Point, 4326) NOT NULL,
+                            recorded_at timestamp with time zone NOT NULL,
+                            PRIMARY KEY (id, recorded_at)
+                        ) PARTITION BY RANGE (recorded_at);
+                        CREATE INDEX drivers_driverlocationping_recorded_at_brin
+                            ON drivers_driverlocationping USING brin (recorded_at);
+                        CREATE INDEX drivers_driverlocationping_location_gist
+                            ON drivers_driverlocationping USING gist (location);
+                    """,
+                    reverse_sql='DROP TABLE drivers_driverlocationping;',
+                ),
+            ],
+            state_operations=[
+                migrations.CreateModel(
+                    name='DriverLocationPing',
+                    fields=[
+                        ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                        ('location', django.contrib.gis.db.models.fields.PointField(srid=4326)),
+                        ('recorded_at', models.DateTimeField()),
+                        ('driver', models.ForeignKey(db_constraint=False, db_index=False,
+                                                     on_delete=django.db.models.deletion.DO_NOTHING,
+                                                     related_name='location_pings', to='drivers.driver')),
+                    ],
+                    options={
+                        'verbose_name': 'Driver location ping',
+                        'verbose_name_plural': 'Driver location pings',
+                        'db_table': 'drivers_driverlocationping',
+                        'managed': False,
+                    },
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,50 @@
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_dispatch_states(apps, schema_editor):
+    Driver = apps.get_model('drivers', 'Driver')
+    DriverDispatchState = apps.get_model('drivers', 'DriverDispatchState')
+    DriverDispatchState.objects.bulk_create(
+        (DriverDispatchState(driver_id=pk, location_coordinates=location, is_available=is_available)
+         for pk, location, is_available in
+         Driver.objects.values_list('pk', 'location_coordinates', 'is_available').iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drivers', '0004_driverlocationping'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DriverDispatchState',
+            fields=[
+                ('driver', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True,
+                                                related_name='dispatch_state', serialize=False,
+                                                to='drivers.driver')),
+                ('location_coordinates', django.contrib.gis.db.models.fields.PointField(geography=True, srid=4326)),
+                ('is_available', models.BooleanField(default=True)),
+                ('current_service_id', models.BigIntegerField(blank=True, null=True)),
+                ('last_seen', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Driver dispatch state',
+                'verbose_name_plural': 'Driver dispatch states',
+                'indexes': [django.contrib.postgres.indexes.GistIndex(fields=['location_coordinates'],
+                                                                      include=['driver'],
+                                                                      name='drivers_dispatch_location_gist')],
+            },
+        ),
+        # Leave room on each page so updates that do not touch indexed columns stay HOT.
+        migrations.RunSQL(
+            sql='ALTER TABLE drivers_driverdispatchstate SET (fillfactor = 70);',
+            reverse_sql='ALTER TABLE drivers_driverdispatchstate RESET (fillfactor);',
+        ),
+        migrations.RunPython(create_dispatch_states, migrations.RunPython.noop),
+    ]
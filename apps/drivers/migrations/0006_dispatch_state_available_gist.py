@@ -0,0 +1,22 @@
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drivers', '0005_driverdispatchstate'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='driverdispatchstate',
+            name='drivers_dispatch_location_gist',
+        ),
+        migrations.AddIndex(
+            model_name='driverdispatchstate',
+            index=django.contrib.postgres.indexes.GistIndex(condition=models.Q(('is_available', True)),
+                                                            fields=['location_coordinates'],
+                                                            name='drivers_dispatch_available_gist'),
+        ),
+    ]
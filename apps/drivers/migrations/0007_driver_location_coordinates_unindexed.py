@@ -0,0 +1,18 @@
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drivers', '0006_dispatch_state_available_gist'),
+    ]
+
+    operations = [
+        # The driver columns only seed the dispatch state; nothing searches them.
+        migrations.AlterField(
+            model_name='driver',
+            name='location_coordinates',
+            field=django.contrib.gis.db.models.fields.PointField(geography=True, spatial_index=False, srid=4326),
+        ),
+    ]
@@ -1 +1,3 @@
-from .driver_model import Driver
\ No newline at end of file
+from .driver_model import Driver
+from .dispatch_state_model import DriverDispatchState
+from .location_ping_model import DriverLocationPing
\ No newline at end of file
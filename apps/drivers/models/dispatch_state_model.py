@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from django.contrib.gis.db import models
+from django.contrib.postgres.indexes import GistIndex
+
+from apps.drivers.models.driver_model import Driver
+
+
+class DriverDispatchState(models.Model):
+    """
+    Narrow, dispatch-only copy of a driver's position and availability.
+
+    ``Driver`` inherits from ``User``, so reading or saving it touches two wide
+    tables. Dispatch, completion and location ingestion read and write this
+    table only. A new driver's row is seeded from its profile by a signal and
+    profile edits are applied by the driver serializer. Rows are small and the
+    table uses a lower fillfactor so updates that touch no indexed column
+    (``current_service_id`` bookkeeping) can be HOT updates.
+    """
+    # Written by the dispatch paths in this app and in services.
+    DISPATCH_FIELDS = ('location_coordinates', 'is_available')
+
+    driver = models.OneToOneField(Driver,
+                                  on_delete=models.CASCADE,
+                                  primary_key=True,
+                                  related_name='dispatch_state')
+    location_coordinates = models.PointField(geography=True, srid=4326)
+    is_available = models.BooleanField(default=True)
+    # Plain id instead of a FK: services already depends on drivers.
+    current_service_id = models.BigIntegerField(null=True, blank=True)
+    last_seen = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        app_label = 'drivers'
+        verbose_name = _('Driver dispatch state')
+        verbose_name_plural = _('Driver dispatch states')
+        indexes = [
+            # Only available drivers are ever searched by distance; busy ones
+            # stay out of the index the KNN claim query walks.
+            GistIndex(fields=['location_coordinates'], condition=models.Q(is_available=True),
+                      name='drivers_dispatch_available_gist'),
+        ]
+
+    @classmethod
+    def apply(cls, driver, changes):
+        """
+        Write ``changes`` (a subset of ``DISPATCH_FIELDS``) to the state of ``driver``.
+
+        The row is created from the driver's values when it does not exist yet.
+        The dispatch index is synced once the transaction commits.
+        """
+        initial = {field: getattr(driver, field) for field in cls.DISPATCH_FIELDS}
+        if changes:
+            state, _ = cls.objects.update_or_create(driver=driver, defaults=changes,
+                                                    create_defaults={**initial, **changes})
+        else:
+            state, _ = cls.objects.get_or_create(driver=driver, defaults=initial)
+
+        if settings.DISPATCH_INDEX_ENABLED:
+            from apps.drivers.dispatch_index import driver_index
+
+            transaction.on_commit(lambda: driver_index.update_from_driver(state))
+        return state
+
+    def __str__(self):
+        return f"{self.driver_id} - {'available' if self.is_available else 'busy'}"
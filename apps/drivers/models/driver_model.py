@@ -13,8 +13,10 @@ class Driver(User):
     vehicle_model = models.CharField(max_length=100)
     vehicle_year = models.PositiveIntegerField()
     vehicle_color = models.CharField(max_length=30)
-    location_coordinates = models.PointField(geography=True,
-                                            srid=4326, db_index=True)
+    # Deprecated: only seed the dispatch state of a new driver. Position and
+    # availability are read and written on ``DriverDispatchState``, so these
+    # columns are not kept up to date and are not indexed.
+    location_coordinates = models.PointField(geography=True, srid=4326, spatial_index=False)
     is_available = models.BooleanField(default=True)
     
     # objects = GeoManager()
@@ -0,0 +1,30 @@
+from django.utils.translation import gettext_lazy as _
+from django.contrib.gis.db import models
+
+
+class DriverLocationPing(models.Model):
+    """
+    Append-only history of driver positions.
+
+    The table is created by migration SQL, range-partitioned by day on
+    ``recorded_at`` with a BRIN index on ``recorded_at`` and a GiST index on
+    ``location``. Rows are written in batches with ``COPY`` (see
+    ``apps.drivers.location_history``) and old days are removed by dropping
+    partitions with ``manage.py manage_location_partitions``.
+    """
+    id = models.BigAutoField(primary_key=True)
+    # No FK constraint or B-tree index: both would make every appended row more expensive.
+    driver = models.ForeignKey('drivers.Driver',
+                               on_delete=models.DO_NOTHING,
+                               db_constraint=False,
+                               db_index=False,
+                               related_name='location_pings')
+    location = models.PointField(srid=4326)
+    recorded_at = models.DateTimeField()
+
+    class Meta:
+        app_label = 'drivers'
+        managed = False
+        db_table = 'drivers_driverlocationping'
+        verbose_name = _('Driver location ping')
+        verbose_name_plural = _('Driver location pings')
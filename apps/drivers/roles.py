@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.drivers.models import Driver
+
+
+def _cache_key(user_id):
+    return f'drivers:is-driver:{user_id}'
+
+
+def driver_id_for(user):
+    """
+    Return the ``Driver`` id of a user, or None when the user is not a driver.
+
+    A driver shares its primary key with its user row, so the answer only
+    changes when a driver profile is created or deleted. It is kept on the
+    user object for the rest of the request and cached for
+    ``DRIVER_ROLE_CACHE_SECONDS``; the driver signals clear the entry of the
+    process that made the change.
+    """
+    if user is None or not user.is_authenticated:
+        return None
+    if isinstance(user, Driver):
+        return user.pk
+    if not hasattr(user, '_driver_id'):
+        is_driver = cache.get(_cache_key(user.pk))
+        if is_driver is None:
+            is_driver = Driver.objects.filter(pk=user.pk).exists()
+            cache.set(_cache_key(user.pk), is_driver, settings.DRIVER_ROLE_CACHE_SECONDS)
+        user._driver_id = user.pk if is_driver else None
+    return user._driver_id
+
+
+def driver_id_from_request(request):
+    """
+    Return the ``Driver`` id of the requesting user, read from the token's
+    ``driver_id`` claim when there is one.
+
+    The claim is set when the token pair is issued and copied to refreshed
+    access tokens, so a user who becomes a driver gets the role on their
+    next login. Tokens without the claim fall back to :func:`driver_id_for`.
+    """
+    token = request.auth
+    if token is not None and 'driver_id' in token:
+        return token['driver_id']
+    return driver_id_for(request.user)
+
+
+def forget_driver_role(user_id):
+    """
+    Drop the cached driver role of a user.
+    """
+    cache.delete(_cache_key(user_id))
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.drivers.models import Driver, DriverDispatchState
+from apps.drivers.dispatch_index import driver_index
+from apps.drivers.roles import forget_driver_role
+
+
+@receiver(post_save, sender=Driver)
+def create_dispatch_state(sender, instance, created, **kwargs):
+    """
+    Seed the dispatch state of a new driver from its profile.
+
+    Later profile saves leave the state alone: dispatch and location writes
+    only go to ``DriverDispatchState``, and profile edits of position or
+    availability are applied by ``DriverRegistrationSerializer.update``.
+    """
+    if created:
+        DriverDispatchState.apply(instance, None)
+        forget_driver_role(instance.pk)
+
+
+@receiver(post_delete, sender=Driver)
+def sync_driver_index_on_delete(sender, instance, **kwargs):
+    """
+    Drop deleted drivers from the in-process dispatch index and the role cache.
+    """
+    forget_driver_role(instance.pk)
+    if settings.DISPATCH_INDEX_ENABLED:
+        transaction.on_commit(lambda: driver_index.discard(instance.pk))
@@ -0,0 +1,98 @@
+import json
+import time
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.drivers.models import Driver
+from apps.drivers.location_buffer import location_buffer
+from apps.drivers.locations import is_valid_timestamp
+
+
+# Application close codes (4000-4999 are reserved for applications).
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_FORBIDDEN = 4403
+
+
+def _authenticate(scope):
+    """
+    Return the access token passed as ``?token=`` or None when it is missing or invalid.
+    """
+    query = parse_qs(scope.get('query_string', b'').decode())
+    token = query.get('token', [None])[0]
+    if not token:
+        return None
+    try:
+        return AccessToken(token)
+    except TokenError:
+        return None
+
+
+def _parse_frame(message):
+    """
+    Parse a ``{"lon": .., "lat": .., "ts": ..}`` or ``[lon, lat, ts]`` frame.
+
+    ``ts`` (Unix seconds) is optional but must be within the accepted clock
+    skew (see ``locations.is_valid_timestamp``). Returns ``(lon, lat, ts)``
+    or None when invalid.
+    """
+    try:
+        frame = json.loads(message.get('text') or message.get('bytes') or b'')
+        if isinstance(frame, dict):
+            lon, lat, timestamp = frame['lon'], frame['lat'], frame.get('ts')
+        else:
+            lon, lat, timestamp = (list(frame[:3]) + [None])[:3]
+        lon, lat = float(lon), float(lat)
+        timestamp = float(timestamp) if timestamp is not None else None
+    except (ValueError, TypeError, KeyError, IndexError):
+        return None
+    if not (-180 <= lon <= 180) or not (-90 <= lat <= 90):
+        return None
+    if timestamp is not None and not is_valid_timestamp(timestamp):
+        return None
+    return lon, lat, timestamp
+
+
+async def driver_location_stream(scope, receive, send):
+    """
+    ASGI WebSocket app for drivers streaming their position.
+
+    The JWT access token is verified once when the socket opens; afterwards
+    each text frame is a position written to the location buffer. Invalid
+    frames are answered with an error frame and otherwise ignored. The socket
+    is closed with 4401 once the token expires.
+    """
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+
+    token = _authenticate(scope)
+    if token is None:
+        await send({'type': 'websocket.close', 'code': CLOSE_UNAUTHORIZED})
+        return
+    driver_id = token[jwt_settings.USER_ID_CLAIM]
+    if not await sync_to_async(Driver.objects.filter(pk=driver_id).exists)():
+        await send({'type': 'websocket.close', 'code': CLOSE_FORBIDDEN})
+        return
+    await send({'type': 'websocket.accept'})
+
+    expires_at = token['exp']
+    while True:
+        message = await receive()
+        if message['type'] == 'websocket.disconnect':
+            return
+        if message['type'] != 'websocket.receive':
+            continue
+        if time.time() >= expires_at:
+            await send({'type': 'websocket.close', 'code': CLOSE_UNAUTHORIZED})
+            return
+
+        position = _parse_frame(message)
+        if position is None:
+            await send({'type': 'websocket.send', 'text': json.dumps({'error': 'invalid frame'})})
+            continue
+        lon, lat, timestamp = position
+        location_buffer.put(driver_id, lon, lat, recorded_at=timestamp)
@@ -0,0 +1,129 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.contrib.gis.geos import Point
+
+from apps.drivers.models import Driver, DriverDispatchState
+from apps.drivers.dispatch_index import DriverGridIndex, driver_index
+from apps.addresses.models import Address
+from apps.drivers.api.v1.serializers import DriverRegistrationSerializer
+from apps.services.dispatch import claim_closest_driver, complete_service
+from apps.services.models import Service
+from apps.users.models import User
+
+
+class DriverGridIndexTest(SimpleTestCase):
+    """Test cases for the in-process driver grid index."""
+
+    def setUp(self):
+        self.index = DriverGridIndex(cell_size_deg=0.01)
+        self.index.load([
+            (1, -74.0721, 4.7110),
+            (2, -74.0600, 4.7110),
+            (3, -74.1500, 4.7110),
+            (4, -75.5636, 6.2518),  # Medellin
+        ])
+
+    def test_nearest_returns_closest_first(self):
+        """Test that drivers come back ordered by distance."""
+        result = self.index.nearest(-74.0720, 4.7110, k=3)
+        self.assertEqual([driver_id for driver_id, _ in result], [1, 2, 3])
+        self.assertLess(result[0][1], 0.1)
+
+    def test_nearest_expands_rings_until_found(self):
+        """Test that an empty neighbourhood is searched outward."""
+        result = self.index.nearest(-74.1400, 4.7110, k=1)
+        self.assertEqual(result[0][0], 3)
+
+    def test_nearest_respects_max_radius(self):
+        """Test that drivers beyond the search radius are ignored."""
+        result = self.index.nearest(-75.5636, 6.2518, k=2, max_radius_km=10)
+        self.assertEqual([driver_id for driver_id, _ in result], [4])
+
+    def test_update_moves_driver_between_cells(self):
+        """Test that a location update relocates the driver."""
+        self.index.update(3, -74.0722, 4.7111)
+        result = self.index.nearest(-74.0722, 4.7111, k=1)
+        self.assertEqual(result[0][0], 3)
+
+    def test_unavailable_driver_is_removed(self):
+        """Test that availability changes drop drivers from the index."""
+        self.index.update(1, -74.0721, 4.7110, is_available=False)
+        self.assertNotIn(1, self.index)
+        self.assertEqual(self.index.nearest(-74.0721, 4.7110, k=1)[0][0], 2)
+
+
+@override_settings(DISPATCH_INDEX_ENABLED=True)
+class DriverIndexDispatchTest(TestCase):
+    """Test cases for index-assisted driver claiming."""
+
+    def setUp(self):
+        driver_index.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.near = Driver.objects.create_user(
+                username='index_near',
+                email='index_near@example.com',
+                password='testpassword123',
+                phone_number='+1999000111',
+                vehicle_plate='IDX001',
+                vehicle_model='Kia Picanto',
+                vehicle_year=2021,
+                vehicle_color='Red',
+                location_coordinates=Point((-74.0721, 4.7110), srid=4326),
+                is_available=True
+            )
+            self.far = Driver.objects.create_user(
+                username='index_far',
+                email='index_far@example.com',
+                password='testpassword123',
+                phone_number='+1999000222',
+                vehicle_plate='IDX002',
+                vehicle_model='Kia Picanto',
+                vehicle_year=2021,
+                vehicle_color='Blue',
+                location_coordinates=Point((-74.2000, 4.7110), srid=4326),
+                is_available=True
+            )
+
+    def tearDown(self):
+        driver_index.clear()
+
+    def test_profile_edits_keep_index_in_sync(self):
+        """Test that marking a driver unavailable removes it from the index."""
+        self.assertIn(self.near.pk, driver_index)
+        serializer = DriverRegistrationSerializer(instance=self.near, data={'is_available': False}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with self.captureOnCommitCallbacks(execute=True):
+            serializer.save()
+        self.assertNotIn(self.near.pk, driver_index)
+
+    def test_claim_uses_index_candidates(self):
+        """Test that the claim picks the nearest candidate and evicts it once committed."""
+        with self.captureOnCommitCallbacks(execute=True):
+            driver = claim_closest_driver(Point((-74.0720, 4.7110), srid=4326))
+            self.assertEqual(driver.pk, self.near.pk)
+            self.assertIn(self.near.pk, driver_index)
+        self.assertNotIn(self.near.pk, driver_index)
+
+    def test_completion_returns_driver_to_index(self):
+        """Test that completing a service puts its freed driver back in the index."""
+        client = User.objects.create_user(username='index_client', email='index_client@example.com',
+                                          password='testpassword123', phone_number='+1999000333')
+        address = Address.objects.create(street='Calle 100', city='Bogota', state='Cundinamarca',
+                                         country='Colombia', postal_code='110111',
+                                         coordinates=Point((-74.0720, 4.7110), srid=4326), created_by=client)
+        with self.captureOnCommitCallbacks(execute=True):
+            driver = claim_closest_driver(address.coordinates)
+            service = Service.objects.create(client=client, driver_id=driver.pk, pickup_address=address,
+                                             status='IN_PROGRESS')
+            DriverDispatchState.objects.filter(pk=driver.pk).update(current_service_id=service.pk)
+        self.assertNotIn(driver.pk, driver_index)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            complete_service(service.pk, service.version)
+        self.assertIn(driver.pk, driver_index)
+
+    def test_claim_falls_back_to_database_when_index_is_stale(self):
+        """Test that stale index entries fall back to the PostGIS query."""
+        driver_index.load([(self.near.pk, -74.0721, 4.7110)])
+        DriverDispatchState.objects.filter(pk=self.near.pk).update(is_available=False)
+        driver = claim_closest_driver(Point((-74.0720, 4.7110), srid=4326))
+        self.assertEqual(driver.pk, self.far.pk)
@@ -0,0 +1,65 @@
+from django.test import TestCase
+from django.contrib.gis.geos import Point
+
+from apps.drivers.api.v1.serializers import DriverRegistrationSerializer
+from apps.drivers.models import Driver, DriverDispatchState
+
+
+class DriverDispatchStateTest(TestCase):
+    """Test cases for keeping the dispatch state in sync with driver profiles."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.driver = Driver.objects.create_user(
+            username='statedriver',
+            email='statedriver@example.com',
+            password='testpassword123',
+            phone_number='+1999666555',
+            vehicle_plate='STA123',
+            vehicle_model='Mazda 2',
+            vehicle_year=2022,
+            vehicle_color='Red',
+            location_coordinates=Point((-74.0721, 4.7110), srid=4326),
+            is_available=True
+        )
+
+    def test_state_created_with_driver(self):
+        """Test that creating a driver creates its dispatch state."""
+        state = DriverDispatchState.objects.get(pk=self.driver.pk)
+        self.assertTrue(state.is_available)
+        self.assertAlmostEqual(state.location_coordinates.x, -74.0721)
+        self.assertIsNone(state.current_service_id)
+
+    def test_profile_save_keeps_newer_dispatch_values(self):
+        """Test that saving unrelated profile fields does not undo dispatch writes."""
+        DriverDispatchState.objects.filter(pk=self.driver.pk).update(
+            is_available=False, location_coordinates=Point((-74.08, 4.72), srid=4326))
+
+        self.driver.vehicle_color = 'Black'
+        self.driver.save()
+
+        state = DriverDispatchState.objects.get(pk=self.driver.pk)
+        self.assertFalse(state.is_available)
+        self.assertAlmostEqual(state.location_coordinates.x, -74.08)
+
+    def test_profile_save_does_not_query_dispatch_state(self):
+        """Test that saving a driver profile costs only its own UPDATEs."""
+        self.driver.vehicle_color = 'Black'
+        with self.assertNumQueries(2):  # users and drivers rows
+            self.driver.save()
+
+    def test_serializer_applies_dispatch_changes_once(self):
+        """Test that position and availability edits are written to the state in one statement."""
+        serializer = DriverRegistrationSerializer(instance=self.driver, partial=True, data={
+            'is_available': False,
+            'location_coordinates': {'type': 'Point', 'coordinates': [-74.09, 4.73]},
+        })
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        state = DriverDispatchState.objects.get(pk=self.driver.pk)
+        self.assertFalse(state.is_available)
+        self.assertAlmostEqual(state.location_coordinates.x, -74.09)
+        # The deprecated driver columns only seed new states.
+        self.driver.refresh_from_db()
+        self.assertTrue(self.driver.is_available)
@@ -0,0 +1,142 @@
+import time
+from unittest import mock
+from django.test import SimpleTestCase, TestCase
+from django.contrib.gis.geos import Point
+
+from apps.drivers import location_buffer, locations
+from apps.drivers.models import Driver, DriverDispatchState
+from apps.drivers.location_buffer import LocationBuffer
+
+
+class LocationBufferTest(SimpleTestCase):
+    """Test cases for the write-coalescing location buffer."""
+
+    def setUp(self):
+        self.buffer = LocationBuffer(flush_interval_ms=60_000)
+        # Keep the flush thread out of the way; tests flush explicitly.
+        self.buffer._ensure_started = lambda: None
+        self.now = time.time()
+
+    def test_last_write_wins_and_single_flush(self):
+        """Test that repeated pings collapse into one row per driver."""
+        self.buffer.put(1, -74.0, 4.7, recorded_at=self.now)
+        self.buffer.put(1, -74.1, 4.8, recorded_at=self.now + 1)
+        self.buffer.put_many({2: (-74.2, 4.9, self.now)})
+        self.assertEqual(self.buffer.get(1), (-74.1, 4.8))
+
+        with mock.patch.object(locations, 'bulk_update_locations', return_value=2) as bulk_update:
+            self.assertEqual(self.buffer.flush(), 2)
+            self.assertEqual(self.buffer.flush(), 0)
+
+        bulk_update.assert_called_once_with({1: (-74.1, 4.8, self.now + 1), 2: (-74.2, 4.9, self.now)})
+        self.assertIsNone(self.buffer.get(1))
+        stats = self.buffer.stats()
+        self.assertEqual((stats['flushes'], stats['rows_written'], stats['pending']), (1, 2, 0))
+        self.assertIsNotNone(stats['last_flush_ms'])
+
+    def test_failed_flush_keeps_newer_positions(self):
+        """Test that a failed write puts positions back without overwriting newer ones."""
+        self.buffer.put_many({1: (-74.0, 4.7, self.now - 10), 2: (-74.2, 4.9, self.now - 10)})
+
+        def fail(positions):
+            self.buffer.put(1, -74.5, 4.5)
+            raise RuntimeError('database down')
+
+        with mock.patch.object(locations, 'bulk_update_locations', side_effect=fail):
+            with self.assertRaises(RuntimeError):
+                self.buffer.flush()
+
+        self.assertEqual(self.buffer.get(1), (-74.5, 4.5))
+        self.assertEqual(self.buffer.get(2), (-74.2, 4.9))
+
+    def test_flush_thread_survives_failed_flush(self):
+        """Test that a database error is logged and the next interval flushes again."""
+        buffer = LocationBuffer(flush_interval_ms=10)
+        calls = []
+
+        def fail_once(positions):
+            calls.append(dict(positions))
+            if len(calls) == 1:
+                raise RuntimeError('database down')
+            return len(positions)
+
+        with mock.patch.object(locations, 'bulk_update_locations', side_effect=fail_once), \
+                mock.patch.object(location_buffer, 'close_old_connections'), \
+                self.assertLogs(location_buffer.logger, 'ERROR'):
+            buffer.put(1, -74.0, 4.7)
+            for _ in range(200):
+                if buffer.rows_written:
+                    break
+                time.sleep(0.01)
+            buffer.stop()
+
+        self.assertEqual(buffer.rows_written, 1)
+        self.assertEqual(calls[0], calls[1])
+
+    def test_older_ping_does_not_replace_buffered_position(self):
+        """Test that a delayed ping arriving after a newer one is ignored."""
+        self.buffer.put(1, -74.1, 4.8, recorded_at=self.now)
+        self.buffer.put(1, -74.0, 4.7, recorded_at=self.now - 100)
+        self.assertEqual(self.buffer.get(1), (-74.1, 4.8))
+
+    def test_invalid_timestamps_are_discarded(self):
+        """Test that pings outside the accepted clock skew never reach the flush."""
+        with self.settings(DRIVER_LOCATION_HISTORY_ENABLED=True), self.assertLogs(location_buffer.logger, 'WARNING'):
+            self.buffer.put_many({1: (-74.0, 4.7, 1e20), 2: (-74.2, 4.9, float('nan')), 3: (-74.3, 4.6, self.now)},
+                                 pings=[(1, -74.0, 4.7, 1e20), (3, -74.3, 4.6, self.now)])
+
+        self.assertIsNone(self.buffer.get(1))
+        self.assertIsNone(self.buffer.get(2))
+        self.assertEqual(self.buffer._pings, [(3, -74.3, 4.6, self.now)])
+
+    def test_repeatedly_failing_batch_is_dropped(self):
+        """Test that a batch is retried at most max_attempts times and then dropped."""
+        self.buffer.put(1, -74.0, 4.7, recorded_at=self.now)
+
+        with mock.patch.object(locations, 'bulk_update_locations', side_effect=RuntimeError('bad row')), \
+                self.assertLogs(location_buffer.logger, 'ERROR'):
+            for _ in range(self.buffer.max_attempts):
+                with self.assertRaises(RuntimeError):
+                    self.buffer.flush()
+
+        self.assertIsNone(self.buffer.get(1))
+        self.assertEqual(self.buffer.stats()['dropped'], 1)
+        with mock.patch.object(locations, 'bulk_update_locations') as bulk_update:
+            self.assertEqual(self.buffer.flush(), 0)
+        bulk_update.assert_not_called()
+
+    def test_refresh_overrides_driver_position(self):
+        """Test that readers see buffered positions and distances."""
+        self.buffer.put(7, -74.0721, 4.7110)
+        driver = mock.Mock(pk=7, location_coordinates=Point((-75.5636, 6.2518), srid=4326))
+        self.buffer.refresh(driver, Point((-74.0721, 4.7110), srid=4326))
+        self.assertEqual(driver.location_coordinates.coords, (-74.0721, 4.7110))
+        self.assertAlmostEqual(driver.distance.km, 0.0)
+
+
+class LocationBufferFlushTest(TestCase):
+    """Test case for flushing buffered positions to the database."""
+
+    def test_flush_writes_location_coordinates(self):
+        """Test that a flush moves the driver in PostGIS."""
+        driver = Driver.objects.create_user(
+            username='bufferdriver',
+            email='bufferdriver@example.com',
+            password='testpassword123',
+            phone_number='+1999777444',
+            vehicle_plate='BUF123',
+            vehicle_model='Toyota Yaris',
+            vehicle_year=2021,
+            vehicle_color='Blue',
+            location_coordinates=Point((-74.0721, 4.7110), srid=4326),
+            is_available=True
+        )
+        buffer = LocationBuffer()
+        buffer._ensure_started = lambda: None
+        buffer.put(driver.pk, -74.08, 4.72)
+
+        self.assertEqual(buffer.flush(), 1)
+        state = DriverDispatchState.objects.get(pk=driver.pk)
+        self.assertAlmostEqual(state.location_coordinates.x, -74.08)
+        self.assertAlmostEqual(state.location_coordinates.y, 4.72)
+        self.assertIsNotNone(state.last_seen)
@@ -0,0 +1,86 @@
+import datetime
+from io import StringIO
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.core.management import call_command
+from django.contrib.gis.geos import Point
+from django.utils import timezone
+
+from apps.drivers.models import Driver, DriverLocationPing
+from apps.drivers.location_history import (
+    drop_partitions_before,
+    ensure_partitions,
+    list_partitions,
+    partition_name,
+    record_pings,
+)
+
+
+class DriverLocationHistoryTest(TestCase):
+    """Test cases for the partitioned driver location history."""
+
+    def setUp(self):
+        self.driver = Driver.objects.create_user(
+            username='historydriver',
+            email='historydriver@example.com',
+            password='testpassword123',
+            phone_number='+1999777333',
+            vehicle_plate='HIS123',
+            vehicle_model='Toyota Yaris',
+            vehicle_year=2021,
+            vehicle_color='Blue',
+            location_coordinates=Point((-74.0721, 4.7110), srid=4326),
+            is_available=True
+        )
+        self.today = timezone.now().astimezone(datetime.timezone.utc).date()
+        self.day = datetime.datetime.combine(self.today, datetime.time(23, 59, 30), tzinfo=datetime.timezone.utc)
+
+    def test_record_pings_copies_into_daily_partitions(self):
+        """Test that pings land in one partition per UTC day."""
+        tomorrow = self.today + datetime.timedelta(days=1)
+        ensure_partitions([self.today, tomorrow])
+        written = record_pings([
+            (self.driver.pk, -74.07, 4.71, self.day),
+            (self.driver.pk, -74.08, 4.72, self.day.timestamp() + 60),
+        ])
+
+        self.assertEqual(written, 2)
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM {partition_name(tomorrow)}')
+            self.assertEqual(cursor.fetchone()[0], 1)
+        pings = list(DriverLocationPing.objects.filter(driver=self.driver).order_by('recorded_at'))
+        self.assertEqual(pings[0].recorded_at, self.day)
+        self.assertAlmostEqual(pings[1].location.x, -74.08)
+
+    @override_settings(DRIVER_LOCATION_HISTORY_RETENTION_DAYS=7)
+    def test_out_of_window_pings_are_skipped_without_ddl(self):
+        """Test that client timestamps cannot create partitions or fail the write."""
+        ensure_partitions([self.today])
+        written = record_pings([
+            (self.driver.pk, -74.07, 4.71, 0),
+            (self.driver.pk, -74.07, 4.71, self.day + datetime.timedelta(days=30)),
+            (self.driver.pk, -74.07, 4.71, self.day - datetime.timedelta(days=7)),
+            (self.driver.pk, -74.07, 4.71, float('nan')),
+            (self.driver.pk, -74.07, 4.71, self.day),
+        ])
+
+        self.assertEqual(written, 1)
+        self.assertEqual([day for day, _ in list_partitions()], [self.today])
+
+    def test_drop_partitions_before(self):
+        """Test that retention drops whole partitions older than the cutoff."""
+        ensure_partitions([self.today - datetime.timedelta(days=2), self.today])
+        record_pings([(self.driver.pk, -74.07, 4.71, self.day - datetime.timedelta(days=2)),
+                      (self.driver.pk, -74.07, 4.71, self.day)])
+
+        dropped = drop_partitions_before(self.today - datetime.timedelta(days=1))
+
+        self.assertEqual(dropped, [partition_name(self.today - datetime.timedelta(days=2))])
+        self.assertEqual(DriverLocationPing.objects.count(), 1)
+
+    def test_manage_location_partitions_command(self):
+        """Test that the command creates partitions ahead and drops expired ones."""
+        ensure_partitions([self.today - datetime.timedelta(days=10)])
+        call_command('manage_location_partitions', '--retention-days', '7', '--ahead', '1', stdout=StringIO())
+
+        self.assertEqual([day for day, _ in list_partitions()], [self.today, self.today + datetime.timedelta(days=1)])
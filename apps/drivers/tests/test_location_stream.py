@@ -0,0 +1,100 @@
+import json
+import time
+from unittest import mock
+from django.test import TestCase
+from django.contrib.gis.geos import Point
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.drivers import streaming
+from apps.drivers.models import Driver
+from apps.drivers.streaming import driver_location_stream
+from apps.users.models import User
+
+
+async def run_socket(query_string, frames):
+    """
+    Drive the ASGI app through a connect, the given frames and a disconnect.
+    """
+    messages = [{'type': 'websocket.connect'}]
+    messages += [{'type': 'websocket.receive', 'text': frame} for frame in frames]
+    messages.append({'type': 'websocket.disconnect', 'code': 1000})
+    incoming = iter(messages)
+    sent = []
+
+    async def receive():
+        return next(incoming)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'websocket', 'path': '/ws/v1/drivers/location/', 'query_string': query_string}
+    await driver_location_stream(scope, receive, send)
+    return sent
+
+
+class DriverLocationStreamTest(TestCase):
+    """Test cases for the driver location WebSocket."""
+
+    def setUp(self):
+        self.driver = Driver.objects.create_user(
+            username='streamdriver',
+            email='streamdriver@example.com',
+            password='testpassword123',
+            phone_number='+1999777666',
+            vehicle_plate='STM123',
+            vehicle_model='Toyota Yaris',
+            vehicle_year=2021,
+            vehicle_color='Blue',
+            location_coordinates=Point((-74.0721, 4.7110), srid=4326),
+            is_available=True
+        )
+        self.client_user = User.objects.create_user(
+            username='streamclient',
+            email='streamclient@example.com',
+            password='testpassword123',
+            phone_number='+1999777555'
+        )
+
+    async def test_missing_or_invalid_token_is_rejected(self):
+        """Test that the socket is closed before accepting without a valid token."""
+        for query_string in (b'', b'token=not-a-jwt'):
+            with self.subTest(query_string=query_string):
+                sent = await run_socket(query_string, [])
+                self.assertEqual(sent, [{'type': 'websocket.close', 'code': streaming.CLOSE_UNAUTHORIZED}])
+
+    async def test_non_driver_is_rejected(self):
+        """Test that only drivers can open the stream."""
+        token = str(AccessToken.for_user(self.client_user))
+        sent = await run_socket(f'token={token}'.encode(), [])
+        self.assertEqual(sent, [{'type': 'websocket.close', 'code': streaming.CLOSE_FORBIDDEN}])
+
+    async def test_frames_go_to_buffer(self):
+        """Test that valid frames are buffered and invalid ones answered with an error."""
+        token = str(AccessToken.for_user(self.driver))
+        now = int(time.time())
+        with mock.patch.object(streaming.location_buffer, 'put') as put:
+            sent = await run_socket(f'token={token}'.encode(), [
+                json.dumps({'lon': -74.08, 'lat': 4.72}),
+                json.dumps([-74.09, 4.73, now]),
+                'not json',
+            ])
+
+        self.assertEqual(sent[0], {'type': 'websocket.accept'})
+        self.assertEqual(json.loads(sent[1]['text']), {'error': 'invalid frame'})
+        self.assertEqual(put.call_args_list, [
+            mock.call(self.driver.pk, -74.08, 4.72, recorded_at=None),
+            mock.call(self.driver.pk, -74.09, 4.73, recorded_at=float(now)),
+        ])
+
+    async def test_out_of_range_timestamps_are_rejected(self):
+        """Test that non-finite, overflowing and skewed timestamps get the error frame."""
+        token = str(AccessToken.for_user(self.driver))
+        now = int(time.time())
+        frames = ['[-74.08, 4.72, NaN]', '[-74.08, 4.72, Infinity]', '[-74.08, 4.72, 1e300]',
+                  json.dumps([-74.08, 4.72, 0]), json.dumps([-74.08, 4.72, now + 86400])]
+        with mock.patch.object(streaming.location_buffer, 'put') as put:
+            sent = await run_socket(f'token={token}'.encode(), frames)
+
+        self.assertEqual(sent[1:], [{'type': 'websocket.send', 'text': json.dumps({'error': 'invalid frame'})}]
+                         * len(frames))
+        put.assert_not_called()
@@ -2,11 +2,12 @@ from django.test import TestCase
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
-from apps.drivers.models import Driver
+from apps.drivers.models import Driver, DriverDispatchState
 from apps.users.models import User
 from rest_framework_simplejwt.tokens import RefreshToken
 from decimal import Decimal
 from django.contrib.gis.geos import Point
+import time
 import uuid
 
 
@@ -182,4 +183,106 @@ class DriverLocationAPITest(APITestCase):
         }, format='json')
         
         # Should be forbidden
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+class DriverLocationBulkAPITest(APITestCase):
+    """Test cases for the bulk driver location endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.admin = User.objects.create_user(
+            username='bulkadmin',
+            email='bulkadmin@example.com',
+            password='testpassword123',
+            phone_number='+1999888000',
+            is_staff=True
+        )
+        self.drivers = [
+            Driver.objects.create_user(
+                username=f'bulkdriver{i}',
+                email=f'bulkdriver{i}@example.com',
+                password='testpassword123',
+                phone_number=f'+199988800{i + 1}',
+                vehicle_plate=f'BLK{i}',
+                vehicle_model='Honda Civic',
+                vehicle_year=2020,
+                vehicle_color='Black',
+                location_coordinates=Point((-122.4194, 37.7749), srid=4326),
+                is_available=True
+            )
+            for i in range(2)
+        ]
+        self.url = reverse('urls-v1:driver-locations')
+        self.now = int(time.time())
+
+    def test_bulk_update_keeps_latest_ping(self):
+        """Test that a batch moves every driver to its most recent position."""
+        self.client.force_authenticate(user=self.admin)
+        first, second = self.drivers
+        response = self.client.post(self.url, {'locations': [
+            [first.id, -122.40, 37.70, self.now],
+            [first.id, -122.30, 37.60, self.now - 10],
+            [second.id, -122.50, 37.80, self.now - 5],
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        first, second = (DriverDispatchState.objects.get(pk=driver.pk) for driver in self.drivers)
+        self.assertAlmostEqual(first.location_coordinates.x, -122.40)
+        self.assertAlmostEqual(first.location_coordinates.y, 37.70)
+        self.assertAlmostEqual(second.location_coordinates.x, -122.50)
+
+    def test_older_batch_does_not_overwrite_newer_position(self):
+        """Test that a delayed or retried batch cannot move a driver back."""
+        self.client.force_authenticate(user=self.admin)
+        driver = self.drivers[0]
+        self.client.post(self.url, {'locations': [[driver.id, -122.40, 37.70, self.now]]}, format='json')
+        response = self.client.post(self.url, {'locations': [[driver.id, -122.30, 37.60, self.now - 10]]},
+                                    format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        state = DriverDispatchState.objects.get(pk=driver.pk)
+        self.assertAlmostEqual(state.location_coordinates.x, -122.40)
+        self.assertEqual(state.last_seen.timestamp(), self.now)
+
+    def test_invalid_pings_are_rejected(self):
+        """Test validation of tuple shape, types and ranges."""
+        self.client.force_authenticate(user=self.admin)
+        driver_id = self.drivers[0].id
+        for locations in ([], [[driver_id, -122.4, 37.7]], [[driver_id, 'x', 37.7, 1]],
+                          [[driver_id, -122.4, 97.7, 1]]):
+            with self.subTest(locations=locations):
+                response = self.client.post(self.url, {'locations': locations}, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_future_ping_is_rejected(self):
+        """Test that a ping ahead of the server clock cannot freeze the driver's position."""
+        self.client.force_authenticate(user=self.admin)
+        driver = self.drivers[0]
+        response = self.client.post(self.url, {'locations': [[driver.id, -122.40, 37.70, self.now + 86400]]},
+                                    format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.url, {'locations': [[driver.id, -122.30, 37.60, self.now]]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertAlmostEqual(DriverDispatchState.objects.get(pk=driver.pk).location_coordinates.x, -122.30)
+
+    def test_overflowing_or_stale_ping_is_rejected(self):
+        """Test that timestamps PostgreSQL or datetime cannot represent get a 400, not a 500."""
+        self.client.force_authenticate(user=self.admin)
+        driver_id = self.drivers[0].id
+        for timestamp in (1e20, -1e20, 0, self.now - 2 * 86400):
+            with self.subTest(timestamp=timestamp):
+                response = self.client.post(self.url, {'locations': [[driver_id, -122.4, 37.7, timestamp]]},
+                                            format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_driver_cannot_move_other_drivers(self):
+        """Test that drivers can only report their own location."""
+        first, second = self.drivers
+        self.client.force_authenticate(user=first)
+        response = self.client.post(self.url, {'locations': [[first.id, -122.4, 37.7, self.now]]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.post(self.url, {'locations': [[second.id, -122.4, 37.7, self.now]]},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
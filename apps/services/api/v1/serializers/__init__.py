@@ -1 +1,2 @@
-from .service_serializer import ServiceSerializer
\ No newline at end of file
+from .service_serializer import ServiceSerializer, ServiceCompactSerializer, ServiceReassignSerializer
+from .eta_matrix_serializer import EtaMatrixSerializer
\ No newline at end of file
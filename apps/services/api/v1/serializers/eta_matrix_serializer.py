@@ -0,0 +1,67 @@
+from rest_framework import serializers
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+
+from apps.drivers.models import DriverDispatchState
+from apps.addresses.models import Address
+
+
+class PointField(serializers.ListField):
+    """
+    A ``[lon, lat]`` pair in degrees.
+    """
+    child = serializers.FloatField()
+
+    def __init__(self, **kwargs):
+        super().__init__(min_length=2, max_length=2, **kwargs)
+
+    def to_internal_value(self, data):
+        lon, lat = super().to_internal_value(data)
+        if not (-180 <= lon <= 180) or not (-90 <= lat <= 90):
+            raise serializers.ValidationError(_("Coordinates must be [lon, lat] within valid ranges."))
+        return lon, lat
+
+
+class EtaMatrixSerializer(serializers.Serializer):
+    """
+    Serializer for the ETA matrix request.
+
+    Origins are given as driver IDs or raw points and destinations as address
+    IDs or raw points. Validation resolves them into ``origins`` and
+    ``destinations`` lists of ``(lon, lat)`` pairs.
+    """
+    driver_ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False,
+                                       help_text=_("Drivers used as origins, at their current location."))
+    origin_points = serializers.ListField(child=PointField(), required=False, allow_empty=False,
+                                          help_text=_("Origins as [lon, lat] pairs."))
+    address_ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False,
+                                        help_text=_("Addresses used as destinations."))
+    destination_points = serializers.ListField(child=PointField(), required=False, allow_empty=False,
+                                               help_text=_("Destinations as [lon, lat] pairs."))
+
+    def _resolve(self, attrs, ids_field, points_field, model, coordinates_field):
+        ids, points = attrs.get(ids_field), attrs.get(points_field)
+        if (ids is None) == (points is None):
+            raise serializers.ValidationError(
+                _("Provide exactly one of %(ids)s or %(points)s.") % {'ids': ids_field, 'points': points_field})
+
+        field = ids_field if ids is not None else points_field
+        if len(ids if ids is not None else points) > settings.ETA_MATRIX_MAX_SIZE:
+            raise serializers.ValidationError(
+                {field: _("At most %(max)d items are allowed.") % {'max': settings.ETA_MATRIX_MAX_SIZE}})
+        if ids is None:
+            return list(points)
+
+        # One query per side; rows come back unordered so they are re-keyed by ID.
+        rows = dict(model.objects.filter(pk__in=ids).values_list('pk', coordinates_field))
+        missing = [pk for pk in ids if rows.get(pk) is None]
+        if missing:
+            raise serializers.ValidationError(
+                {field: _("Unknown IDs or IDs without coordinates: %(ids)s") % {'ids': missing}})
+        return [(rows[pk].x, rows[pk].y) for pk in ids]
+
+    def validate(self, attrs):
+        attrs['origins'] = self._resolve(attrs, 'driver_ids', 'origin_points',
+                                        DriverDispatchState, 'location_coordinates')
+        attrs['destinations'] = self._resolve(attrs, 'address_ids', 'destination_points', Address, 'coordinates')
+        return attrs
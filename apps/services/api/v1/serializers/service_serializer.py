@@ -18,9 +18,25 @@ class ServiceSerializer(serializers.ModelSerializer):
     class Meta:
         model = Service
         fields = ('id', 'pickup_address', 'distance_km', 'estimated_arrival_minutes',
-                  'driver', 'status', 'client')
+                  'driver', 'status', 'client', 'version')
         read_only_fields = ['id', 'created_at', 'updated_at', 'driver', 'status', 'client',
-                            'distance_km', 'estimated_arrival_minutes']
+                            'distance_km', 'estimated_arrival_minutes', 'version']
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Load services with their driver, dispatch state and client in one
+        query, fetching only the columns rendered (and ``created_at`` for the
+        pagination cursor).
+        """
+        return queryset.select_related('driver__dispatch_state', 'client').only(
+            'id', 'created_at', 'pickup_address', 'distance_km', 'estimated_arrival_minutes', 'status', 'version',
+            'driver', 'client',
+            *(f'driver__{field}' for field in DriverListSerializer.Meta.fields
+              if field not in ('is_available', 'location_coordinates')),
+            'driver__dispatch_state__is_available', 'driver__dispatch_state__location_coordinates',
+            *(f'client__{field}' for field in UserSerializer.Meta.fields if field not in ('password1', 'password2')),
+        )
     
     def validate_pickup_address(self, value):
         """
@@ -28,6 +44,35 @@ class ServiceSerializer(serializers.ModelSerializer):
         """
         request = self.context.get('request')
         if request and request.user:
-            if value.created_by != request.user:
+            if value.created_by_id != request.user.id:
                 raise ValidationError(_("You can only use addresses that belong to you."))
-        return value
\ No newline at end of file
+        return value
+
+
+class ServiceCompactSerializer(serializers.ModelSerializer):
+    """
+    Flat read-only serializer for ``?view=compact``: related objects are rendered as ids.
+    """
+    
+    class Meta:
+        model = Service
+        fields = ('id', 'pickup_address', 'distance_km', 'estimated_arrival_minutes',
+                  'driver', 'status', 'client', 'version', 'created_at')
+        read_only_fields = fields
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Load services without joins, fetching only the rendered columns.
+        """
+        return queryset.select_related(None).only(*cls.Meta.fields)
+
+
+class ServiceReassignSerializer(serializers.Serializer):
+    """
+    Serializer for the reassign action: why the current driver is released.
+    """
+    reason = serializers.ChoiceField(choices=(('DECLINED', 'Declined'), ('OFFLINE', 'Offline')),
+                                     default='DECLINED',
+                                     help_text=_("DECLINED keeps the released driver available; "
+                                                 "OFFLINE marks them unavailable."))
\ No newline at end of file
@@ -7,5 +7,6 @@ router = DefaultRouter()
 router.register(r'services', v.ServiceViewSet, basename='service')
 
 urlpatterns = [
+    path('eta-matrix/', v.EtaMatrixView.as_view(), name='eta-matrix'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1 +1,2 @@
-from .service_view import ServiceViewSet
\ No newline at end of file
+from .service_view import ServiceViewSet
+from .eta_matrix_view import EtaMatrixView
\ No newline at end of file
@@ -0,0 +1,57 @@
+import json
+from asgiref.sync import sync_to_async
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAdminUser
+from drf_spectacular.utils import extend_schema, OpenApiResponse
+from django.http import StreamingHttpResponse
+from django.conf import settings
+
+from apps.services.api.v1.serializers import EtaMatrixSerializer
+from apps.services.eta import eta_matrix_rows, get_eta_engine
+
+
+async def _stream_matrix(origins, destinations, engine):
+    """
+    Render the matrix as JSON, ``ETA_MATRIX_CHUNK_SIZE`` origins at a time.
+
+    An async iterator is streamed by the ASGI handler as it yields, while a
+    sync one would be read to the end before the first byte is sent. Each
+    chunk is computed on a worker thread so the event loop keeps serving.
+    """
+    yield '{"origins": %s, "destinations": %s, "rows": [' % (json.dumps(origins), json.dumps(destinations))
+    compute_rows = sync_to_async(eta_matrix_rows, thread_sensitive=False)
+    chunk_size = settings.ETA_MATRIX_CHUNK_SIZE
+    for start in range(0, len(origins), chunk_size):
+        rows = await compute_rows(origins[start:start + chunk_size], destinations, engine)
+        for index, (distances, etas) in enumerate(rows, start):
+            row = {
+                'distances_km': [round(distance, 3) for distance in distances],
+                'eta_minutes': [round(eta, 2) for eta in etas],
+            }
+            yield (',' if index else '') + json.dumps(row)
+    yield ']}'
+
+
+class EtaMatrixView(APIView):
+    """
+    Distance and ETA matrix between many origins and many destinations.
+    """
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        tags=["Services"],
+        summary="Distance/ETA matrix",
+        description="Compute great-circle distances and ETAs from drivers or points (rows) "
+                    "to addresses or points (columns). Rows are streamed as they are computed.",
+        request=EtaMatrixSerializer,
+        responses={200: OpenApiResponse(description="Matrix with one row per origin.")},
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = EtaMatrixSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return StreamingHttpResponse(
+            # The engine is built here, on the view's thread, the first time it is used.
+            _stream_matrix(serializer.validated_data['origins'], serializer.validated_data['destinations'],
+                           get_eta_engine()),
+            content_type='application/json',
+        )
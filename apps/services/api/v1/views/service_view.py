@@ -5,13 +5,27 @@ from rest_framework import status
 from rest_framework.decorators import action
 from drf_spectacular.utils import extend_schema_view, extend_schema, OpenApiParameter, OpenApiResponse
 from django.contrib.gis.measure import D
-from django.contrib.gis.db.models.functions import Distance
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.conf import settings
 
-from apps.services.models import Service
-from apps.services.api.v1.serializers import ServiceSerializer
-from apps.drivers.models import Driver
-from apps.services.utils import get_closest_driver, get_arrival_time
+from apps.services.models import IdempotencyKey, Service
+from apps.services.api.v1.serializers import ServiceSerializer, ServiceCompactSerializer, ServiceReassignSerializer
+from apps.drivers.models import DriverDispatchState
+from apps.drivers.roles import driver_id_from_request
+from apps.services.dispatch import (claim_closest_driver, complete_service, enqueue_dispatch, rank_candidates,
+                                   reassign_service)
 from apps.services.persmissions import ServicePermission
+from common.pagination import KeysetPagination
+from common.views import OffloadedViewMixin, ReplicaReadMixin
+
+
+class ServicePagination(KeysetPagination):
+    """
+    Services, newest first; keyset-paginated on ``-created_at, -id``.
+    """
+    ordering = ('-created_at', '-id')
+    max_page_size = 100
 
 
 @extend_schema_view(
@@ -19,16 +33,29 @@ from apps.services.persmissions import ServicePermission
         tags=["Services"],
         summary="List all services",
         description="Retrieve a list of all services.",
+        parameters=[
+            OpenApiParameter(name='view', type=str, enum=['compact'], required=False,
+                             description="'compact' renders the driver, client and pickup address as ids."),
+        ],
     ),
     retrieve=extend_schema(
         tags=["Services"],
         summary="Retrieve a service",
         description="Retrieve a specific service by ID.",
+        parameters=[
+            OpenApiParameter(name='view', type=str, enum=['compact'], required=False,
+                             description="'compact' renders the driver, client and pickup address as ids."),
+        ],
     ),
     create=extend_schema(
         tags=["Services"],
         summary="Create a new service",
         description="Create a new service with the provided data.",
+        parameters=[
+            OpenApiParameter(name='Idempotency-Key', location=OpenApiParameter.HEADER, required=False,
+                             type=str, description="Unique key per logical request. Retries with the "
+                                                   "same key return the first response without dispatching again."),
+        ],
     ),
     update=extend_schema(
         tags=["Services"],
@@ -46,63 +73,160 @@ from apps.services.persmissions import ServicePermission
         description="Delete a specific service by ID.",
     ),
 )
-class ServiceViewSet(ModelViewSet):
+class ServiceViewSet(OffloadedViewMixin, ReplicaReadMixin, ModelViewSet):
     """
     ViewSet for the Service model.
+    
+    Served off Django's single sync thread under ASGI (see ``OffloadedViewMixin``);
+    list and retrieve read from the replicas (see ``ReplicaReadMixin``).
     """
-    queryset = Service.objects.all().order_by('-created_at')
+    queryset = Service.objects.select_related('driver__dispatch_state', 'client').order_by('-created_at', '-id')
+    pagination_class = ServicePagination
     serializer_class = ServiceSerializer
     permission_classes = [IsAuthenticated, ServicePermission]
 
-    def get_queryset(self):
+    def get_role_querysets(self):
         """
-        Filter services based on the user's role:
+        Split the services visible to the user into disjoint querysets, one per role:
         - Admins can see all services
         - Clients can only see their own services
-        - Drivers can only see services assigned to them
+        - Drivers can also see services assigned to them
+        
+        Each queryset filters on one foreign key, so each can use its own
+        ``(fk, created_at, id)`` index.
         """
         user = self.request.user
-        queryset = super().get_queryset()
+        queryset = self.get_base_queryset()
         
         if user.is_staff or user.is_superuser:
-            return queryset
-            
-        client_services = queryset.filter(client=user)
+            return [queryset]
         
-        try:
-            driver = Driver.objects.get(user_ptr_id=user.id)
-            
-            driver_services = queryset.filter(driver=driver)
-            
-            return client_services | driver_services
-        except Driver.DoesNotExist:
-            return client_services
+        querysets = [queryset.filter(client_id=user.id)]
+        driver_id = driver_id_from_request(self.request)
+        if driver_id is not None:
+            querysets.append(queryset.filter(driver_id=driver_id).exclude(client_id=user.id))
+        return querysets
+    
+    def get_queryset(self):
+        """
+        Filter services based on the user's role (see ``get_role_querysets``).
+        """
+        querysets = self.get_role_querysets()
+        if len(querysets) == 1:
+            return querysets[0]
+        driver_id = driver_id_from_request(self.request)
+        return self.get_base_queryset().filter(Q(client_id=self.request.user.id) | Q(driver_id=driver_id))
+    
+    def get_base_queryset(self):
+        """
+        Return all services, loaded only as far as the read serializer needs.
+        """
+        queryset = super().get_queryset()
+        if self.action in ('list', 'retrieve'):
+            queryset = self.get_serializer_class().setup_eager_loading(queryset)
+        return queryset
+    
+    def get_serializer_class(self):
+        """
+        Use the flat serializer for reads with ``?view=compact``.
+        """
+        if self.action in ('list', 'retrieve') and self.request.query_params.get('view') == 'compact':
+            return ServiceCompactSerializer
+        return super().get_serializer_class()
+    
+    def list(self, request, *args, **kwargs):
+        """
+        List services with one query: a ``UNION ALL`` of the role querysets,
+        each limited to a page on its own index.
+        """
+        querysets = [self.filter_queryset(queryset) for queryset in self.get_role_querysets()]
+        page = self.paginator.paginate_union(querysets, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     def create(self, request, *args, **kwargs):
+        """
+        Create a service and dispatch it.
+        
+        With an ``Idempotency-Key`` header the first successful response is
+        stored and replayed for retries. The key row is inserted before
+        dispatching, so a concurrent retry waits for the first request and
+        then replays its response instead of claiming a second driver.
+        """
+        key = request.headers.get('Idempotency-Key')
+        if key is None:
+            return self._create_service(request)
+        if not key or len(key) > IdempotencyKey._meta.get_field('key').max_length:
+            return Response({"detail": "Idempotency-Key must be between 1 and 255 characters."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        fingerprint = IdempotencyKey.fingerprint_for(request.data)
+        stored = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+        if stored is not None and stored.is_expired:
+            stored.delete()
+            stored = None
+        
+        if stored is None:
+            with transaction.atomic():
+                try:
+                    # Savepoint around the insert only: integrity errors of the
+                    # dispatch itself are not a lost race and must propagate.
+                    with transaction.atomic():
+                        stored = IdempotencyKey.objects.create(user=request.user, key=key, fingerprint=fingerprint)
+                except IntegrityError:
+                    # Another request with this key committed first.
+                    stored = IdempotencyKey.objects.get(user=request.user, key=key)
+                else:
+                    response = self._create_service(request)
+                    if not status.is_success(response.status_code):
+                        # Failed attempts are not stored, so the client can retry them.
+                        transaction.set_rollback(True)
+                        return response
+                    IdempotencyKey.objects.filter(pk=stored.pk).update(status_code=response.status_code,
+                                                                       response=response.data)
+                    return response
+        
+        if stored.fingerprint != fingerprint:
+            return Response({"detail": "Idempotency-Key was already used for a different request."},
+                            status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        return Response(stored.response, status=stored.status_code, headers={'Idempotent-Replayed': 'true'})
+    
+    def _create_service(self, request):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
         pickup_address = serializer.validated_data.get('pickup_address')
         
-        closest_driver = Driver.objects.filter(is_available=True) \
-            .annotate(distance=Distance('location_coordinates', pickup_address.coordinates)) \
-            .order_by('distance').first()
-        
-        if not closest_driver:
-            return Response({
-                "detail": "No drivers are currently available to fulfill your service request. Please try again later.",
-            }, status=status.HTTP_404_NOT_FOUND)
-        
-        closest_distance = closest_driver.distance.km
-        estimated_arrival_minutes = get_arrival_time(closest_distance) 
+        if settings.DISPATCH_MODE in ('batch', 'queue'):
+            # Assignment happens in the next batch window (run_batch_dispatch)
+            # or in a dispatch worker (run_dispatch_workers).
+            with transaction.atomic():
+                service = serializer.save(client=self.request.user, status='PENDING')
+                if settings.DISPATCH_MODE == 'queue':
+                    enqueue_dispatch(service)
+            headers = self.get_success_headers(serializer.data)
+            return Response(serializer.data, status=status.HTTP_202_ACCEPTED, headers=headers)
         
-        serializer.save(driver=closest_driver,
-                        client=self.request.user,
-                        distance_km=closest_distance,
-                        estimated_arrival_minutes=estimated_arrival_minutes,
-                        status='IN_PROGRESS')
-        closest_driver.is_available = False
-        closest_driver.save()
+        with transaction.atomic():
+            closest_driver = claim_closest_driver(pickup_address.coordinates)
+            
+            if not closest_driver:
+                return Response({
+                    "detail": "No drivers are currently available to fulfill your service request. Please try again later.",
+                }, status=status.HTTP_404_NOT_FOUND)
+            
+            closest_distance = closest_driver.distance.km
+            estimated_arrival_minutes = round(closest_driver.eta_minutes)
+            
+            candidates = rank_candidates(pickup_address.coordinates, settings.DISPATCH_FALLBACK_CANDIDATES,
+                                         exclude=[closest_driver.pk])
+            service = serializer.save(driver_id=closest_driver.pk,
+                                      client=self.request.user,
+                                      distance_km=closest_distance,
+                                      estimated_arrival_minutes=estimated_arrival_minutes,
+                                      candidates=candidates,
+                                      status='IN_PROGRESS')
+            DriverDispatchState.objects.filter(pk=closest_driver.pk).update(current_service_id=service.pk)
         
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
@@ -112,27 +236,95 @@ class ServiceViewSet(ModelViewSet):
     @extend_schema(
         tags=["Services"],
         summary="Update status of a service to completed",
-        description="Mark a service as completed.",
+        description="Mark a service as completed. Send the service `version` as `If-Match` "
+                    "to complete it only if it has not changed since it was read.",
+        parameters=[
+            OpenApiParameter(name='If-Match', location=OpenApiParameter.HEADER, required=False,
+                             type=int, description="Expected service version."),
+        ],
         request=None,
-        responses=ServiceSerializer,
+        responses={
+            200: ServiceSerializer,
+            400: OpenApiResponse(description="Service is not in progress."),
+            409: OpenApiResponse(description="Service was modified by another request."),
+        },
     )
     @action(detail=True, methods=['patch'])
     def complete(self, request, pk=None):
         """
         Mark a service as completed by driver.
+        
+        The service and the driver's dispatch state are updated by a single
+        conditional statement, so concurrent or repeated requests complete the
+        service and free the driver at most once.
         """
         service = self.get_object()
         
-        if service.status not in ['In progress', 'IN_PROGRESS']:
+        if service.status != 'IN_PROGRESS':
             return Response({"detail": "Service is not in progress."}, status=status.HTTP_400_BAD_REQUEST)
         
-        service.status = 'COMPLETED'
-        service.save()
+        version = service.version
+        if_match = request.headers.get('If-Match')
+        if if_match is not None:
+            try:
+                version = int(if_match.strip('"'))
+            except ValueError:
+                return Response({"detail": "If-Match must be a service version."},
+                                status=status.HTTP_400_BAD_REQUEST)
         
+        completed = complete_service(service.pk, version)
+        if completed is None:
+            # Lost the race: tell an already completed service apart from a stale version.
+            current_status = Service.objects.filter(pk=service.pk).values_list('status', flat=True).first()
+            if current_status != 'IN_PROGRESS':
+                return Response({"detail": "Service is not in progress."}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({"detail": "Service was modified by another request."},
+                            status=status.HTTP_409_CONFLICT)
         
-        driver = service.driver
-        driver.is_available = True
-        driver.save()
+        service.status = 'COMPLETED'
+        service.version = completed.version
+        service.updated_at = completed.updated_at
+        if completed.driver_freed:
+            state = service.driver.dispatch_state
+            state.is_available = True
+            state.current_service_id = None
         
         serializer = self.get_serializer(service)
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(serializer.data, status=status.HTTP_200_OK)
+    
+    @extend_schema(
+        tags=["Services"],
+        summary="Reassign a service to another driver",
+        description="Release the current driver of an in-progress service and assign the next "
+                    "driver of the ranked candidate list computed at dispatch.",
+        request=ServiceReassignSerializer,
+        responses={
+            200: ServiceSerializer,
+            400: OpenApiResponse(description="Service is not in progress."),
+            404: OpenApiResponse(description="No other driver is available."),
+        },
+    )
+    @action(detail=True, methods=['post'])
+    def reassign(self, request, pk=None):
+        """
+        Move a service to the next ranked candidate when its driver declines or goes offline.
+        """
+        service = self.get_object()
+        if service.status != 'IN_PROGRESS':
+            return Response({"detail": "Service is not in progress."}, status=status.HTTP_400_BAD_REQUEST)
+        
+        serializer = ServiceReassignSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        service = reassign_service(service.pk,
+                                   previous_available=serializer.validated_data['reason'] == 'DECLINED')
+        if service is None:
+            return Response({
+                "detail": "No other drivers are currently available. Please try again later.",
+            }, status=status.HTTP_404_NOT_FOUND)
+        if service.status != 'IN_PROGRESS':
+            return Response({"detail": "Service is not in progress."}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # The service no longer belongs to the requesting driver, so it is not in get_queryset().
+        service = Service.objects.select_related('driver__dispatch_state', 'client').get(pk=service.pk)
+        return Response(self.get_serializer(service).data, status=status.HTTP_200_OK)
@@ -0,0 +1,5 @@
+from .claim import claim_closest_driver, nearest_available
+from .batch import dispatch_pending_batch, solve_assignment
+from .complete import complete_service
+from .queue import acquire_shards, enqueue_dispatch, run_dispatch_jobs, shard_for
+from .candidates import rank_candidates, reassign_service
\ No newline at end of file
@@ -0,0 +1,223 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.gis.geos import MultiPoint, Point
+from django.contrib.gis.measure import D
+from django.db import transaction
+from django.utils import timezone
+import numpy as np
+
+from apps.services.models import Service
+from apps.services.utils import haversine_matrix
+from apps.services.eta import get_eta_engine
+from apps.drivers.models import DriverDispatchState
+from apps.drivers.dispatch_index import driver_index
+from apps.drivers.location_buffer import location_buffer
+from apps.services.dispatch.queue import shard_for
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # scipy is optional
+    linear_sum_assignment = None
+
+
+# Cost given to pairs that must never be matched. Finite so the solver stays exact.
+UNASSIGNABLE = 1e9
+
+
+def _hungarian(cost):
+    """
+    Minimum-cost assignment for a ``(n, m)`` matrix with ``n <= m``.
+
+    Shortest augmenting path version of the Hungarian algorithm, O(n^2 m),
+    with the inner loop over columns vectorized.
+    """
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    # p[j] is the 1-based row matched to column j, 0 when the column is free.
+    p = np.zeros(m + 1, dtype=np.int64)
+    way = np.zeros(m + 1, dtype=np.int64)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used
+            free[0] = False
+            reduced = np.full(m + 1, np.inf)
+            reduced[1:] = cost[i0 - 1] - u[i0] - v[1:]
+            improved = free & (reduced < minv)
+            minv[improved] = reduced[improved]
+            way[improved] = j0
+
+            candidates = np.where(free, minv, np.inf)
+            j1 = int(np.argmin(candidates))
+            delta = candidates[j1]
+
+            used_columns = np.nonzero(used)[0]
+            u[p[used_columns]] += delta
+            v[used_columns] -= delta
+            minv[free] -= delta
+
+            j0 = j1
+            if p[j0] == 0:
+                break
+
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    columns = np.nonzero(p[1:])[0]
+    rows = p[1:][columns] - 1
+    order = np.argsort(rows)
+    return rows[order], columns[order]
+
+
+def solve_assignment(cost):
+    """
+    Solve the rectangular min-cost assignment problem.
+
+    Uses ``scipy.optimize.linear_sum_assignment`` when scipy is installed and
+    the bundled Hungarian implementation otherwise.
+
+    :param cost: Array of shape ``(n, m)``.
+    :return: ``(rows, columns)`` index arrays of the matched pairs.
+    """
+    cost = np.asarray(cost, dtype=float)
+    if cost.size == 0:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty
+
+    if linear_sum_assignment is not None:
+        return linear_sum_assignment(cost)
+
+    if cost.shape[0] > cost.shape[1]:
+        columns, rows = _hungarian(cost.T)
+        order = np.argsort(rows)
+        return rows[order], columns[order]
+    return _hungarian(cost)
+
+
+def _match_region(services, max_distance_km, taken):
+    """
+    Optimal assignment of one region's pending services to the drivers in range.
+
+    Only available drivers within ``max_distance_km`` of some pickup are
+    read, without locking them; drivers in ``taken`` were matched by an
+    earlier region and are skipped.
+
+    :return: List of ``(service, driver_id, position, pickup, distance_km)``.
+    """
+    pickups = [(s.pickup_address.coordinates.x, s.pickup_address.coordinates.y) for s in services]
+    area = MultiPoint([Point(pickup, srid=4326) for pickup in pickups], srid=4326)
+    drivers = [
+        (pk, point) for pk, point in
+        DriverDispatchState.objects.filter(
+            is_available=True, location_coordinates__dwithin=(area, D(km=max_distance_km)))
+        .values_list('pk', 'location_coordinates')
+        if pk not in taken
+    ]
+    if not drivers:
+        return []
+
+    positions = [location_buffer.get(pk) or (point.x, point.y) for pk, point in drivers]
+    distances = haversine_matrix(pickups, positions)
+    cost = np.where(distances <= max_distance_km, distances, UNASSIGNABLE)
+    rows, columns = solve_assignment(cost)
+    return [
+        (services[row], drivers[column][0], positions[column], pickups[row], float(distances[row, column]))
+        for row, column in zip(rows, columns)
+        if distances[row, column] <= max_distance_km
+    ]
+
+
+def dispatch_pending_batch(max_distance_km=None, limit=None):
+    """
+    Assign pending services to drivers with an optimal matching per region.
+
+    Pending services are locked with ``SKIP LOCKED`` and split by dispatch
+    shard (see ``queue.shard_for``), so each solve only covers one region
+    and the drivers within ``max_distance_km`` of its pickups. Drivers are
+    read without locks; only the matched ones are locked afterwards, and a
+    match whose driver was taken meanwhile is dropped. Services left
+    without a driver stay pending for the next window.
+
+    :param max_distance_km: Farthest pickup a driver can be matched to.
+    :param limit: Maximum number of pending services taken in this batch.
+    :return: List of the services that were assigned.
+    """
+    if max_distance_km is None:
+        max_distance_km = settings.DISPATCH_BATCH_MAX_DISTANCE_KM
+
+    with transaction.atomic():
+        services = list(
+            Service.objects.filter(status='PENDING')
+            .select_related('pickup_address')
+            .order_by('created_at')
+            .select_for_update(skip_locked=True, of=('self',))[:limit]
+        )
+        if not services:
+            return []
+
+        regions = defaultdict(list)
+        for service in services:
+            coordinates = service.pickup_address.coordinates
+            regions[shard_for(coordinates.x, coordinates.y)].append(service)
+
+        matches = []
+        taken = set()
+        for region in regions.values():
+            region_matches = _match_region(region, max_distance_km, taken)
+            taken.update(driver_id for _, driver_id, _, _, _ in region_matches)
+            matches.extend(region_matches)
+        if not matches:
+            return []
+
+        # Reassignments, queue workers and greedy claims may have taken a
+        # driver since it was read; keep only those still free.
+        locked = set(
+            DriverDispatchState.objects.filter(pk__in=taken, is_available=True)
+            .select_for_update(skip_locked=True, of=('self',))
+            .values_list('pk', flat=True)
+        )
+
+        eta_engine = get_eta_engine()
+        now = timezone.now()
+        assigned = []
+        for service, driver_id, position, pickup, distance_km in matches:
+            if driver_id not in locked:
+                continue
+            service.driver_id = driver_id
+            service.distance_km = round(distance_km, 2)
+            service.estimated_arrival_minutes = round(eta_engine.travel_time_minutes(position, pickup))
+            service.status = 'IN_PROGRESS'
+            service.updated_at = now
+            # Rows are locked, so the version read above is current.
+            service.version += 1
+            assigned.append(service)
+
+        if not assigned:
+            return []
+
+        Service.objects.bulk_update(assigned, ['driver', 'distance_km', 'estimated_arrival_minutes',
+                                               'status', 'updated_at', 'version'])
+        driver_ids = [service.driver_id for service in assigned]
+        DriverDispatchState.objects.bulk_update(
+            [DriverDispatchState(pk=service.driver_id, is_available=False, current_service_id=service.pk)
+             for service in assigned],
+            ['is_available', 'current_service_id'],
+        )
+
+        def evict_assigned():
+            for driver_id in driver_ids:
+                driver_index.discard(driver_id)
+
+        # Assignments that roll back keep their drivers available.
+        transaction.on_commit(evict_assigned)
+    return assigned
@@ -0,0 +1,111 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from apps.drivers.models import DriverDispatchState
+from apps.drivers.dispatch_index import driver_index
+from apps.drivers.location_buffer import location_buffer
+from apps.services.eta import get_eta_engine
+from apps.services.models import Service
+from apps.services.utils import haversine_km
+from apps.services.dispatch.claim import claim_closest_driver, nearest_available, read_through
+
+
+def rank_candidates(point, count, exclude=()):
+    """
+    Rank the ``count`` nearest available drivers to ``point`` by ETA, without locking them.
+
+    The result is stored on the service as its fallback list for
+    :func:`reassign_service`.
+
+    :return: List of ``{'driver', 'distance_km', 'eta_minutes', 'lon', 'lat'}`` dicts, fastest first.
+    """
+    if count <= 0:
+        return []
+    nearest = nearest_available(DriverDispatchState.objects.exclude(pk__in=exclude), point)
+    states = read_through(nearest[:count + settings.DISPATCH_READ_THROUGH_CANDIDATES], point, count)
+    if not states:
+        return []
+
+    origins = [(state.location_coordinates.x, state.location_coordinates.y) for state in states]
+    times = get_eta_engine().travel_times_minutes(origins, (point.x, point.y))
+    ranked = sorted(zip(states, origins, times), key=lambda candidate: candidate[2])
+    return [
+        {'driver': state.pk, 'distance_km': round(state.distance.km, 3), 'eta_minutes': round(minutes, 2),
+         'lon': lon, 'lat': lat}
+        for state, (lon, lat), minutes in ranked
+    ]
+
+
+def _claim_from_candidates(service, candidates):
+    """
+    Lock the first candidate that is still free and close to where it was ranked.
+
+    Candidates taken by another dispatch are skipped. Reaching a candidate
+    that moved more than ``DISPATCH_FALLBACK_MAX_DRIFT_KM`` invalidates the
+    rest of the list.
+
+    :return: ``(candidate, remaining_candidates)``, or ``(None, [])``.
+    """
+    for position, candidate in enumerate(candidates):
+        state = DriverDispatchState.objects.filter(pk=candidate['driver'], is_available=True) \
+            .select_for_update(skip_locked=True).first()
+        if state is None:
+            continue
+        lon, lat = location_buffer.get(state.pk) or (state.location_coordinates.x, state.location_coordinates.y)
+        if haversine_km(lon, lat, candidate['lon'], candidate['lat']) > settings.DISPATCH_FALLBACK_MAX_DRIFT_KM:
+            return None, []
+        DriverDispatchState.objects.filter(pk=state.pk).update(is_available=False, current_service_id=service.pk)
+        transaction.on_commit(lambda: driver_index.discard(state.pk))
+        return candidate, candidates[position + 1:]
+    return None, []
+
+
+def reassign_service(service_id, previous_available=True):
+    """
+    Move an in-progress service from its driver to the next cached candidate.
+
+    The stored candidate list is walked with primary-key lookups only. A
+    full nearest-driver claim runs only when the list is used up or stale,
+    and the list is then recomputed.
+
+    :param previous_available: Whether the released driver can take new
+        services (declined) or not (went offline).
+    :return: The reassigned service, or None when no other driver is available.
+    """
+    with transaction.atomic():
+        service = Service.objects.select_for_update(of=('self',)) \
+            .select_related('pickup_address').get(pk=service_id)
+        if service.status != 'IN_PROGRESS':
+            return service
+
+        previous = service.driver_id
+        pickup = service.pickup_address.coordinates
+        candidate, remaining = _claim_from_candidates(
+            service, [candidate for candidate in service.candidates if candidate['driver'] != previous])
+
+        if candidate is None:
+            state = claim_closest_driver(pickup)
+            if state is None:
+                return None
+            DriverDispatchState.objects.filter(pk=state.pk).update(current_service_id=service.pk)
+            candidate = {'driver': state.pk, 'distance_km': state.distance.km, 'eta_minutes': state.eta_minutes}
+            remaining = rank_candidates(pickup, settings.DISPATCH_FALLBACK_CANDIDATES,
+                                        exclude=[state.pk, previous])
+
+        service.driver_id = candidate['driver']
+        service.distance_km = round(candidate['distance_km'], 2)
+        service.estimated_arrival_minutes = round(candidate['eta_minutes'])
+        service.candidates = remaining
+        service.save(update_fields=['driver', 'distance_km', 'estimated_arrival_minutes', 'candidates',
+                                    'updated_at'])
+
+        if previous is not None:
+            DriverDispatchState.objects \
+                .filter(Q(current_service_id=service.pk) | Q(current_service_id__isnull=True), pk=previous) \
+                .update(is_available=previous_available, current_service_id=None)
+            if previous_available and settings.DISPATCH_INDEX_ENABLED:
+                released = DriverDispatchState.objects.filter(pk=previous).first()
+                if released is not None:
+                    transaction.on_commit(lambda: driver_index.update_from_driver(released))
+    return service
@@ -0,0 +1,150 @@
+from django.conf import settings
+from django.contrib.gis.db.models import PointField
+from django.contrib.gis.db.models.functions import Distance
+from django.contrib.gis.measure import D
+from django.db import transaction
+from django.db.models import F, FloatField, Func, Value
+
+from apps.drivers.models import DriverDispatchState
+from apps.drivers.dispatch_index import driver_index
+from apps.drivers.location_buffer import location_buffer
+from apps.services.eta import get_eta_engine
+
+
+class KnnDistance(Func):
+    """
+    PostGIS ``<->`` operator. Ordering by it lets PostgreSQL walk a GiST index
+    in distance order instead of computing and sorting every distance.
+    """
+    arg_joiner = ' <-> '
+    template = '%(expressions)s'
+    output_field = FloatField()
+
+
+def nearest_available(queryset, point, radius_km=None):
+    """
+    Available drivers ordered by distance to ``point``, annotated with ``distance``.
+
+    The ``is_available`` filter and the ``<->`` ordering match the partial
+    GiST index on available drivers, so a ``LIMIT`` query reads only the first
+    few index entries. ``radius_km`` adds an ``ST_DWithin`` bound.
+    """
+    queryset = queryset.filter(is_available=True)
+    if radius_km is not None:
+        queryset = queryset.filter(location_coordinates__dwithin=(point, D(km=radius_km)))
+    target = Value(point, output_field=PointField(geography=True, srid=4326))
+    return queryset.annotate(distance=Distance('location_coordinates', point)) \
+        .order_by(KnnDistance(F('location_coordinates'), target))
+
+
+def _closest(queryset, point, limit=1, radii_km=()):
+    """
+    Read up to ``limit`` of the nearest available drivers, without locking them.
+
+    The search starts within the first of ``radii_km`` and widens until
+    ``limit`` drivers are found, ending with an unbounded search.
+    """
+    for radius_km in (*radii_km, None):
+        candidates = list(nearest_available(queryset, point, radius_km)[:limit])
+        if len(candidates) >= limit or radius_km is None:
+            return candidates
+
+
+def read_through(candidates, point, limit):
+    """
+    Apply buffered positions to ``candidates`` and keep the ``limit`` nearest.
+
+    ``candidates`` come in PostGIS KNN order, which can be up to one
+    ``DRIVER_LOCATION_FLUSH_MS`` interval stale for drivers pinging this
+    process. Reading a few more rows than needed and re-sorting them by their
+    buffered positions lets a driver that moved closer overtake one that
+    moved away. A driver that moved in from beyond the rows read, or whose
+    position is buffered in another process, is still seen at its flushed
+    position.
+    """
+    candidates = [location_buffer.refresh(driver, point) for driver in candidates]
+    return sorted(candidates, key=lambda driver: driver.distance.m)[:limit]
+
+
+def _rank_by_eta(candidates, point):
+    """
+    Return the candidates fastest first, each annotated with ``eta_minutes``.
+    """
+    origins = [(driver.location_coordinates.x, driver.location_coordinates.y) for driver in candidates]
+    times = get_eta_engine().travel_times_minutes(origins, (point.x, point.y))
+    for driver, minutes in zip(candidates, times):
+        driver.eta_minutes = minutes
+    return sorted(candidates, key=lambda driver: driver.eta_minutes)
+
+
+def _claim_closest(queryset, point, limit=1, radii_km=()):
+    """
+    Lock the fastest of the ``limit`` nearest available drivers that is still free.
+
+    Candidates are ranked without locks; only the chosen row is locked, with
+    ``FOR UPDATE SKIP LOCKED``, so concurrent dispatches are never blocked by
+    candidates this one does not take. A candidate claimed meanwhile is
+    skipped for the next one, and once every candidate is taken the next
+    ``limit`` nearest drivers are read.
+    """
+    taken = []
+    read = limit + settings.DISPATCH_READ_THROUGH_CANDIDATES
+    while True:
+        candidates = _closest(queryset.exclude(pk__in=taken), point, read, radii_km)
+        if not candidates:
+            return None
+        ranked = _rank_by_eta(read_through(candidates, point, limit), point)
+        for driver in ranked:
+            locked = DriverDispatchState.objects.filter(pk=driver.pk, is_available=True) \
+                .select_for_update(skip_locked=True).values_list('pk', flat=True).first()
+            if locked is not None:
+                return driver
+        taken.extend(driver.pk for driver in ranked)
+
+
+def claim_closest_driver(point):
+    """
+    Reserve the available driver closest to ``point``.
+
+    Only the narrow ``DriverDispatchState`` table is read, locked and written.
+    Must run inside a transaction. Only the claimed row is locked, with
+    ``FOR UPDATE SKIP LOCKED``, so rows already being claimed by a concurrent
+    dispatch are skipped and the next free driver is returned instead of
+    waiting for the other transaction to finish. The PostGIS search is a
+    KNN query bounded by ``DISPATCH_SEARCH_RADII_KM``, widened step by step.
+
+    When ``DISPATCH_INDEX_ENABLED`` is set, the in-process grid index narrows
+    the claim to a handful of candidate primary keys; the full PostGIS scan is
+    only used when none of them can be claimed.
+
+    The ``DISPATCH_ETA_CANDIDATES`` nearest drivers by straight-line distance,
+    taking buffered positions into account (see :func:`read_through`), are
+    re-ranked by the configured ETA engine and the fastest one is claimed.
+
+    :param point: Pickup location.
+    :return: The claimed ``DriverDispatchState`` (its ``pk`` is the driver id) annotated
+        with ``distance`` and ``eta_minutes``, or None.
+    """
+    limit = max(settings.DISPATCH_ETA_CANDIDATES, 1)
+    driver = None
+
+    if settings.DISPATCH_INDEX_ENABLED:
+        driver_index.ensure_loaded()
+        nearest = driver_index.nearest(point.x, point.y,
+                                       k=max(settings.DISPATCH_INDEX_CANDIDATES, limit))
+        if nearest:
+            candidate_ids = [driver_id for driver_id, _ in nearest]
+            driver = _claim_closest(DriverDispatchState.objects.filter(pk__in=candidate_ids), point, limit)
+
+    if driver is None:
+        driver = _claim_closest(DriverDispatchState.objects.all(), point, limit,
+                                radii_km=settings.DISPATCH_SEARCH_RADII_KM)
+
+    if driver is None:
+        return None
+
+    DriverDispatchState.objects.filter(pk=driver.pk).update(is_available=False)
+    driver.is_available = False
+    # A rolled-back claim leaves the driver available, so only evict on commit.
+    transaction.on_commit(lambda: driver_index.discard(driver.pk))
+    return driver
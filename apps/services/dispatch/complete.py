@@ -0,0 +1,54 @@
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from apps.drivers.models import DriverDispatchState
+from apps.drivers.dispatch_index import driver_index
+from apps.services.models import Service
+
+
+CompletedService = namedtuple('CompletedService', ['version', 'updated_at', 'driver_freed'])
+
+
+def complete_service(service_id, version):
+    """
+    Mark an in-progress service as completed and free its driver in one statement.
+
+    The service row is only updated while it is ``IN_PROGRESS`` and still at
+    ``version`` (optimistic locking). Its driver is freed in the same
+    statement, and only while the dispatch state still points at this
+    service. A repeated or concurrent completion therefore matches nothing
+    and cannot free a driver that was already reassigned.
+
+    :param service_id: Primary key of the service.
+    :param version: Version the caller read; the update is skipped when it changed.
+    :return: ``CompletedService`` with the new version, or None when nothing matched.
+    """
+    service_table = connection.ops.quote_name(Service._meta.db_table)
+    state_table = connection.ops.quote_name(DriverDispatchState._meta.db_table)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'WITH done AS ('
+            f'  UPDATE {service_table} SET status = %s, version = version + 1, updated_at = now() '
+            f'  WHERE id = %s AND status = %s AND version = %s '
+            f'  RETURNING id, driver_id, version, updated_at'
+            f'), freed AS ('
+            f'  UPDATE {state_table} AS s SET is_available = true, current_service_id = NULL '
+            f'  FROM done WHERE s.driver_id = done.driver_id '
+            f'  AND (s.current_service_id = done.id OR s.current_service_id IS NULL) '
+            f'  RETURNING s.driver_id, ST_X(s.location_coordinates::geometry), '
+            f'  ST_Y(s.location_coordinates::geometry)'
+            f') '
+            f'SELECT done.version, done.updated_at, freed.* FROM done LEFT JOIN freed ON true',
+            ['COMPLETED', service_id, 'IN_PROGRESS', version],
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+
+        new_version, updated_at, driver_id, lon, lat = row
+        if driver_id is not None and settings.DISPATCH_INDEX_ENABLED:
+            transaction.on_commit(lambda: driver_index.update(driver_id, lon, lat))
+    return CompletedService(new_version, updated_at, driver_id is not None)
@@ -0,0 +1,138 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.drivers.models import DriverDispatchState
+from apps.drivers.dispatch_index import cell_for
+from apps.services.models import DispatchJob, Service
+from apps.services.dispatch.claim import claim_closest_driver
+from apps.services.dispatch.candidates import rank_candidates
+
+
+logger = logging.getLogger(__name__)
+
+# First key of the two-key advisory locks held on shards ("DISP").
+SHARD_LOCK_NAMESPACE = 0x44495350
+
+
+def shard_for(lon, lat):
+    """
+    Return the dispatch shard of the ``DISPATCH_REGION_CELL_DEG`` cell holding a point.
+
+    Every point of a cell maps to the same shard, so one metro area is
+    dispatched by one worker while distant cities spread over the others.
+    """
+    column, row = cell_for(lon, lat, settings.DISPATCH_REGION_CELL_DEG)
+    return ((column * 73856093) ^ (row * 19349663)) % settings.DISPATCH_REGION_SHARDS
+
+
+def acquire_shards(count, start=0, held=()):
+    """
+    Take session advisory locks on up to ``count`` shards no other worker holds.
+
+    Shards are tried from ``start`` onwards so workers started together
+    spread out. The locks live as long as the database connection.
+
+    :param held: Shards this connection already owns; advisory locks are
+        re-entrant, so they are skipped rather than counted twice.
+    :return: Sorted list of the newly owned shards.
+    """
+    owned = []
+    shards = settings.DISPATCH_REGION_SHARDS
+    with connection.cursor() as cursor:
+        for offset in range(shards):
+            if len(owned) >= count:
+                break
+            shard = (start + offset) % shards
+            if shard in held:
+                continue
+            cursor.execute('SELECT pg_try_advisory_lock(%s, %s)', [SHARD_LOCK_NAMESPACE, shard])
+            if cursor.fetchone()[0]:
+                owned.append(shard)
+    return sorted(owned)
+
+
+def enqueue_dispatch(service):
+    """
+    Queue the dispatch of a ``PENDING`` service for the dispatch workers.
+    """
+    coordinates = service.pickup_address.coordinates
+    return DispatchJob.objects.create(service=service, shard=shard_for(coordinates.x, coordinates.y))
+
+
+def assign_pending_service(service):
+    """
+    Claim the closest driver for a ``PENDING`` service and start it.
+
+    Must run inside a transaction. The service row is locked first, so a
+    service that was already dispatched is left alone.
+
+    :return: The locked service; still ``PENDING`` when no driver was free.
+    """
+    service = Service.objects.select_for_update(of=('self',)) \
+        .select_related('pickup_address').get(pk=service.pk)
+    if service.status != 'PENDING':
+        return service
+
+    driver = claim_closest_driver(service.pickup_address.coordinates)
+    if driver is None:
+        return service
+
+    service.driver_id = driver.pk
+    service.distance_km = round(driver.distance.km, 2)
+    service.estimated_arrival_minutes = round(driver.eta_minutes)
+    service.status = 'IN_PROGRESS'
+    service.candidates = rank_candidates(service.pickup_address.coordinates, settings.DISPATCH_FALLBACK_CANDIDATES,
+                                         exclude=[driver.pk])
+    service.save(update_fields=['driver', 'distance_km', 'estimated_arrival_minutes', 'status', 'candidates',
+                                'updated_at'])
+    DriverDispatchState.objects.filter(pk=driver.pk).update(current_service_id=service.pk)
+    return service
+
+
+def run_dispatch_jobs(limit=10, shards=None):
+    """
+    Take up to ``limit`` due jobs and dispatch their services.
+
+    Jobs are locked with ``FOR UPDATE SKIP LOCKED``, so any number of workers
+    can drain the queue without waiting on each other. Each job runs in its
+    own savepoint: a failing job is retried later without undoing the others.
+
+    :param shards: Only take jobs of these shards (see :func:`acquire_shards`).
+    :return: The processed jobs, with ``latency_ms`` set.
+    """
+    jobs = DispatchJob.objects.filter(status='QUEUED', run_after__lte=timezone.now())
+    if shards is not None:
+        jobs = jobs.filter(shard__in=shards)
+
+    with transaction.atomic():
+        jobs = list(
+            jobs.select_related('service')
+            .order_by('run_after')
+            .select_for_update(skip_locked=True, of=('self',))[:limit]
+        )
+
+        for job in jobs:
+            job.attempts += 1
+            try:
+                with transaction.atomic():
+                    job.service = assign_pending_service(job.service)
+            except Exception:
+                logger.exception('Dispatch job %s failed', job.pk)
+
+            now = timezone.now()
+            if job.service.status != 'PENDING':
+                job.status = 'DONE'
+            elif job.attempts >= settings.DISPATCH_QUEUE_MAX_ATTEMPTS:
+                # The service stays PENDING for a later batch or a new job.
+                job.status = 'FAILED'
+            else:
+                job.run_after = now + timedelta(seconds=settings.DISPATCH_QUEUE_RETRY_SECONDS)
+            job.finished_at = now if job.status != 'QUEUED' else None
+            job.latency_ms = (now - job.created_at).total_seconds() * 1000
+
+        DispatchJob.objects.bulk_update(jobs, ['status', 'attempts', 'run_after', 'finished_at', 'latency_ms'])
+    return jobs
@@ -0,0 +1,36 @@
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .base import BaseEtaEngine, StraightLineEtaEngine
+from .graph import RoadGraph
+from .matrix import eta_matrix_rows, iter_eta_matrix
+from .road_network import RoadNetworkEtaEngine
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_eta_engine():
+    """
+    Return the process-wide ETA engine configured by ``ETA_ENGINE``.
+
+    Engines are built once per process because loading a road graph is expensive.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = import_string(settings.ETA_ENGINE).from_settings()
+    return _engine
+
+
+def reset_eta_engine():
+    """
+    Drop the cached engine so the next call re-reads the settings.
+    """
+    global _engine
+    with _engine_lock:
+        _engine = None
@@ -0,0 +1,68 @@
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+
+from apps.services.utils import haversine_distances, haversine_km, haversine_matrix
+
+
+class BaseEtaEngine(ABC):
+    """
+    Interface of the travel time engines used by dispatch.
+
+    Points are ``(lon, lat)`` pairs in degrees and times are minutes as floats;
+    callers round them when storing ``estimated_arrival_minutes``.
+    """
+
+    @classmethod
+    def from_settings(cls):
+        return cls()
+
+    @abstractmethod
+    def travel_time_minutes(self, origin, destination):
+        """
+        Travel time from ``origin`` to ``destination``.
+        """
+
+    def travel_times_minutes(self, origins, destination):
+        """
+        Travel times from several origins (e.g. candidate drivers) to one destination.
+        """
+        return [self.travel_time_minutes(origin, destination) for origin in origins]
+
+    def travel_time_matrix_minutes(self, origins, destinations):
+        """
+        Travel times from every origin (rows) to every destination (columns).
+        """
+        return [[self.travel_time_minutes(origin, destination) for destination in destinations]
+                for origin in origins]
+
+
+class StraightLineEtaEngine(BaseEtaEngine):
+    """
+    Great-circle distance at a constant average speed.
+    """
+
+    def __init__(self, average_speed_kmh=60.0):
+        if average_speed_kmh <= 0:
+            raise ValueError("average_speed_kmh must be greater than zero.")
+        self.average_speed_kmh = average_speed_kmh
+
+    @classmethod
+    def from_settings(cls):
+        return cls(average_speed_kmh=settings.ETA_AVERAGE_SPEED_KMH)
+
+    def travel_time_minutes(self, origin, destination):
+        return haversine_km(*origin, *destination) / self.average_speed_kmh * 60
+
+    def travel_times_minutes(self, origins, destination):
+        if not origins:
+            return []
+        lons, lats = zip(*origins)
+        distances = haversine_distances(*destination, lons, lats)
+        return [float(distance) / self.average_speed_kmh * 60 for distance in distances]
+
+    def travel_time_matrix_minutes(self, origins, destinations):
+        if not origins or not destinations:
+            return [[] for _ in origins]
+        distances = haversine_matrix(origins, destinations)
+        return [[float(distance) / self.average_speed_kmh * 60 for distance in row] for row in distances]
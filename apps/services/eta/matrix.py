@@ -0,0 +1,26 @@
+from apps.services.utils import haversine_matrix
+
+
+def eta_matrix_rows(origins, destinations, engine):
+    """
+    Return the ``(distances_km, eta_minutes)`` rows from ``origins`` to ``destinations``.
+
+    :param origins: List of ``(lon, lat)`` pairs.
+    :param destinations: List of ``(lon, lat)`` pairs.
+    :param engine: ETA engine used for the travel times.
+    """
+    distances = haversine_matrix(origins, destinations)
+    etas = engine.travel_time_matrix_minutes(origins, destinations)
+    return [([float(distance) for distance in distance_row], eta_row)
+            for distance_row, eta_row in zip(distances, etas)]
+
+
+def iter_eta_matrix(origins, destinations, engine, chunk_size=50):
+    """
+    Yield ``(distances_km, eta_minutes)`` rows of the origin x destination matrix.
+
+    Origins are processed ``chunk_size`` at a time so only one block of the
+    matrix is held in memory while the rows are streamed to the client.
+    """
+    for start in range(0, len(origins), chunk_size):
+        yield from eta_matrix_rows(origins[start:start + chunk_size], destinations, engine)
@@ -0,0 +1,94 @@
+import math
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from apps.services.eta.base import BaseEtaEngine, StraightLineEtaEngine
+from apps.services.eta.graph import RoadGraph
+
+
+class RoadNetworkEtaEngine(BaseEtaEngine):
+    """
+    Travel times over a local road graph built with ``manage.py build_road_graph``.
+
+    Points are snapped to their nearest graph node; the legs between the point
+    and the node are driven at ``access_speed_kmh``. Points farther than
+    ``max_snap_km`` from the network, or with no route between them, use the
+    straight-line estimate instead.
+    """
+
+    def __init__(self, graph, access_speed_kmh=20.0, max_snap_km=1.0, fallback=None):
+        self.graph = graph
+        self.access_speed_kmh = access_speed_kmh
+        self.max_snap_km = max_snap_km
+        self.fallback = fallback or StraightLineEtaEngine()
+
+    @classmethod
+    def from_settings(cls):
+        if not settings.ETA_ROAD_GRAPH_PATH:
+            raise ImproperlyConfigured('ETA_ROAD_GRAPH_PATH is required by RoadNetworkEtaEngine.')
+        return cls(RoadGraph.load(settings.ETA_ROAD_GRAPH_PATH),
+                   access_speed_kmh=settings.ETA_ACCESS_SPEED_KMH,
+                   max_snap_km=settings.ETA_MAX_SNAP_KM,
+                   fallback=StraightLineEtaEngine.from_settings())
+
+    def _snap(self, point):
+        node, distance_km = self.graph.nearest_node(*point)
+        if distance_km > self.max_snap_km:
+            return None, None
+        return node, distance_km / self.access_speed_kmh * 60
+
+    def travel_time_minutes(self, origin, destination):
+        source, source_minutes = self._snap(origin)
+        target, target_minutes = self._snap(destination)
+        if source is None or target is None:
+            return self.fallback.travel_time_minutes(origin, destination)
+
+        seconds = self.graph.shortest_time(source, target)
+        if math.isinf(seconds):
+            return self.fallback.travel_time_minutes(origin, destination)
+        return source_minutes + seconds / 60 + target_minutes
+
+    def travel_times_minutes(self, origins, destination):
+        target, target_minutes = self._snap(destination)
+        if target is None:
+            return self.fallback.travel_times_minutes(origins, destination)
+
+        snapped = [self._snap(origin) for origin in origins]
+        sources = [node for node, _ in snapped if node is not None]
+        seconds = iter(self.graph.shortest_times_to(sources, target))
+
+        times = []
+        for origin, (source, source_minutes) in zip(origins, snapped):
+            route = next(seconds) if source is not None else math.inf
+            if math.isinf(route):
+                times.append(self.fallback.travel_time_minutes(origin, destination))
+            else:
+                times.append(source_minutes + route / 60 + target_minutes)
+        return times
+
+    def travel_time_matrix_minutes(self, origins, destinations):
+        """
+        One forward search per origin settles every snapped destination of its row.
+        """
+        snapped = [self._snap(destination) for destination in destinations]
+        targets = [node for node, _ in snapped if node is not None]
+
+        matrix = []
+        for origin in origins:
+            source, source_minutes = self._snap(origin)
+            if source is None:
+                matrix.append([self.fallback.travel_time_minutes(origin, destination)
+                               for destination in destinations])
+                continue
+
+            seconds = iter(self.graph.shortest_times_from(source, targets))
+            row = []
+            for destination, (target, target_minutes) in zip(destinations, snapped):
+                route = next(seconds) if target is not None else math.inf
+                if math.isinf(route):
+                    row.append(self.fallback.travel_time_minutes(origin, destination))
+                else:
+                    row.append(source_minutes + route / 60 + target_minutes)
+            matrix.append(row)
+        return matrix
@@ -0,0 +1,87 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+from django.core.management.base import BaseCommand, CommandError
+import numpy as np
+
+
+class Command(BaseCommand):
+    help = ('Load-test a running API server with many concurrent keep-alive connections and report '
+            'latency percentiles. Run it against uvicorn with ASGI_OFFLOAD_SYNC_VIEWS=False and then '
+            'True to compare the single sync thread with offloaded views.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000/api/v1/services/services/?view=compact',
+                            help='Endpoint to request (GET).')
+        parser.add_argument('--token', default='', help='JWT access token sent as a Bearer token.')
+        parser.add_argument('--connections', type=int, default=1000)
+        parser.add_argument('--duration', type=float, default=20.0, help='Seconds of load after ramp-up.')
+        parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout in seconds.')
+
+    async def _request(self, reader, writer, request):
+        writer.write(request)
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value)
+        await reader.readexactly(length)
+        return status
+
+    async def _client(self, host, port, request, deadline, timeout, latencies, errors):
+        reader = writer = None
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+                status = await asyncio.wait_for(self._request(reader, writer, request), timeout)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, IndexError):
+                errors['connection'] += 1
+                if writer is not None:
+                    writer.close()
+                reader = writer = None
+                continue
+            if status >= 400:
+                errors[status] = errors.get(status, 0) + 1
+            latencies.append((time.monotonic() - started) * 1000)
+        if writer is not None:
+            writer.close()
+
+    async def _run(self, options):
+        url = urlsplit(options['url'])
+        if url.scheme != 'http':
+            raise CommandError('Only http:// URLs are supported.')
+        path = url.path + (f'?{url.query}' if url.query else '')
+        headers = [f'GET {path} HTTP/1.1', f'Host: {url.netloc}', 'Connection: keep-alive']
+        if options['token']:
+            headers.append(f"Authorization: Bearer {options['token']}")
+        request = ('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1')
+
+        latencies, errors = [], {'connection': 0}
+        deadline = time.monotonic() + options['duration']
+        started = time.monotonic()
+        await asyncio.gather(*(
+            self._client(url.hostname, url.port or 80, request, deadline, options['timeout'], latencies, errors)
+            for _ in range(options['connections'])
+        ))
+        return latencies, errors, time.monotonic() - started
+
+    def handle(self, *args, **options):
+        latencies, errors, elapsed = asyncio.run(self._run(options))
+        if not latencies:
+            raise CommandError(f'No request completed; errors: {errors}')
+
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+        self.stdout.write(self.style.SUCCESS(
+            f"{options['connections']} connections, {len(latencies)} requests in {elapsed:.1f}s "
+            f"({len(latencies) / elapsed:.0f} req/s) | p50 {p50:.1f} ms, p90 {p90:.1f} ms, "
+            f"p99 {p99:.1f} ms, max {max(latencies):.1f} ms"
+        ))
+        if any(errors.values()):
+            self.stdout.write(self.style.WARNING(f'errors: {errors}'))
@@ -0,0 +1,75 @@
+import time
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from apps.services.dispatch import solve_assignment
+from apps.services.utils import haversine_matrix
+
+
+class Command(BaseCommand):
+    help = ('Compare greedy nearest-driver dispatch with batch optimal matching on a '
+            'synthetic surge (total pickup distance and assignments per second)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--drivers', type=int, default=600)
+        parser.add_argument('--radius-km', type=float, default=15.0,
+                            help='Radius around the city centre used to scatter points.')
+        parser.add_argument('--rounds', type=int, default=3)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def _scatter(self, rng, size, radius_km, center=(-74.0721, 4.7110)):
+        distance = radius_km * np.sqrt(rng.random(size))
+        angle = rng.random(size) * 2 * np.pi
+        lat = center[1] + (distance * np.sin(angle)) / 111.32
+        lon = center[0] + (distance * np.cos(angle)) / (111.32 * np.cos(np.radians(center[1])))
+        return np.column_stack((lon, lat))
+
+    def _greedy(self, pickups, drivers):
+        """Mirror of the per-request path: each request takes the closest free driver."""
+        free = np.ones(len(drivers), dtype=bool)
+        total_km = 0.0
+        assigned = 0
+        for pickup in pickups:
+            if not free.any():
+                break
+            distances = haversine_matrix(pickup[None, :], drivers)[0]
+            distances[~free] = np.inf
+            closest = int(np.argmin(distances))
+            free[closest] = False
+            total_km += distances[closest]
+            assigned += 1
+        return total_km, assigned
+
+    def _batch(self, pickups, drivers):
+        distances = haversine_matrix(pickups, drivers)
+        rows, columns = solve_assignment(distances)
+        return float(distances[rows, columns].sum()), len(rows)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        results = {'greedy': [], 'batch': []}
+
+        for _ in range(options['rounds']):
+            pickups = self._scatter(rng, options['requests'], options['radius_km'])
+            drivers = self._scatter(rng, options['drivers'], options['radius_km'])
+            for name, strategy in (('greedy', self._greedy), ('batch', self._batch)):
+                started = time.perf_counter()
+                total_km, assigned = strategy(pickups, drivers)
+                elapsed = time.perf_counter() - started
+                results[name].append((total_km, assigned, elapsed))
+
+        self.stdout.write(f"{options['requests']} requests, {options['drivers']} drivers, "
+                          f"{options['rounds']} rounds")
+        for name, runs in results.items():
+            total_km = sum(run[0] for run in runs) / len(runs)
+            assigned = sum(run[1] for run in runs) / len(runs)
+            elapsed = sum(run[2] for run in runs) / len(runs)
+            self.stdout.write(self.style.SUCCESS(
+                f'{name:>6}: total {total_km:10.2f} km | mean {total_km / assigned:6.3f} km | '
+                f'{assigned / elapsed:10.0f} assignments/s'
+            ))
+
+        greedy_km = sum(run[0] for run in results['greedy'])
+        batch_km = sum(run[0] for run in results['batch'])
+        self.stdout.write(f'Batch saves {100 * (greedy_km - batch_km) / greedy_km:.1f}% of drive distance')
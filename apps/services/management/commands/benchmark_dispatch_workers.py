@@ -0,0 +1,118 @@
+import math
+import multiprocessing
+import time
+from django.conf import settings
+from django.contrib.gis.geos import Point
+from django.core.management.base import BaseCommand
+import numpy as np
+
+from apps.addresses.models import Address
+from apps.drivers.models import Driver, DriverDispatchState
+from apps.services.dispatch import acquire_shards, run_dispatch_jobs, shard_for
+from apps.services.models import DispatchJob, Service
+from apps.users.models import User
+from common.db import close_connection_pools
+
+
+PREFIX = 'bench_dispatch_'
+
+
+def _drain(worker, workers, batch_size):
+    """
+    Worker process: lock its share of the shards and dispatch their jobs until none are due.
+    """
+    quota = math.ceil(settings.DISPATCH_REGION_SHARDS / workers)
+    shards = acquire_shards(quota, start=worker * quota)
+    try:
+        while shards and run_dispatch_jobs(limit=batch_size, shards=shards):
+            pass
+    finally:
+        # Ends the session, releasing the shard advisory locks.
+        close_connection_pools()
+
+
+class Command(BaseCommand):
+    help = ('Measure queued dispatch throughput with 1 to N region-sharded worker processes '
+            'on synthetic cities. Creates and deletes its own users, drivers and services.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cities', type=int, default=16)
+        parser.add_argument('--drivers-per-city', type=int, default=60)
+        parser.add_argument('--jobs-per-city', type=int, default=50)
+        parser.add_argument('--max-workers', type=int, default=8)
+        parser.add_argument('--batch-size', type=int, default=settings.DISPATCH_QUEUE_BATCH_SIZE)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def _cities(self, count):
+        # One city per region cell, laid out on a grid a few cells apart.
+        step = settings.DISPATCH_REGION_CELL_DEG * 3
+        side = math.ceil(math.sqrt(count))
+        return [(-80.0 + (i % side) * step + step / 2, -10.0 + (i // side) * step + step / 2)
+                for i in range(count)]
+
+    def _setup(self, rng, cities, drivers_per_city):
+        client = User.objects.create_user(username=f'{PREFIX}client', email=f'{PREFIX}client@example.com',
+                                          password=None, phone_number='+579989999999')
+        addresses = []
+        for city, (lon, lat) in enumerate(cities):
+            for i in range(drivers_per_city):
+                offset = rng.uniform(-0.05, 0.05, 2)
+                Driver(username=f'{PREFIX}{city}_{i}', email=f'{PREFIX}{city}_{i}@example.com',
+                       password='!', phone_number=f'+57999{city:03d}{i:04d}', vehicle_plate=f'B{city}{i}',
+                       vehicle_model='Bench', vehicle_year=2020, vehicle_color='Grey',
+                       location_coordinates=Point((lon + offset[0], lat + offset[1]), srid=4326),
+                       is_available=True).save()
+            addresses.append(Address(city=f'City {city}', state='Bench', country='Bench', postal_code='000',
+                                     coordinates=Point((lon, lat), srid=4326), created_by=client))
+        return client, Address.objects.bulk_create(addresses)
+
+    def _reset(self, client, addresses, jobs_per_city):
+        Service.objects.filter(client=client).delete()
+        DriverDispatchState.objects.filter(driver__username__startswith=PREFIX) \
+            .update(is_available=True, current_service_id=None)
+        services = Service.objects.bulk_create(
+            Service(client=client, pickup_address=address, status='PENDING')
+            for address in addresses for _ in range(jobs_per_city)
+        )
+        DispatchJob.objects.bulk_create(
+            DispatchJob(service=service,
+                        shard=shard_for(service.pickup_address.coordinates.x, service.pickup_address.coordinates.y))
+            for service in services
+        )
+        return len(services)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        cities = self._cities(options['cities'])
+        self.stdout.write(f"{options['cities']} cities, {options['drivers_per_city']} drivers and "
+                          f"{options['jobs_per_city']} jobs per city, {settings.DISPATCH_REGION_SHARDS} shards")
+
+        client, addresses = self._setup(rng, cities, options['drivers_per_city'])
+        try:
+            baseline = None
+            workers = 1
+            while workers <= options['max_workers']:
+                total = self._reset(client, addresses, options['jobs_per_city'])
+                # Children must not inherit pooled connections of this process.
+                close_connection_pools()
+
+                started = time.perf_counter()
+                processes = [multiprocessing.Process(target=_drain, args=(worker, workers, options['batch_size']))
+                             for worker in range(workers)]
+                for process in processes:
+                    process.start()
+                for process in processes:
+                    process.join()
+                elapsed = time.perf_counter() - started
+
+                done = DispatchJob.objects.filter(service__client=client, status='DONE').count()
+                throughput = done / elapsed
+                baseline = baseline or throughput
+                self.stdout.write(self.style.SUCCESS(
+                    f'{workers:>3} workers: {done}/{total} jobs in {elapsed:6.2f}s | '
+                    f'{throughput:8.1f} jobs/s | speedup {throughput / baseline:4.2f}x'
+                ))
+                workers *= 2
+        finally:
+            Service.objects.filter(client=client).delete()
+            User.objects.filter(username__startswith=PREFIX).delete()
@@ -0,0 +1,49 @@
+import random
+import time
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from apps.services.utils import haversine_distances, top_k_closest
+
+
+class Command(BaseCommand):
+    help = 'Micro-benchmark the haversine distance engine (NumPy vs pure Python)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 100_000, 1_000_000],
+                            help='Number of drivers to benchmark against.')
+        parser.add_argument('--k', type=int, default=5, help='Candidates returned by top-k.')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--skip-python-above', type=int, default=1_000_000,
+                            help='Skip the pure-Python fallback for larger sizes.')
+
+    def _time(self, func, repeat):
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - started)
+        return best * 1000
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        origin = (-74.0721, 4.7110)
+        self.stdout.write(f"{'drivers':>10} | {'engine':>7} | {'distances ms':>12} | {'top-k ms':>9}")
+
+        for size in options['sizes']:
+            lons = [origin[0] + rng.uniform(-0.5, 0.5) for _ in range(size)]
+            lats = [origin[1] + rng.uniform(-0.5, 0.5) for _ in range(size)]
+
+            engines = [('numpy', True)]
+            if size <= options['skip_python_above']:
+                engines.append(('python', False))
+
+            for name, use_numpy in engines:
+                # Coordinates arrive as arrays from dispatch and analytics callers.
+                xs, ys = (np.asarray(lons), np.asarray(lats)) if use_numpy else (lons, lats)
+                distances_ms = self._time(
+                    lambda: haversine_distances(*origin, xs, ys, use_numpy=use_numpy), options['repeat'])
+                top_k_ms = self._time(
+                    lambda: top_k_closest(*origin, xs, ys, k=options['k'], use_numpy=use_numpy),
+                    options['repeat'])
+                self.stdout.write(f'{size:>10} | {name:>7} | {distances_ms:>12.3f} | {top_k_ms:>9.3f}')
@@ -0,0 +1,94 @@
+import time
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.drivers.models import DriverDispatchState
+
+
+TABLE = 'benchmark_dispatch_state'
+
+# The nearest-driver query before the partial index: every available row is
+# measured and sorted.
+SORT_QUERY = (f'SELECT driver_id FROM {TABLE} WHERE is_available '
+              f'ORDER BY ST_Distance(location_coordinates, %(point)s::geography) LIMIT %(limit)s')
+# The current query: KNN over the partial GiST index, bounded by ST_DWithin.
+KNN_QUERY = (f'SELECT driver_id FROM {TABLE} WHERE is_available '
+             f'AND ST_DWithin(location_coordinates, %(point)s::geography, %(radius)s) '
+             f'ORDER BY location_coordinates <-> %(point)s::geography LIMIT %(limit)s')
+KNN_UNBOUNDED_QUERY = (f'SELECT driver_id FROM {TABLE} WHERE is_available '
+                       f'ORDER BY location_coordinates <-> %(point)s::geography LIMIT %(limit)s')
+
+
+class Command(BaseCommand):
+    help = ('Compare the sorted and the bounded KNN nearest-driver queries on synthetic fleets '
+            '(latency percentiles per fleet size)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--drivers', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+        parser.add_argument('--queries', type=int, default=50)
+        parser.add_argument('--limit', type=int, default=1)
+        parser.add_argument('--available', type=float, default=0.7,
+                            help='Fraction of available drivers.')
+        parser.add_argument('--radius-km', type=float, default=30.0,
+                            help='Radius around the city centre used to scatter points.')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def _fill(self, cursor, drivers, available, radius_km, center=(-74.0721, 4.7110)):
+        # Same table definition and indexes as the real one, without the FK to drivers.
+        cursor.execute(f'CREATE TEMP TABLE {TABLE} (LIKE {DriverDispatchState._meta.db_table} '
+                       f'INCLUDING DEFAULTS INCLUDING INDEXES) ON COMMIT DROP')
+        cursor.execute(
+            f'INSERT INTO {TABLE} (driver_id, location_coordinates, is_available) '
+            f'SELECT g, ST_SetSRID(ST_MakePoint('
+            f'  %(lon)s + d * cos(a) / (111.32 * cos(radians(%(lat)s))), %(lat)s + d * sin(a) / 111.32'
+            f'), 4326)::geography, random() < %(available)s '
+            f'FROM (SELECT g, %(radius)s * sqrt(random()) AS d, 2 * pi() * random() AS a '
+            f'      FROM generate_series(1, %(drivers)s) g) points',
+            {'lon': center[0], 'lat': center[1], 'radius': radius_km,
+             'available': available, 'drivers': drivers},
+        )
+        cursor.execute(f'ANALYZE {TABLE}')
+
+    def _time(self, cursor, query, pickups, limit, radii_km=None):
+        timings = []
+        for lon, lat in pickups:
+            point = f'SRID=4326;POINT({lon} {lat})'
+            started = time.perf_counter()
+            if radii_km is None:
+                cursor.execute(query, {'point': point, 'limit': limit})
+                cursor.fetchall()
+            else:
+                # Same widening as the claim: stop at the first radius with enough rows.
+                for radius_km in radii_km:
+                    cursor.execute(query, {'point': point, 'radius': radius_km * 1000, 'limit': limit})
+                    if len(cursor.fetchall()) >= limit:
+                        break
+                else:
+                    cursor.execute(KNN_UNBOUNDED_QUERY, {'point': point, 'limit': limit})
+                    cursor.fetchall()
+            timings.append((time.perf_counter() - started) * 1000)
+        return np.percentile(timings, [50, 95])
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        radius_deg = options['radius_km'] / 111.32
+        pickups = np.column_stack((
+            -74.0721 + rng.uniform(-radius_deg, radius_deg, options['queries']),
+            4.7110 + rng.uniform(-radius_deg, radius_deg, options['queries']),
+        ))
+
+        for drivers in options['drivers']:
+            with transaction.atomic(), connection.cursor() as cursor:
+                started = time.perf_counter()
+                self._fill(cursor, drivers, options['available'], options['radius_km'])
+                self.stdout.write(f'{drivers} drivers loaded in {time.perf_counter() - started:.1f}s')
+
+                sort_p50, sort_p95 = self._time(cursor, SORT_QUERY, pickups, options['limit'])
+                knn_p50, knn_p95 = self._time(cursor, KNN_QUERY, pickups, options['limit'],
+                                              radii_km=settings.DISPATCH_SEARCH_RADII_KM)
+                self.stdout.write(self.style.SUCCESS(
+                    f'  sort: p50 {sort_p50:8.2f} ms | p95 {sort_p95:8.2f} ms\n'
+                    f'   knn: p50 {knn_p50:8.2f} ms | p95 {knn_p95:8.2f} ms'
+                ))
@@ -0,0 +1,58 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from apps.services.models import Service
+from apps.services.persmissions import ServicePermission
+
+
+def _related_check(request, service):
+    """
+    The object check before ServicePermission compared ids: it compared
+    related instances, loading the client and the driver (through users).
+    """
+    return service.client == request.user or (
+        service.driver is not None and service.driver.user_ptr_id == request.user.id)
+
+
+class Command(BaseCommand):
+    help = ('Count the queries and time of ServicePermission object checks on existing services, '
+            'against comparing related instances')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--services', type=int, default=1000)
+
+    def _measure(self, services, check):
+        """
+        Run ``check`` for each service's assigned driver on freshly loaded rows.
+        """
+        factory = APIRequestFactory()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for service in services:
+                request = factory.get('/')
+                request.user = service.driver
+                check(request, Service.objects.get(pk=service.pk))
+            elapsed = time.perf_counter() - started
+        # The row fetch itself is one query per service.
+        return len(queries) - len(services), elapsed
+
+    def handle(self, *args, **options):
+        services = list(Service.objects.select_related('driver').exclude(driver=None)[:options['services']])
+        if not services:
+            self.stdout.write(self.style.WARNING('No assigned services to check; load some data first.'))
+            return
+
+        permission = ServicePermission()
+        view = type('BenchmarkView', (), {'action': 'retrieve'})()
+        for name, check in (
+            ('related instances', _related_check),
+            ('ServicePermission', lambda request, service: permission.has_object_permission(request, view, service)),
+        ):
+            extra, elapsed = self._measure(services, check)
+            self.stdout.write(self.style.SUCCESS(
+                f'{name:>18}: {extra / len(services):4.2f} extra queries per check | '
+                f'{elapsed / len(services) * 1000:6.3f} ms per check ({len(services)} services)'
+            ))
@@ -0,0 +1,109 @@
+import re
+import time
+import xml.etree.ElementTree as ElementTree
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.services.eta import RoadGraph
+from apps.services.utils import haversine_km
+
+
+# Free-flow speeds in km/h for ways without a usable maxspeed tag.
+DEFAULT_SPEEDS_KMH = {
+    'motorway': 90, 'motorway_link': 50,
+    'trunk': 70, 'trunk_link': 40,
+    'primary': 50, 'primary_link': 35,
+    'secondary': 40, 'secondary_link': 30,
+    'tertiary': 35, 'tertiary_link': 25,
+    'unclassified': 25, 'residential': 25,
+    'living_street': 10, 'service': 15,
+}
+
+
+def _speed_kmh(tags):
+    match = re.match(r'\s*(\d+(?:\.\d+)?)\s*(mph)?', tags.get('maxspeed', ''))
+    if match:
+        speed = float(match.group(1))
+        return speed * 1.609344 if match.group(2) else speed
+    return DEFAULT_SPEEDS_KMH[tags['highway']]
+
+
+def _direction(tags):
+    """
+    Return 1 for forward-only ways, -1 for reverse-only ways and 0 for two-way ways.
+    """
+    oneway = tags.get('oneway')
+    if oneway in ('yes', 'true', '1'):
+        return 1
+    if oneway == '-1':
+        return -1
+    if oneway is None and (tags['highway'] in ('motorway', 'motorway_link')
+                           or tags.get('junction') == 'roundabout'):
+        return 1
+    return 0
+
+
+class Command(BaseCommand):
+    help = 'Build the road graph used by RoadNetworkEtaEngine from an OpenStreetMap XML extract'
+
+    def add_arguments(self, parser):
+        parser.add_argument('osm_file', help='OpenStreetMap XML (.osm) extract of the service area.')
+        parser.add_argument('output', help='Destination .npz file (set ETA_ROAD_GRAPH_PATH to it).')
+        parser.add_argument('--landmarks', type=int, default=16,
+                            help='Number of ALT landmarks to precompute.')
+
+    def _read_osm(self, path):
+        coordinates, ways = {}, []
+        try:
+            for _, element in ElementTree.iterparse(path, events=('end',)):
+                if element.tag == 'node':
+                    coordinates[int(element.get('id'))] = (float(element.get('lon')), float(element.get('lat')))
+                    element.clear()
+                elif element.tag == 'way':
+                    tags = {tag.get('k'): tag.get('v') for tag in element.iter('tag')}
+                    if tags.get('highway') in DEFAULT_SPEEDS_KMH:
+                        ways.append(([int(nd.get('ref')) for nd in element.iter('nd')], tags))
+                    element.clear()
+        except (OSError, ElementTree.ParseError) as exc:
+            raise CommandError(f'Could not read {path}: {exc}')
+        return coordinates, ways
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        coordinates, ways = self._read_osm(options['osm_file'])
+
+        index = {}
+        sources, targets, seconds = [], [], []
+        for refs, tags in ways:
+            refs = [ref for ref in refs if ref in coordinates]
+            speed_kmh = _speed_kmh(tags)
+            direction = _direction(tags)
+            for start, end in zip(refs, refs[1:]):
+                length_km = haversine_km(*coordinates[start], *coordinates[end])
+                cost = length_km / speed_kmh * 3600
+                a = index.setdefault(start, len(index))
+                b = index.setdefault(end, len(index))
+                edges = []
+                if direction >= 0:
+                    edges.append((a, b))
+                if direction <= 0:
+                    edges.append((b, a))
+                for source, target in edges:
+                    sources.append(source)
+                    targets.append(target)
+                    seconds.append(cost)
+
+        if not index:
+            raise CommandError('No drivable ways found in the extract.')
+
+        node_ids = list(index)
+        graph = RoadGraph(node_ids,
+                          [coordinates[node_id][0] for node_id in node_ids],
+                          [coordinates[node_id][1] for node_id in node_ids],
+                          sources, targets, seconds)
+        graph.build_landmarks(options['landmarks'])
+        graph.save(options['output'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Built {len(graph)} nodes, {len(sources)} edges and {graph.from_landmarks.shape[1]} landmarks '
+            f'in {time.monotonic() - started:.1f}s'
+        ))
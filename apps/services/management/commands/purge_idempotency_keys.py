@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.services.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = 'Delete service idempotency keys older than SERVICE_IDEMPOTENCY_KEY_TTL_HOURS'
+
+    def handle(self, *args, **options):
+        deleted, _ = IdempotencyKey.objects.filter(created_at__lt=IdempotencyKey.expiry_cutoff()).delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired idempotency keys'))
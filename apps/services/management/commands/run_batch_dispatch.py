@@ -0,0 +1,38 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.services.dispatch import dispatch_pending_batch
+
+
+class Command(BaseCommand):
+    help = 'Assign pending services to drivers in batches using an optimal matching'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--window', type=float, default=settings.DISPATCH_BATCH_WINDOW_SECONDS,
+                            help='Seconds to gather pending services between batches.')
+        parser.add_argument('--max-distance-km', type=float, default=settings.DISPATCH_BATCH_MAX_DISTANCE_KM,
+                            help='Farthest pickup a driver can be matched to.')
+        parser.add_argument('--limit', type=int, default=None,
+                            help='Maximum number of pending services per batch.')
+        parser.add_argument('--once', action='store_true',
+                            help='Run a single batch and exit.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.NOTICE(f"Batch dispatch running every {options['window']}s"))
+
+        while True:
+            started = time.monotonic()
+            assigned = dispatch_pending_batch(max_distance_km=options['max_distance_km'],
+                                              limit=options['limit'])
+            elapsed = time.monotonic() - started
+
+            if assigned:
+                total_km = sum(float(service.distance_km) for service in assigned)
+                self.stdout.write(self.style.SUCCESS(
+                    f'Assigned {len(assigned)} services ({total_km:.2f} km total) in {elapsed * 1000:.1f} ms'
+                ))
+
+            if options['once']:
+                return
+            time.sleep(max(options['window'] - elapsed, 0))
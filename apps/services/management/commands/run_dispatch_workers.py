@@ -0,0 +1,100 @@
+import math
+import multiprocessing
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.services.dispatch import acquire_shards, run_dispatch_jobs
+from common.db import close_connection_pools
+
+
+class Command(BaseCommand):
+    help = ('Drain the dispatch job queue with a pool of worker processes, each owning '
+            'a disjoint set of region shards')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.DISPATCH_QUEUE_WORKERS,
+                            help='Number of worker processes.')
+        parser.add_argument('--batch-size', type=int, default=settings.DISPATCH_QUEUE_BATCH_SIZE,
+                            help='Jobs taken per worker transaction.')
+        parser.add_argument('--poll-interval', type=float, default=settings.DISPATCH_QUEUE_POLL_SECONDS,
+                            help='Seconds to wait when the queue is empty.')
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the due jobs in this process and exit.')
+
+    def _report(self, worker, jobs, elapsed):
+        latencies = [job.latency_ms for job in jobs]
+        done = sum(job.status == 'DONE' for job in jobs)
+        self.stdout.write(self.style.SUCCESS(
+            f'worker {worker}: {len(jobs)} jobs ({done} done) in {elapsed * 1000:.1f} ms | '
+            f'latency mean {sum(latencies) / len(latencies):.1f} ms, max {max(latencies):.1f} ms'
+        ))
+
+    def _work(self, options):
+        """
+        Single unsharded worker: takes jobs of every shard.
+        """
+        while True:
+            started = time.monotonic()
+            try:
+                jobs = run_dispatch_jobs(limit=options['batch_size'])
+            finally:
+                close_old_connections()
+            if jobs:
+                self._report(0, jobs, time.monotonic() - started)
+            elif options['once']:
+                return
+            else:
+                time.sleep(options['poll_interval'])
+
+    def _work_sharded(self, worker, workers, options):
+        """
+        Sharded worker: only takes jobs of the shards it holds an advisory lock on.
+
+        The connection is kept open for the life of the process because the
+        shard locks are tied to it; a lost connection ends the process and
+        the parent starts a replacement.
+        """
+        quota = math.ceil(settings.DISPATCH_REGION_SHARDS / workers)
+        shards = acquire_shards(quota, start=worker * quota)
+        self.stdout.write(self.style.NOTICE(f'worker {worker}: shards {shards}'))
+
+        while True:
+            started = time.monotonic()
+            jobs = run_dispatch_jobs(limit=options['batch_size'], shards=shards) if shards else []
+            if jobs:
+                self._report(worker, jobs, time.monotonic() - started)
+                continue
+            if len(shards) < quota:
+                # Pick up shards released by a worker that stopped.
+                shards = sorted(shards + acquire_shards(quota - len(shards), start=worker * quota, held=shards))
+            time.sleep(options['poll_interval'])
+
+    def _start(self, worker, options):
+        process = multiprocessing.Process(target=self._work_sharded,
+                                          args=(worker, options['workers'], options), daemon=True)
+        process.start()
+        return process
+
+    def handle(self, *args, **options):
+        if options['once'] or options['workers'] <= 1:
+            self._work(options)
+            return
+
+        self.stdout.write(self.style.NOTICE(
+            f"Starting {options['workers']} dispatch workers over {settings.DISPATCH_REGION_SHARDS} shards"))
+        # Forked children must open their own database connections (and pools):
+        # shard advisory locks are per session.
+        close_connection_pools()
+        processes = [self._start(worker, options) for worker in range(options['workers'])]
+        try:
+            while True:
+                for worker, process in enumerate(processes):
+                    if not process.is_alive():
+                        self.stdout.write(self.style.WARNING(f'worker {worker} exited, restarting'))
+                        processes[worker] = self._start(worker, options)
+                time.sleep(1)
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
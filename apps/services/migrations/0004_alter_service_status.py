@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-17 16:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0003_remove_service_cancellation_reason_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='service',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('IN_PROGRESS', 'In progress'), ('COMPLETED', 'Completed')], default='IN_PROGRESS', max_length=15),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0004_alter_service_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
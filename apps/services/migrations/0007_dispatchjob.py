@@ -0,0 +1,34 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0006_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DispatchJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('QUEUED', 'Queued'), ('DONE', 'Done'), ('FAILED', 'Failed')],
+                                            default='QUEUED', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('latency_ms', models.FloatField(blank=True, null=True)),
+                ('service', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE,
+                                                 related_name='dispatch_job', to='services.service')),
+            ],
+            options={
+                'verbose_name': 'Dispatch job',
+                'verbose_name_plural': 'Dispatch jobs',
+                'indexes': [models.Index(condition=models.Q(('status', 'QUEUED')), fields=['run_after'],
+                                         name='services_dispatchjob_queued')],
+            },
+        ),
+    ]
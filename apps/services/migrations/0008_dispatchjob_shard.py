@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0007_dispatchjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dispatchjob',
+            name='shard',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RemoveIndex(
+            model_name='dispatchjob',
+            name='services_dispatchjob_queued',
+        ),
+        migrations.AddIndex(
+            model_name='dispatchjob',
+            index=models.Index(condition=models.Q(('status', 'QUEUED')), fields=['shard', 'run_after'],
+                               name='services_dispatchjob_queued'),
+        ),
+    ]
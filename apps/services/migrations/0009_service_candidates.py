@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0008_dispatchjob_shard'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='candidates',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
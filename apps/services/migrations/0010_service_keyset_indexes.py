@@ -0,0 +1,26 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('services', '0009_service_candidates'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='service',
+            index=models.Index(fields=['created_at', 'id'], name='services_created_id'),
+        ),
+        AddIndexConcurrently(
+            model_name='service',
+            index=models.Index(fields=['client', 'created_at', 'id'], name='services_client_created_id'),
+        ),
+        AddIndexConcurrently(
+            model_name='service',
+            index=models.Index(fields=['driver', 'created_at', 'id'], name='services_driver_created_id'),
+        ),
+    ]
@@ -1 +1,3 @@
-from .service_model import Service
\ No newline at end of file
+from .service_model import Service
+from .idempotency_key_model import IdempotencyKey
+from .dispatch_job_model import DispatchJob
@@ -0,0 +1,50 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from apps.services.models.service_model import Service
+
+
+class DispatchJob(models.Model):
+    """
+    Queued dispatch of a ``PENDING`` service, drained by ``run_dispatch_workers``.
+
+    Workers take due jobs with ``FOR UPDATE SKIP LOCKED``, so Postgres is the
+    only broker. A job whose service finds no driver is retried after
+    ``DISPATCH_QUEUE_RETRY_SECONDS`` until ``DISPATCH_QUEUE_MAX_ATTEMPTS``.
+
+    ``shard`` is derived from the geographic cell of the pickup; sharded
+    workers only take jobs of the shards they hold an advisory lock on.
+    """
+    STATUS_CHOICES = (
+        ('QUEUED', 'Queued'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    )
+
+    service = models.OneToOneField(Service,
+                                   on_delete=models.CASCADE,
+                                   related_name='dispatch_job')
+    status = models.CharField(max_length=10,
+                              choices=STATUS_CHOICES,
+                              default='QUEUED')
+    shard = models.PositiveIntegerField(default=0)
+    attempts = models.PositiveIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Time from enqueue to the end of the last attempt.
+    latency_ms = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        app_label = 'services'
+        verbose_name = _('Dispatch job')
+        verbose_name_plural = _('Dispatch jobs')
+        indexes = [
+            # Workers only ever scan queued jobs of their shards in run_after order.
+            models.Index(fields=['shard', 'run_after'], condition=models.Q(status='QUEUED'),
+                         name='services_dispatchjob_queued'),
+        ]
+
+    def __str__(self):
+        return f"{self.service_id} - {self.status}"
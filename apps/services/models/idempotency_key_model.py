@@ -0,0 +1,56 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from apps.users.models import User
+
+
+class IdempotencyKey(models.Model):
+    """
+    Response stored for a service request sent with an ``Idempotency-Key`` header.
+
+    Retries with the same key replay ``response`` instead of dispatching
+    again. Rows expire after ``SERVICE_IDEMPOTENCY_KEY_TTL_HOURS``.
+    """
+    user = models.ForeignKey(User,
+                             on_delete=models.CASCADE,
+                             related_name='+')
+    key = models.CharField(max_length=255)
+    # SHA-256 of the request body, to reject a key reused for a different request.
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        app_label = 'services'
+        verbose_name = _('Idempotency key')
+        verbose_name_plural = _('Idempotency keys')
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='services_idempotency_user_key'),
+        ]
+        indexes = [
+            models.Index(fields=['created_at'], name='services_idempotency_created'),
+        ]
+
+    @staticmethod
+    def fingerprint_for(data):
+        body = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder)
+        return hashlib.sha256(body.encode()).hexdigest()
+
+    @staticmethod
+    def expiry_cutoff():
+        return timezone.now() - timedelta(hours=settings.SERVICE_IDEMPOTENCY_KEY_TTL_HOURS)
+
+    @property
+    def is_expired(self):
+        return self.created_at < self.expiry_cutoff()
+
+    def __str__(self):
+        return f"{self.user_id} - {self.key}"
@@ -11,6 +11,7 @@ from apps.addresses.models import Address
 
 class Service(BaseModel):
     STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
         ('IN_PROGRESS', 'In progress'),
         ('COMPLETED', 'Completed'),
     )
@@ -36,6 +37,18 @@ class Service(BaseModel):
                                       validators=[MinValueValidator(Decimal('0'))])
     estimated_arrival_minutes = models.PositiveIntegerField(null=True,
                                                             blank=True)
+    # Ranked fallback drivers ({driver, distance_km, eta_minutes, lon, lat})
+    # computed at dispatch and walked by reassignment.
+    candidates = models.JSONField(default=list, blank=True)
+    # Bumped on every write; conditional updates use it for optimistic locking.
+    version = models.PositiveIntegerField(default=0)
+    
+    def save(self, *args, **kwargs):
+        self.version += 1
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'version'}
+        super().save(*args, **kwargs)
     
     class Meta:
         app_label = 'services'
@@ -43,4 +56,8 @@ class Service(BaseModel):
         verbose_name_plural = _('Services')
         indexes = [
             models.Index(fields=['status']),
+            # Keyset pagination on (created_at, id), for admins, clients and drivers.
+            models.Index(fields=['created_at', 'id'], name='services_created_id'),
+            models.Index(fields=['client', 'created_at', 'id'], name='services_client_created_id'),
+            models.Index(fields=['driver', 'created_at', 'id'], name='services_driver_created_id'),
         ]
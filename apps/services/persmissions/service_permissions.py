@@ -6,7 +6,7 @@ class ServicePermission(permissions.BasePermission):
     Custom permission for Service model:
     1. Only admins, the client who created the service, or the assigned driver can view the service
     2. Only admins or the client who created the service can edit the service
-    3. Only the assigned driver can update the service status (complete action)
+    3. Only the assigned driver can update the service status (complete and reassign actions)
     """
     
     def has_permission(self, request, view):
@@ -18,16 +18,17 @@ class ServicePermission(permissions.BasePermission):
         if request.user.is_staff or request.user.is_superuser:
             return True
         
+        # Ids are compared so no related row is loaded; a driver's id is its user's id.
         # Client permissions - can view and edit their own services
-        if obj.client == request.user:
-            if view.action == 'complete':
-                # Clients cannot use the complete action
+        if obj.client_id == request.user.id:
+            if view.action in ('complete', 'reassign'):
+                # Clients cannot use the complete or reassign actions
                 return False
             return True
         
-        # Driver permissions - can view and use the complete action
-        if hasattr(obj, 'driver') and obj.driver and obj.driver.user_ptr_id == request.user.id:
-            if request.method in permissions.SAFE_METHODS or view.action == 'complete':
+        # Driver permissions - can view and use the complete and reassign actions
+        if obj.driver_id is not None and obj.driver_id == request.user.id:
+            if request.method in permissions.SAFE_METHODS or view.action in ('complete', 'reassign'):
                 return True
             return False
         
@@ -1,13 +1,16 @@
 from decimal import Decimal
 from unittest import mock
+from django.core.cache import cache
+from django.db import IntegrityError
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
 from django.contrib.gis.geos import Point
 
-from apps.services.models import Service
+from apps.services.models import IdempotencyKey, Service
+from apps.services.api.v1.views.service_view import ServiceViewSet
 from apps.users.models import User
-from apps.drivers.models import Driver
+from apps.drivers.models import Driver, DriverDispatchState
 from apps.addresses.models import Address
 
 
@@ -128,6 +131,54 @@ class ServiceAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data.get('results', [])), Service.objects.filter(driver=self.driver).count())
         
+    def test_list_services_is_one_query_per_request(self):
+        """Test that the role is resolved once and the listing is a single query."""
+        cache.clear()
+        for user in (self.client_user, self.driver_user):
+            self.client.force_authenticate(user=user)
+            self.client.get(self.list_url)
+            with self.assertNumQueries(1):
+                response = self.client.get(self.list_url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual([service['id'] for service in response.data['results']], [self.client_service.pk])
+
+    def test_list_services_page_of_100_is_one_query(self):
+        """Test that a full 100-row page, nested or compact, is rendered from a single query."""
+        Service.objects.bulk_create(
+            Service(client=self.client_user, driver=self.driver if i % 2 else None,
+                    pickup_address=self.client_address, status='PENDING')
+            for i in range(99)
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url, {'page_size': 100})
+        self.assertEqual(len(response.data['results']), 100)
+        self.assertEqual(response.data['results'][0]['client']['id'], self.client_user.pk)
+        
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url, {'page_size': 100, 'view': 'compact'})
+        self.assertEqual(len(response.data['results']), 100)
+        self.assertEqual(response.data['results'][0]['client'], self.client_user.pk)
+
+    def test_list_services_as_driver_includes_own_requests(self):
+        """Test that a driver sees assigned services and services they requested, once each."""
+        driver_address = Address.objects.create(
+            street='Driver Street',
+            state='Test State',
+            city='Driver City',
+            country='Driver Country',
+            coordinates=Point((34.0522, -118.2437), srid=4326),
+            created_by=self.driver_user
+        )
+        own_service = Service.objects.create(client=self.driver_user, pickup_address=driver_address,
+                                             status='PENDING')
+        self.client.force_authenticate(user=self.driver_user)
+        response = self.client.get(self.list_url)
+        
+        self.assertEqual([service['id'] for service in response.data['results']],
+                         [own_service.pk, self.client_service.pk])
+        
 
     def test_retrieve_service_as_client(self):
         """Test that client can retrieve their own service."""
@@ -143,7 +194,7 @@ class ServiceAPITestCase(APITestCase):
         self.client.force_authenticate(user=self.client_user)
         
         # Set all drivers as unavailable
-        Driver.objects.update(is_available=False)
+        DriverDispatchState.objects.update(is_available=False)
         
         data = {
             'pickup_address': self.client_address.id
@@ -175,6 +226,50 @@ class ServiceAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('You can only use addresses that belong to you', str(response.data))
 
+    def test_create_service_retry_with_idempotency_key(self):
+        """Test that a retried POST with the same Idempotency-Key replays the first response."""
+        self.client.force_authenticate(user=self.client_user)
+        data = {'pickup_address': self.client_address.id}
+        
+        first = self.client.post(self.list_url, data, format='json', HTTP_IDEMPOTENCY_KEY='retry-1')
+        with mock.patch('apps.services.api.v1.views.service_view.claim_closest_driver') as claim:
+            retry = self.client.post(self.list_url, data, format='json', HTTP_IDEMPOTENCY_KEY='retry-1')
+        
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        claim.assert_not_called()
+        self.assertEqual(Service.objects.filter(client=self.client_user).count(), 2)
+
+    def test_idempotency_key_reused_for_other_request(self):
+        """Test that a key reused with a different body is rejected and failures are not stored."""
+        self.client.force_authenticate(user=self.client_user)
+        DriverDispatchState.objects.update(is_available=False)
+        
+        response = self.client.post(self.list_url, {'pickup_address': self.client_address.id},
+                                    format='json', HTTP_IDEMPOTENCY_KEY='retry-2')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(IdempotencyKey.objects.filter(key='retry-2').exists())
+        
+        DriverDispatchState.objects.update(is_available=True)
+        response = self.client.post(self.list_url, {'pickup_address': self.client_address.id},
+                                    format='json', HTTP_IDEMPOTENCY_KEY='retry-2')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        
+        response = self.client.post(self.list_url, {'pickup_address': self.other_user_address.id},
+                                    format='json', HTTP_IDEMPOTENCY_KEY='retry-2')
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_dispatch_integrity_error_is_not_a_key_race(self):
+        """Test that an integrity error while dispatching propagates instead of replaying a missing key."""
+        self.client.force_authenticate(user=self.client_user)
+        with mock.patch.object(ServiceViewSet, '_create_service', side_effect=IntegrityError('dispatch')):
+            with self.assertRaisesMessage(IntegrityError, 'dispatch'):
+                self.client.post(self.list_url, {'pickup_address': self.client_address.id},
+                                 format='json', HTTP_IDEMPOTENCY_KEY='retry-3')
+        self.assertFalse(IdempotencyKey.objects.filter(key='retry-3').exists())
+
     def test_complete_service(self):
         """Test marking a service as completed."""
         self.client.force_authenticate(user=self.driver_user)
@@ -189,11 +284,12 @@ class ServiceAPITestCase(APITestCase):
         
         # Refresh the service from database
         self.client_service.refresh_from_db()
-        self.driver.refresh_from_db()
+        state = DriverDispatchState.objects.get(pk=self.client_service.driver_id)
         
         # Check that service status is updated and driver is available
         self.assertEqual(self.client_service.status, 'COMPLETED')
-        self.assertTrue(self.driver.is_available)
+        self.assertTrue(state.is_available)
+        self.assertIsNone(state.current_service_id)
 
     def test_complete_already_completed_service(self):
         """Test marking an already completed service as completed."""
@@ -209,6 +305,28 @@ class ServiceAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('Service is not in progress', response.data['detail'])
 
+    def test_complete_with_stale_version(self):
+        """Test that completing with an outdated If-Match version is rejected."""
+        self.client.force_authenticate(user=self.driver_user)
+        
+        response = self.client.patch(self.complete_url, HTTP_IF_MATCH=str(self.client_service.version - 1))
+        
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.client_service.refresh_from_db()
+        self.assertEqual(self.client_service.status, 'IN_PROGRESS')
+
+    def test_complete_does_not_free_reassigned_driver(self):
+        """Test that completing a service leaves a driver already busy with another service alone."""
+        self.client.force_authenticate(user=self.driver_user)
+        DriverDispatchState.objects.filter(pk=self.driver.pk).update(is_available=False,
+                                                                     current_service_id=self.client_service.pk + 1)
+        
+        response = self.client.patch(self.complete_url)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['version'], self.client_service.version + 1)
+        self.assertFalse(DriverDispatchState.objects.get(pk=self.driver.pk).is_available)
+
     def test_unauthenticated_access(self):
         """Test that unauthenticated users cannot access the API."""
         # Try to list services
@@ -0,0 +1,22 @@
+from django.contrib.gis.geos import Point
+
+from apps.drivers.models import Driver
+
+
+class DriverTestMixin:
+    """Mixin for dispatch tests that place available drivers on the map."""
+
+    def _create_driver(self, username, phone, coords):
+        """Create an available driver at the given ``(lon, lat)``."""
+        return Driver.objects.create_user(
+            username=username,
+            email=f'{username}@example.com',
+            password='testpassword123',
+            phone_number=phone,
+            vehicle_plate=username.upper(),
+            vehicle_model='Mazda 2',
+            vehicle_year=2019,
+            vehicle_color='Black',
+            location_coordinates=Point(coords, srid=4326),
+            is_available=True
+        )
@@ -0,0 +1,136 @@
+import itertools
+import numpy as np
+from unittest import mock
+from django.urls import reverse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.contrib.gis.geos import Point
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.services.models import Service
+from apps.services.dispatch import dispatch_pending_batch, solve_assignment
+from apps.services.utils import haversine_matrix
+from apps.services.dispatch import batch
+from apps.users.models import User
+from apps.drivers.models import DriverDispatchState
+from apps.services.tests.test_base import DriverTestMixin
+from apps.addresses.models import Address
+
+
+class AssignmentSolverTestCase(SimpleTestCase):
+    """Test case for the distance matrix and the assignment solver."""
+
+    def test_haversine_matrix_known_distance(self):
+        """Test the distance between Bogota and Medellin (~240 km)."""
+        distances = haversine_matrix([(-74.0721, 4.7110)], [(-75.5636, 6.2518), (-74.0721, 4.7110)])
+        self.assertEqual(distances.shape, (1, 2))
+        self.assertAlmostEqual(distances[0, 0], 237.6, delta=1.0)
+        self.assertAlmostEqual(distances[0, 1], 0.0)
+
+    def test_bundled_solver_matches_brute_force(self):
+        """Test the bundled Hungarian solver against exhaustive search."""
+        rng = np.random.default_rng(7)
+        for rows, columns in [(3, 3), (2, 5), (5, 2), (4, 4)]:
+            cost = rng.random((rows, columns))
+            with self.subTest(shape=(rows, columns)):
+                with mock.patch.object(batch, 'linear_sum_assignment', None):
+                    row_idx, col_idx = solve_assignment(cost)
+                size = min(rows, columns)
+                best = min(
+                    sum(cost[r, c] for r, c in zip(rs, cs))
+                    for rs in itertools.permutations(range(rows), size)
+                    for cs in itertools.permutations(range(columns), size)
+                )
+                self.assertEqual(len(row_idx), size)
+                self.assertAlmostEqual(cost[row_idx, col_idx].sum(), best)
+
+
+class BatchDispatchTestCase(DriverTestMixin, TestCase):
+    """Test case for batch (global) assignment of pending services."""
+
+    def setUp(self):
+        """Set up a scenario where greedy matching is not optimal."""
+        self.client_user = User.objects.create_user(
+            username='batch_client',
+            email='batch_client@example.com',
+            password='testpassword123',
+            phone_number='+34652345678'
+        )
+        # Greedy gives driver A to the first pickup (0.002 deg away) and leaves the
+        # second one with the far driver B; swapping them is shorter overall.
+        self.driver_a = self._create_driver('batch_a', '+34652345670', (-74.0000, 4.7000))
+        self.driver_b = self._create_driver('batch_b', '+34652345671', (-74.0100, 4.7000))
+
+        first = self._create_address((-74.0020, 4.7000))
+        second = self._create_address((-73.9990, 4.7000))
+        self.first = Service.objects.create(client=self.client_user, pickup_address=first, status='PENDING')
+        self.second = Service.objects.create(client=self.client_user, pickup_address=second, status='PENDING')
+
+    def _create_address(self, coords):
+        return Address.objects.create(
+            street='Carrera 7',
+            city='Bogota',
+            state='Cundinamarca',
+            country='Colombia',
+            postal_code='110111',
+            coordinates=Point(coords, srid=4326),
+            created_by=self.client_user
+        )
+
+    def test_batch_minimizes_total_distance(self):
+        """Test that the batch picks the assignment with the lowest total distance."""
+        assigned = dispatch_pending_batch()
+        self.assertEqual(len(assigned), 2)
+
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual(self.first.driver_id, self.driver_b.pk)
+        self.assertEqual(self.second.driver_id, self.driver_a.pk)
+        self.assertEqual(self.first.status, 'IN_PROGRESS')
+        self.assertFalse(DriverDispatchState.objects.filter(is_available=True).exists())
+
+    def test_out_of_range_services_stay_pending(self):
+        """Test that services without a driver in range are left for the next window."""
+        assigned = dispatch_pending_batch(max_distance_km=0.05)
+        self.assertEqual(assigned, [])
+        self.assertEqual(Service.objects.filter(status='PENDING').count(), 2)
+
+    def test_regions_are_matched_separately(self):
+        """Test that a pickup in another city gets a driver of that city."""
+        medellin_driver = self._create_driver('batch_c', '+34652345672', (-75.5636, 6.2518))
+        medellin = Service.objects.create(client=self.client_user, status='PENDING',
+                                          pickup_address=self._create_address((-75.5640, 6.2518)))
+
+        assigned = dispatch_pending_batch()
+        self.assertEqual(len(assigned), 3)
+        medellin.refresh_from_db()
+        self.assertEqual(medellin.driver_id, medellin_driver.pk)
+
+    def test_driver_taken_after_matching_is_skipped(self):
+        """Test that a match whose driver was claimed meanwhile leaves its service pending."""
+        match_region = batch._match_region
+
+        def claim_during_match(*args):
+            matches = match_region(*args)
+            DriverDispatchState.objects.filter(pk=self.driver_a.pk).update(is_available=False)
+            return matches
+
+        with mock.patch.object(batch, '_match_region', side_effect=claim_during_match):
+            assigned = dispatch_pending_batch()
+
+        self.assertEqual([service.pk for service in assigned], [self.first.pk])
+        self.second.refresh_from_db()
+        self.assertEqual(self.second.status, 'PENDING')
+        self.assertIsNone(self.second.driver_id)
+
+    @override_settings(DISPATCH_MODE='batch')
+    def test_create_in_batch_mode_returns_accepted(self):
+        """Test that service creation defers assignment in batch mode."""
+        client = APIClient()
+        client.force_authenticate(user=self.client_user)
+        response = client.post(reverse('urls-v1:service-list'),
+                               {'pickup_address': self.first.pickup_address_id}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'PENDING')
+        self.assertIsNone(response.data['driver'])
@@ -0,0 +1,141 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connection
+from django.urls import reverse
+from django.test import TransactionTestCase
+from django.contrib.gis.geos import Point
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.services.models import Service
+from apps.users.models import User
+from apps.drivers.models import Driver, DriverDispatchState
+from apps.addresses.models import Address
+
+
+class ConcurrentDispatchTestCase(TransactionTestCase):
+    """Stress test for concurrent service creation against the same driver pool."""
+
+    DRIVERS = 20
+    REQUESTS = 40
+    WORKERS = 16
+
+    def setUp(self):
+        """Set up a pool of drivers and clients around the same pickup area."""
+        for i in range(self.DRIVERS):
+            Driver.objects.create_user(
+                username=f'stress_driver_{i}',
+                email=f'stress_driver_{i}@example.com',
+                password='testpassword123',
+                phone_number=f'+3460000{i:04d}',
+                vehicle_plate=f'STR{i:03d}',
+                vehicle_model='Renault Logan',
+                vehicle_year=2020,
+                vehicle_color='Grey',
+                location_coordinates=Point((-74.0721 + i * 0.001, 4.7110), srid=4326),
+                is_available=True
+            )
+
+        self.clients = []
+        for i in range(self.REQUESTS):
+            user = User.objects.create_user(
+                username=f'stress_client_{i}',
+                email=f'stress_client_{i}@example.com',
+                password='testpassword123',
+                phone_number=f'+3461000{i:04d}'
+            )
+            address = Address.objects.create(
+                street='Calle 100',
+                city='Bogota',
+                state='Cundinamarca',
+                country='Colombia',
+                postal_code='110111',
+                coordinates=Point((-74.0721, 4.7110), srid=4326),
+                created_by=user
+            )
+            self.clients.append((user, address))
+
+        self.list_url = reverse('urls-v1:service-list')
+
+    def _create_service(self, user, address):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        try:
+            return client.post(self.list_url, {'pickup_address': address.id}, format='json').status_code
+        finally:
+            connection.close()
+
+    def test_parallel_dispatch_never_double_books(self):
+        """Test that parallel POSTs claim each driver at most once and never block on each other."""
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as executor:
+            codes = list(executor.map(lambda args: self._create_service(*args), self.clients))
+
+        self.assertEqual(codes.count(status.HTTP_201_CREATED), self.DRIVERS)
+        self.assertEqual(codes.count(status.HTTP_404_NOT_FOUND), self.REQUESTS - self.DRIVERS)
+
+        driver_ids = list(Service.objects.values_list('driver_id', flat=True))
+        self.assertEqual(len(driver_ids), self.DRIVERS)
+        self.assertEqual(len(set(driver_ids)), self.DRIVERS)
+        self.assertFalse(DriverDispatchState.objects.filter(is_available=True).exists())
+
+
+class ConcurrentCompletionTestCase(TransactionTestCase):
+    """Stress test for repeated taps on the complete action of one service."""
+
+    TAPS = 8
+
+    def setUp(self):
+        """Set up a driver busy with one in-progress service."""
+        self.driver = Driver.objects.create_user(
+            username='tap_driver',
+            email='tap_driver@example.com',
+            password='testpassword123',
+            phone_number='+3462000001',
+            vehicle_plate='TAP001',
+            vehicle_model='Renault Logan',
+            vehicle_year=2020,
+            vehicle_color='Grey',
+            location_coordinates=Point((-74.0721, 4.7110), srid=4326),
+            is_available=False
+        )
+        client = User.objects.create_user(
+            username='tap_client',
+            email='tap_client@example.com',
+            password='testpassword123',
+            phone_number='+3462000002'
+        )
+        address = Address.objects.create(
+            street='Calle 100',
+            city='Bogota',
+            state='Cundinamarca',
+            country='Colombia',
+            postal_code='110111',
+            coordinates=Point((-74.0721, 4.7110), srid=4326),
+            created_by=client
+        )
+        self.service = Service.objects.create(client=client, driver=self.driver, pickup_address=address,
+                                              status='IN_PROGRESS')
+        DriverDispatchState.objects.filter(pk=self.driver.pk).update(current_service_id=self.service.pk)
+        self.complete_url = reverse('urls-v1:service-complete', kwargs={'pk': self.service.pk})
+
+    def _complete(self, _):
+        client = APIClient()
+        client.force_authenticate(user=self.driver)
+        try:
+            return client.patch(self.complete_url).status_code
+        finally:
+            connection.close()
+
+    def test_parallel_taps_complete_once(self):
+        """Test that concurrent completions succeed once and bump the version once."""
+        with ThreadPoolExecutor(max_workers=self.TAPS) as executor:
+            codes = list(executor.map(self._complete, range(self.TAPS)))
+
+        self.assertEqual(codes.count(status.HTTP_200_OK), 1)
+        self.assertTrue(all(code in (status.HTTP_400_BAD_REQUEST, status.HTTP_409_CONFLICT)
+                            for code in codes if code != status.HTTP_200_OK))
+        self.service.refresh_from_db()
+        self.assertEqual(self.service.status, 'COMPLETED')
+        self.assertEqual(self.service.version, 2)
+        state = DriverDispatchState.objects.get(pk=self.driver.pk)
+        self.assertTrue(state.is_available)
+        self.assertIsNone(state.current_service_id)
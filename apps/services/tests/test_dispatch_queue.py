@@ -0,0 +1,108 @@
+from django.db import connection
+from django.urls import reverse
+from django.test import TestCase, override_settings
+from django.contrib.gis.geos import Point
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.services.models import DispatchJob, Service
+from apps.services.dispatch import acquire_shards, enqueue_dispatch, run_dispatch_jobs, shard_for
+from apps.users.models import User
+from apps.drivers.models import Driver, DriverDispatchState
+from apps.addresses.models import Address
+
+
+@override_settings(DISPATCH_INDEX_ENABLED=False, DISPATCH_QUEUE_MAX_ATTEMPTS=2)
+class DispatchQueueTestCase(TestCase):
+    """Test case for the queued (asynchronous) dispatch pipeline."""
+
+    def setUp(self):
+        self.client_user = User.objects.create_user(
+            username='queue_client',
+            email='queue_client@example.com',
+            password='testpassword123',
+            phone_number='+34652345690'
+        )
+        self.driver = Driver.objects.create_user(
+            username='queue_driver',
+            email='queue_driver@example.com',
+            password='testpassword123',
+            phone_number='+34652345691',
+            vehicle_plate='QUE001',
+            vehicle_model='Mazda 2',
+            vehicle_year=2019,
+            vehicle_color='Black',
+            location_coordinates=Point((-74.0000, 4.7000), srid=4326),
+            is_available=True
+        )
+        self.address = Address.objects.create(
+            street='Carrera 7',
+            city='Bogota',
+            state='Cundinamarca',
+            country='Colombia',
+            postal_code='110111',
+            coordinates=Point((-74.0020, 4.7000), srid=4326),
+            created_by=self.client_user
+        )
+
+    @override_settings(DISPATCH_MODE='queue')
+    def test_create_in_queue_mode_enqueues_job(self):
+        """Test that service creation returns 202 and queues a dispatch job."""
+        client = APIClient()
+        client.force_authenticate(user=self.client_user)
+        response = client.post(reverse('urls-v1:service-list'), {'pickup_address': self.address.pk}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'PENDING')
+        self.assertTrue(DispatchJob.objects.filter(service_id=response.data['id'], status='QUEUED').exists())
+
+    def test_worker_assigns_driver(self):
+        """Test that draining the queue dispatches the service and records latency."""
+        service = Service.objects.create(client=self.client_user, pickup_address=self.address, status='PENDING')
+        enqueue_dispatch(service)
+
+        jobs = run_dispatch_jobs()
+
+        self.assertEqual(len(jobs), 1)
+        self.assertEqual(jobs[0].status, 'DONE')
+        self.assertIsNotNone(jobs[0].latency_ms)
+        service.refresh_from_db()
+        self.assertEqual(service.status, 'IN_PROGRESS')
+        self.assertEqual(service.driver_id, self.driver.pk)
+        self.assertEqual(DriverDispatchState.objects.get(pk=self.driver.pk).current_service_id, service.pk)
+
+    def test_job_without_driver_is_retried_then_failed(self):
+        """Test that jobs without a free driver are rescheduled until the attempts run out."""
+        DriverDispatchState.objects.update(is_available=False)
+        service = Service.objects.create(client=self.client_user, pickup_address=self.address, status='PENDING')
+        job = enqueue_dispatch(service)
+
+        run_dispatch_jobs()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('QUEUED', 1))
+        self.assertEqual(run_dispatch_jobs(), [])
+
+        DispatchJob.objects.filter(pk=job.pk).update(run_after=job.created_at)
+        run_dispatch_jobs()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('FAILED', 2))
+        service.refresh_from_db()
+        self.assertEqual(service.status, 'PENDING')
+
+    @override_settings(DISPATCH_REGION_CELL_DEG=0.5, DISPATCH_REGION_SHARDS=64)
+    def test_workers_only_take_jobs_of_their_shards(self):
+        """Test that jobs are sharded by pickup cell and filtered by the worker's shards."""
+        self.assertEqual(shard_for(-74.0020, 4.7000), shard_for(-74.1000, 4.6000))
+        service = Service.objects.create(client=self.client_user, pickup_address=self.address, status='PENDING')
+        job = enqueue_dispatch(service)
+        self.assertEqual(job.shard, shard_for(-74.0020, 4.7000))
+
+        self.assertEqual(run_dispatch_jobs(shards=[(job.shard + 1) % 64]), [])
+        self.assertEqual(len(run_dispatch_jobs(shards=[job.shard])), 1)
+
+    @override_settings(DISPATCH_REGION_SHARDS=4)
+    def test_acquire_shards_skips_held_shards(self):
+        """Test that shard locks are taken from the start offset without counting held ones twice."""
+        self.addCleanup(lambda: connection.cursor().execute('SELECT pg_advisory_unlock_all()'))
+        self.assertEqual(acquire_shards(2, start=3), [0, 3])
+        self.assertEqual(acquire_shards(4, start=0, held=[0, 3]), [1, 2])
@@ -0,0 +1,239 @@
+import os
+import json
+import tempfile
+from unittest import mock
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.contrib.gis.geos import Point
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.services.api.v1.views.eta_matrix_view import _stream_matrix
+from apps.services.eta import RoadGraph, RoadNetworkEtaEngine, StraightLineEtaEngine
+from apps.services.dispatch import claim_closest_driver
+from apps.services.dispatch import claim
+from apps.users.models import User
+from apps.drivers.models import Driver, DriverDispatchState
+from apps.services.tests.test_base import DriverTestMixin
+from apps.addresses.models import Address
+
+
+def build_graph():
+    """
+    Three nodes on a street plus a one-way shortcut through node 3 and an isolated node 4.
+    """
+    graph = RoadGraph(
+        node_ids=[100, 101, 102, 103, 104],
+        lons=[-74.000, -74.010, -74.020, -74.010, -74.030],
+        lats=[4.700, 4.700, 4.700, 4.710, 4.700],
+        sources=[0, 1, 1, 2, 0, 3],
+        targets=[1, 0, 2, 1, 3, 2],
+        seconds=[60, 60, 60, 60, 30, 30],
+    )
+    graph.build_landmarks(3)
+    return graph
+
+
+class RoadGraphTestCase(SimpleTestCase):
+    """Test case for the road graph shortest path queries."""
+
+    def setUp(self):
+        self.graph = build_graph()
+
+    def test_shortest_time_uses_one_way_shortcut(self):
+        """Test that one-way edges are only used in their direction."""
+        self.assertEqual(self.graph.shortest_time(0, 2), 60)
+        self.assertEqual(self.graph.shortest_time(2, 0), 120)
+
+    def test_alt_matches_dijkstra(self):
+        """Test that A* with landmarks returns the same times as plain Dijkstra."""
+        for source in range(len(self.graph)):
+            distances = self.graph._dijkstra(self.graph.forward, source)
+            for target in range(len(self.graph)):
+                with self.subTest(source=source, target=target):
+                    self.assertEqual(self.graph.shortest_time(source, target),
+                                     distances.get(target, float('inf')))
+
+    def test_shortest_times_to_many_sources(self):
+        """Test the single reverse search from one target to many sources."""
+        self.assertEqual(self.graph.shortest_times_to([0, 1, 2, 4], 2), [60, 60, 0, float('inf')])
+
+    def test_save_and_load_round_trip(self):
+        """Test that a saved graph keeps its nodes and landmark tables."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'graph.npz')
+            self.graph.save(path)
+            loaded = RoadGraph.load(path)
+        self.assertEqual(loaded.node_ids.tolist(), [100, 101, 102, 103, 104])
+        self.assertEqual(loaded.from_landmarks.shape, (5, 3))
+        self.assertEqual(loaded.shortest_time(0, 2), 60)
+
+
+class RoadNetworkEtaEngineTestCase(SimpleTestCase):
+    """Test case for the road network ETA engine."""
+
+    def setUp(self):
+        self.fallback = StraightLineEtaEngine(average_speed_kmh=30)
+        self.engine = RoadNetworkEtaEngine(build_graph(), max_snap_km=1.0, fallback=self.fallback)
+
+    def test_travel_time_on_network(self):
+        """Test that points on graph nodes get the routed time."""
+        self.assertAlmostEqual(self.engine.travel_time_minutes((-74.000, 4.700), (-74.020, 4.700)), 1.0)
+
+    def test_travel_times_match_single_queries(self):
+        """Test that the many-to-one query agrees with individual queries."""
+        origins = [(-74.000, 4.700), (-74.010, 4.700), (-74.0101, 4.7101)]
+        times = self.engine.travel_times_minutes(origins, (-74.020, 4.700))
+        for origin, minutes in zip(origins, times):
+            self.assertAlmostEqual(minutes, self.engine.travel_time_minutes(origin, (-74.020, 4.700)))
+
+    def test_unreachable_or_off_network_points_fall_back(self):
+        """Test that points without a route use the straight-line estimate."""
+        for origin in [(-74.030, 4.700), (-75.000, 5.000)]:
+            with self.subTest(origin=origin):
+                self.assertAlmostEqual(self.engine.travel_time_minutes(origin, (-74.020, 4.700)),
+                                       self.fallback.travel_time_minutes(origin, (-74.020, 4.700)))
+
+
+@override_settings(DISPATCH_ETA_CANDIDATES=2)
+class EtaRankedClaimTestCase(DriverTestMixin, TestCase):
+    """Test case for ranking the nearest drivers by travel time before claiming."""
+
+    def setUp(self):
+        self.near = self._create_driver('eta_near', '+1999000333', (-74.0010, 4.7000))
+        self.fast = self._create_driver('eta_fast', '+1999000444', (-74.0030, 4.7000))
+
+    def test_claim_picks_fastest_candidate(self):
+        """Test that a farther driver with a shorter ETA is claimed."""
+        engine = mock.Mock()
+        engine.travel_times_minutes.side_effect = lambda origins, destination: [
+            9.0 if origin[0] == -74.0010 else 3.0 for origin in origins
+        ]
+        with mock.patch.object(claim, 'get_eta_engine', return_value=engine):
+            driver = claim_closest_driver(Point((-74.0000, 4.7000), srid=4326))
+
+        self.assertEqual(driver.pk, self.fast.pk)
+        self.assertEqual(driver.eta_minutes, 3.0)
+        self.assertTrue(DriverDispatchState.objects.get(pk=self.near.pk).is_available)
+
+    def test_claim_falls_through_when_chosen_driver_is_taken(self):
+        """Test that a candidate claimed between ranking and locking is skipped for the next one."""
+        def rank_then_lose_fast(origins, destination):
+            # A concurrent dispatch claims the fastest driver after it was ranked.
+            DriverDispatchState.objects.filter(pk=self.fast.pk).update(is_available=False)
+            return [9.0 if origin[0] == -74.0010 else 3.0 for origin in origins]
+
+        engine = mock.Mock()
+        engine.travel_times_minutes.side_effect = rank_then_lose_fast
+        with mock.patch.object(claim, 'get_eta_engine', return_value=engine):
+            driver = claim_closest_driver(Point((-74.0000, 4.7000), srid=4326))
+
+        self.assertEqual(driver.pk, self.near.pk)
+        self.assertFalse(DriverDispatchState.objects.get(pk=self.near.pk).is_available)
+
+
+class EtaMatrixApiTestCase(TestCase):
+    """Test case for the many-to-many ETA matrix endpoint."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username='matrix_admin',
+            email='matrix_admin@example.com',
+            password='testpassword123',
+            is_staff=True,
+            phone_number='+1999000555'
+        )
+        self.driver = Driver.objects.create_user(
+            username='matrix_driver',
+            email='matrix_driver@example.com',
+            password='testpassword123',
+            phone_number='+1999000666',
+            vehicle_plate='MTX001',
+            vehicle_model='Chevrolet Spark',
+            vehicle_year=2020,
+            vehicle_color='White',
+            location_coordinates=Point((-74.0721, 4.7110), srid=4326),
+            is_available=True
+        )
+        self.address = Address.objects.create(
+            street='Calle 100',
+            city='Bogota',
+            state='Cundinamarca',
+            country='Colombia',
+            postal_code='110111',
+            coordinates=Point((-75.5636, 6.2518), srid=4326),
+            created_by=self.admin
+        )
+        self.url = reverse('urls-v1:eta-matrix')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def _post(self, data):
+        response = self.client.post(self.url, data, format='json')
+        if response.status_code != status.HTTP_200_OK:
+            return response, None
+        return response, json.loads(async_to_sync(self._read_stream)(response))
+
+    @staticmethod
+    async def _read_stream(response):
+        return b''.join([chunk async for chunk in response.streaming_content])
+
+    @override_settings(ETA_MATRIX_CHUNK_SIZE=1)
+    def test_matrix_from_ids_and_points(self):
+        """Test matrices built from IDs and raw points on either side."""
+        response, body = self._post({
+            'origin_points': [[-74.0721, 4.7110], [-75.5636, 6.2518]],
+            'address_ids': [self.address.pk, self.address.pk],
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # An async iterator is what lets the ASGI handler send rows as they are computed.
+        self.assertTrue(response.is_async)
+        self.assertEqual(len(body['rows']), 2)
+        self.assertAlmostEqual(body['rows'][0]['distances_km'][0], 237.6, delta=1.0)
+        self.assertEqual(body['rows'][1]['distances_km'], [0.0, 0.0])
+
+        response, body = self._post({'driver_ids': [self.driver.pk], 'destination_points': [[-74.0721, 4.7110]]})
+        self.assertEqual(body['rows'], [{'distances_km': [0.0], 'eta_minutes': [0.0]}])
+
+    @override_settings(ETA_MATRIX_CHUNK_SIZE=1)
+    def test_rows_are_computed_as_they_are_sent(self):
+        """Test that the stream computes a chunk only when the client reads it."""
+        engine = StraightLineEtaEngine()
+        origins = [[-74.0721, 4.7110], [-75.5636, 6.2518], [-74.0600, 4.7110]]
+
+        async def read_first_row():
+            stream = _stream_matrix(origins, [[-74.0721, 4.7110]], engine)
+            chunks = [await anext(stream), await anext(stream)]
+            await stream.aclose()
+            return chunks
+
+        with mock.patch.object(engine, 'travel_time_matrix_minutes',
+                               wraps=engine.travel_time_matrix_minutes) as travel_times:
+            header, first_row = async_to_sync(read_first_row)()
+
+        self.assertTrue(header.startswith('{"origins"'))
+        self.assertEqual(json.loads(first_row)['distances_km'], [0.0])
+        self.assertEqual(travel_times.call_count, 1)
+
+    def test_rejects_unknown_ids_and_ambiguous_sides(self):
+        """Test validation of IDs and of the origin/destination choice."""
+        response, _ = self._post({'driver_ids': [0], 'address_ids': [self.address.pk]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('driver_ids', response.data)
+
+        response, _ = self._post({'driver_ids': [self.driver.pk], 'origin_points': [[0, 0]],
+                                  'address_ids': [self.address.pk]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(ETA_MATRIX_MAX_SIZE=1)
+    def test_rejects_oversized_matrix(self):
+        """Test that requests above the configured size are rejected."""
+        response, _ = self._post({'origin_points': [[0, 0], [1, 1]], 'destination_points': [[0, 0]]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_admin(self):
+        """Test that non-admin users cannot read driver positions through the matrix."""
+        self.client.force_authenticate(user=self.driver)
+        response, _ = self._post({'origin_points': [[0, 0]], 'destination_points': [[0, 0]]})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,54 @@
+from unittest import mock
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.contrib.gis.geos import Point
+
+from apps.services.dispatch import claim, claim_closest_driver, nearest_available
+from apps.drivers.models import DriverDispatchState
+from apps.services.tests.test_base import DriverTestMixin
+
+
+@override_settings(DISPATCH_INDEX_ENABLED=False, DISPATCH_SEARCH_RADII_KM=[1.0, 5.0])
+class NearestAvailableDriverTestCase(DriverTestMixin, TestCase):
+    """Test case for the bounded KNN nearest-driver query."""
+
+    def setUp(self):
+        self.pickup = Point((-74.0721, 4.7110), srid=4326)
+        # Roughly 0.5 km, 3 km and 30 km east of the pickup.
+        self.near = self._create_driver('knn_near', '+1999000701', (-74.0676, 4.7110))
+        self.mid = self._create_driver('knn_mid', '+1999000702', (-74.0451, 4.7110))
+        self.far = self._create_driver('knn_far', '+1999000703', (-73.8026, 4.7110))
+
+    def test_query_walks_partial_gist_index(self):
+        """Test that the bounded KNN query is answered by the partial GiST index without a sort."""
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('SET LOCAL enable_bitmapscan = off')
+        plan = nearest_available(DriverDispatchState.objects.all(), self.pickup, radius_km=5)[:5].explain()
+
+        self.assertIn('Index Scan using drivers_dispatch_available_gist', plan)
+        self.assertNotIn('Sort', plan)
+
+    def test_orders_by_distance_within_radius(self):
+        """Test that the radius bound and the distance order are applied."""
+        states = nearest_available(DriverDispatchState.objects.all(), self.pickup, radius_km=5)
+        self.assertEqual([state.pk for state in states], [self.near.pk, self.mid.pk])
+
+    def test_claim_widens_radius_and_skips_busy_drivers(self):
+        """Test that the claim falls back to wider searches when the nearby drivers are busy."""
+        DriverDispatchState.objects.filter(pk__in=[self.near.pk, self.mid.pk]).update(is_available=False)
+
+        driver = claim_closest_driver(self.pickup)
+
+        self.assertEqual(driver.pk, self.far.pk)
+        self.assertAlmostEqual(driver.distance.km, 30, delta=1)
+
+    @override_settings(DISPATCH_ETA_CANDIDATES=1, DISPATCH_READ_THROUGH_CANDIDATES=2)
+    def test_claim_ranks_by_buffered_positions(self):
+        """Test that a buffered move changes which driver is claimed, not only its reported position."""
+        buffered = {self.mid.pk: (-74.0716, 4.7110), self.near.pk: (-74.0451, 4.7110)}
+        with mock.patch.object(claim.location_buffer, 'get', side_effect=buffered.get):
+            driver = claim_closest_driver(self.pickup)
+
+        self.assertEqual(driver.pk, self.mid.pk)
+        self.assertLess(driver.distance.km, 0.1)
@@ -0,0 +1,41 @@
+import threading
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from apps.drivers.api.v1.views import DriverViewSet
+from apps.services.api.v1.views import ServiceViewSet
+from common.views import offload_sync_view
+
+
+class OffloadedViewTestCase(SimpleTestCase):
+    """Test case for serving sync views off Django's single sync thread."""
+
+    @override_settings(ASGI_OFFLOAD_SYNC_VIEWS=True, ASGI_OFFLOAD_THREADS=4)
+    def test_view_runs_on_offload_pool(self):
+        """Test that an offloaded view is async and runs its body on the offload threads."""
+        def view(request):
+            return HttpResponse(threading.current_thread().name)
+        view.cls = object
+
+        offloaded = offload_sync_view(view)
+        response = async_to_sync(offloaded)(RequestFactory().get('/'))
+
+        self.assertTrue(iscoroutinefunction(offloaded))
+        self.assertIs(offloaded.cls, object)
+        self.assertTrue(response.content.decode().startswith('offloaded-view'))
+
+    @override_settings(ASGI_OFFLOAD_SYNC_VIEWS=False)
+    def test_disabled_offload_keeps_sync_view(self):
+        """Test that the router still gets a plain sync view when offloading is off."""
+        view = ServiceViewSet.as_view({'get': 'list'})
+
+        self.assertFalse(iscoroutinefunction(view))
+        self.assertEqual(view.actions, {'get': 'list'})
+
+    @override_settings(ASGI_OFFLOAD_SYNC_VIEWS=True)
+    def test_driver_registration_is_offloaded(self):
+        """Test that driver registration, which waits on the hashing pool, is offloaded."""
+        view = DriverViewSet.as_view({'post': 'create'})
+
+        self.assertTrue(iscoroutinefunction(view))
@@ -0,0 +1,71 @@
+from unittest import mock
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.gis.geos import Point
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.services.models import Service
+from apps.services.api.v1.views.service_view import ServicePagination
+from apps.users.models import User
+from apps.addresses.models import Address
+
+
+class ServicePaginationTestCase(APITestCase):
+    """Test case for keyset pagination of the service list."""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username='page_admin',
+            email='page_admin@example.com',
+            password='testpassword123',
+            is_staff=True,
+            phone_number='+34654345690'
+        )
+        address = Address.objects.create(
+            street='Calle 26',
+            city='Bogota',
+            state='Cundinamarca',
+            country='Colombia',
+            postal_code='110111',
+            coordinates=Point((-74.0000, 4.7000), srid=4326),
+            created_by=self.admin_user
+        )
+        for _ in range(7):
+            Service.objects.create(client=self.admin_user, pickup_address=address, status='PENDING')
+        # Ties on created_at must be broken by id rather than skipped or repeated.
+        Service.objects.filter(pk__in=Service.objects.order_by('id').values('pk')[:4]) \
+            .update(created_at=timezone.now())
+        self.expected = list(Service.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_walks_every_page_once(self):
+        """Test that following the next links returns every service exactly once, in order."""
+        seen = []
+        url = reverse('urls-v1:service-list') + '?page_size=3'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            seen.extend(service['id'] for service in response.data['results'])
+            url = response.data['next']
+
+        self.assertEqual(seen, self.expected)
+
+    def test_previous_link_returns_previous_page(self):
+        """Test that the previous link of the second page returns the first page."""
+        first = self.client.get(reverse('urls-v1:service-list') + '?page_size=3')
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+
+        self.assertEqual([service['id'] for service in second.data['results']], self.expected[3:6])
+        self.assertEqual([service['id'] for service in back.data['results']], self.expected[:3])
+
+    def test_page_size_is_capped_and_cursor_validated(self):
+        """Test that page_size is limited per endpoint and a malformed cursor is rejected."""
+        with mock.patch.object(ServicePagination, 'max_page_size', 5):
+            response = self.client.get(reverse('urls-v1:service-list') + '?page_size=1000')
+        self.assertEqual(len(response.data['results']), 5)
+
+        response = self.client.get(reverse('urls-v1:service-list') + '?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -205,4 +205,15 @@ class ServicePermissionTestCase(TestCase):
         # Admin can complete any service
         request = self.factory.patch('/')
         request.user = self.admin_user
-        self.assertTrue(self.permission.has_object_permission(request, self.view, self.client_service))
\ No newline at end of file
+        self.assertTrue(self.permission.has_object_permission(request, self.view, self.client_service))
+
+    def test_object_permission_checks_run_no_queries(self):
+        """Test that object permissions compare raw foreign key ids without loading related rows."""
+        service = Service.objects.get(pk=self.client_service.pk)
+        self.view.action = 'complete'
+        
+        for user, allowed in ((self.client_user, False), (self.driver_user, True), (self.other_driver_user, False)):
+            request = self.factory.patch('/')
+            request.user = user
+            with self.assertNumQueries(0):
+                self.assertEqual(self.permission.has_object_permission(request, self.view, service), allowed)
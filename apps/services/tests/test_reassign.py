@@ -0,0 +1,109 @@
+from unittest import mock
+from django.urls import reverse
+from django.test import TestCase, override_settings
+from django.contrib.gis.geos import Point
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.services.models import Service
+from apps.services.dispatch import reassign_service
+from apps.users.models import User
+from apps.drivers.models import Driver, DriverDispatchState
+from apps.addresses.models import Address
+
+
+@override_settings(DISPATCH_INDEX_ENABLED=False, DISPATCH_FALLBACK_CANDIDATES=5,
+                   DISPATCH_FALLBACK_MAX_DRIFT_KM=1.0)
+class ServiceReassignTestCase(TestCase):
+    """Test case for the ranked fallback list and service reassignment."""
+
+    def setUp(self):
+        self.client_user = User.objects.create_user(
+            username='reassign_client',
+            email='reassign_client@example.com',
+            password='testpassword123',
+            phone_number='+34653345690'
+        )
+        self.drivers = [
+            Driver.objects.create_user(
+                username=f'reassign_driver_{i}',
+                email=f'reassign_driver_{i}@example.com',
+                password='testpassword123',
+                phone_number=f'+3465334570{i}',
+                vehicle_plate=f'REA00{i}',
+                vehicle_model='Kia Picanto',
+                vehicle_year=2021,
+                vehicle_color='White',
+                location_coordinates=Point((-74.0000 + i * 0.002, 4.7000), srid=4326),
+                is_available=True
+            )
+            for i in range(3)
+        ]
+        self.address = Address.objects.create(
+            street='Calle 80',
+            city='Bogota',
+            state='Cundinamarca',
+            country='Colombia',
+            postal_code='110111',
+            coordinates=Point((-74.0000, 4.7000), srid=4326),
+            created_by=self.client_user
+        )
+
+    def _dispatch(self):
+        client = APIClient()
+        client.force_authenticate(user=self.client_user)
+        response = client.post(reverse('urls-v1:service-list'), {'pickup_address': self.address.pk}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Service.objects.get(pk=response.data['id'])
+
+    def test_dispatch_stores_ranked_candidates(self):
+        """Test that the other nearby drivers are stored fastest first, without the assigned one."""
+        service = self._dispatch()
+
+        self.assertEqual(service.driver_id, self.drivers[0].pk)
+        self.assertEqual([candidate['driver'] for candidate in service.candidates],
+                         [self.drivers[1].pk, self.drivers[2].pk])
+
+    def test_reassign_uses_cached_candidates(self):
+        """Test that a declined service goes to the next candidate without a nearest-driver search."""
+        service = self._dispatch()
+
+        with mock.patch('apps.services.dispatch.candidates.claim_closest_driver') as claim:
+            reassigned = reassign_service(service.pk)
+
+        claim.assert_not_called()
+        self.assertEqual(reassigned.driver_id, self.drivers[1].pk)
+        self.assertEqual([candidate['driver'] for candidate in reassigned.candidates], [self.drivers[2].pk])
+        released = DriverDispatchState.objects.get(pk=self.drivers[0].pk)
+        self.assertTrue(released.is_available)
+        self.assertIsNone(released.current_service_id)
+        taken = DriverDispatchState.objects.get(pk=self.drivers[1].pk)
+        self.assertFalse(taken.is_available)
+        self.assertEqual(taken.current_service_id, service.pk)
+
+    def test_stale_candidates_fall_back_to_search(self):
+        """Test that a candidate that moved too far invalidates the list and triggers a fresh claim."""
+        service = self._dispatch()
+        DriverDispatchState.objects.filter(pk=self.drivers[1].pk) \
+            .update(location_coordinates=Point((-74.0500, 4.7000), srid=4326))
+
+        reassigned = reassign_service(service.pk, previous_available=False)
+
+        self.assertEqual(reassigned.driver_id, self.drivers[2].pk)
+        self.assertEqual([candidate['driver'] for candidate in reassigned.candidates], [self.drivers[1].pk])
+        self.assertFalse(DriverDispatchState.objects.get(pk=self.drivers[0].pk).is_available)
+
+    def test_reassign_endpoint(self):
+        """Test that only the assigned driver can hand the service over."""
+        service = self._dispatch()
+        url = reverse('urls-v1:service-reassign', kwargs={'pk': service.pk})
+
+        client = APIClient()
+        client.force_authenticate(user=self.client_user)
+        self.assertEqual(client.post(url, {}, format='json').status_code, status.HTTP_403_FORBIDDEN)
+
+        client.force_authenticate(user=self.drivers[0])
+        response = client.post(url, {'reason': 'OFFLINE'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['driver']['id'], self.drivers[1].pk)
+        self.assertFalse(DriverDispatchState.objects.get(pk=self.drivers[0].pk).is_available)
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+from django.test import SimpleTestCase
+from django.contrib.gis.geos import Point
+
+from apps.services.utils import (
+    get_arrival_time,
+    get_closest_driver,
+    haversine_km,
+    haversine_distances,
+    top_k_closest,
+)
+
+
+class DistanceEngineTestCase(SimpleTestCase):
+    """Test case for the haversine distance engine."""
+
+    def setUp(self):
+        self.origin = (-74.0721, 4.7110)
+        self.lons = [-74.0721, -75.5636, -74.0800, -74.2000, -74.0725]
+        self.lats = [4.7110, 6.2518, 4.7000, 4.6000, 4.7112]
+
+    def test_haversine_km_known_distance(self):
+        """Test the distance between Bogota and Medellin (~238 km)."""
+        self.assertAlmostEqual(haversine_km(-74.0721, 4.7110, -75.5636, 6.2518), 237.6, delta=1.0)
+
+    def test_numpy_and_python_engines_agree(self):
+        """Test that the vectorized pass matches the pure-Python fallback."""
+        vectorized = haversine_distances(*self.origin, self.lons, self.lats)
+        fallback = haversine_distances(*self.origin, self.lons, self.lats, use_numpy=False)
+        for fast, slow in zip(vectorized, fallback):
+            self.assertAlmostEqual(fast, slow, places=9)
+
+    def test_top_k_closest_is_sorted(self):
+        """Test that top-k returns the closest candidates in order for both engines."""
+        for use_numpy in (True, False):
+            with self.subTest(use_numpy=use_numpy):
+                indices, distances = top_k_closest(*self.origin, self.lons, self.lats, k=3,
+                                                   use_numpy=use_numpy)
+                self.assertEqual(indices, [0, 4, 2])
+                self.assertEqual(distances, sorted(distances))
+
+    def test_top_k_larger_than_input(self):
+        """Test that asking for more candidates than available returns all of them."""
+        indices, _ = top_k_closest(*self.origin, self.lons[:2], self.lats[:2], k=10)
+        self.assertEqual(indices, [0, 1])
+
+    def test_get_closest_driver(self):
+        """Test closest driver selection from driver instances."""
+        drivers = [
+            SimpleNamespace(name='far', location_coordinates=Point((-75.5636, 6.2518), srid=4326)),
+            SimpleNamespace(name='near', location_coordinates=Point((-74.0725, 4.7112), srid=4326)),
+        ]
+        address = SimpleNamespace(coordinates=Point(self.origin, srid=4326))
+        driver, distance = get_closest_driver(drivers, address)
+        self.assertEqual(driver.name, 'near')
+        self.assertLess(distance, 0.1)
+
+    def test_get_closest_driver_without_drivers(self):
+        """Test that no drivers returns an infinite distance."""
+        self.assertEqual(get_closest_driver([], SimpleNamespace(coordinates=None)), (None, float('inf')))
+
+    def test_get_arrival_time(self):
+        """Test the constant-speed arrival time estimate."""
+        self.assertEqual(get_arrival_time(30), 30)
+        with self.assertRaises(ValueError):
+            get_arrival_time(10, average_speed_kmh=0)
@@ -0,0 +1,8 @@
+from .arrival_time import get_arrival_time
+from .distance import (
+    get_closest_driver,
+    haversine_km,
+    haversine_distances,
+    haversine_matrix,
+    top_k_closest,
+)
\ No newline at end of file
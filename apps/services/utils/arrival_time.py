@@ -1,21 +1,3 @@
-
-
-
-def get_closest_driver(drivers, pickup_address):
-    """
-    Get the driver closest to the pickup address.
-    """
-    closest_driver = None
-    closest_distance = float('inf')
-
-    for driver in drivers:
-        distance = driver.calculate_distance(pickup_address.latitude, pickup_address.longitude)
-        if distance < closest_distance:
-            closest_distance = distance
-            closest_driver = driver
-
-    return closest_driver, closest_distance
-
 def get_arrival_time(distance_km: float, average_speed_kmh: float = 60.0) -> int:
     """
     Calcula el tiempo estimado de llegada en minutos, redondeado al entero más cercano.
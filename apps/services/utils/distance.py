@@ -0,0 +1,113 @@
+import heapq
+import math
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional for the pure-Python fallback
+    np = None
+
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lon1, lat1, lon2, lat2):
+    """
+    Great-circle distance in kilometres between two points given in degrees.
+    """
+    lon1, lat1, lon2, lat2 = map(math.radians, (lon1, lat1, lon2, lat2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + \
+        math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def haversine_distances(lon, lat, lons, lats, use_numpy=True):
+    """
+    Distances in kilometres from one point to many, in a single vectorized pass.
+
+    :param lon: Longitude of the origin in degrees.
+    :param lat: Latitude of the origin in degrees.
+    :param lons: Sequence or array of destination longitudes.
+    :param lats: Sequence or array of destination latitudes.
+    :param use_numpy: Set to False to force the pure-Python implementation.
+    :return: NumPy array (or list without NumPy) of distances.
+    """
+    if np is None or not use_numpy:
+        return [haversine_km(lon, lat, other_lon, other_lat) for other_lon, other_lat in zip(lons, lats)]
+
+    lon1, lat1 = math.radians(lon), math.radians(lat)
+    lons = np.radians(np.asarray(lons, dtype=float))
+    lats = np.radians(np.asarray(lats, dtype=float))
+    a = np.sin((lats - lat1) / 2) ** 2 + \
+        math.cos(lat1) * np.cos(lats) * np.sin((lons - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def haversine_matrix(origins, destinations, use_numpy=True):
+    """
+    Great-circle distances in kilometres between every origin and destination.
+
+    :param origins: ``(n, 2)`` array-like of ``(lon, lat)`` pairs in degrees.
+    :param destinations: ``(m, 2)`` array-like of ``(lon, lat)`` pairs in degrees.
+    :param use_numpy: Set to False to force the pure-Python implementation.
+    :return: ``(n, m)`` NumPy array (or list of lists without NumPy).
+    """
+    if np is None or not use_numpy:
+        return [[haversine_km(o_lon, o_lat, d_lon, d_lat) for d_lon, d_lat in destinations]
+                for o_lon, o_lat in origins]
+
+    origins = np.radians(np.asarray(origins, dtype=float).reshape(-1, 2))
+    destinations = np.radians(np.asarray(destinations, dtype=float).reshape(-1, 2))
+    lon1, lat1 = origins[:, 0, None], origins[:, 1, None]
+    lon2, lat2 = destinations[None, :, 0], destinations[None, :, 1]
+    a = np.sin((lat2 - lat1) / 2) ** 2 + \
+        np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def top_k_closest(lon, lat, lons, lats, k=1, use_numpy=True):
+    """
+    Indices and distances of the ``k`` destinations closest to a point.
+
+    With NumPy the selection is done with ``argpartition`` (O(n)) and only the
+    ``k`` winners are sorted; without it a heap is used.
+
+    :return: Tuple ``(indices, distances_km)`` ordered from closest to farthest.
+    """
+    distances = haversine_distances(lon, lat, lons, lats, use_numpy=use_numpy)
+    size = len(distances)
+    k = min(k, size)
+    if k <= 0:
+        return [], []
+
+    if np is None or not use_numpy:
+        closest = heapq.nsmallest(k, range(size), key=distances.__getitem__)
+        return closest, [distances[i] for i in closest]
+
+    if k < size:
+        candidates = np.argpartition(distances, k - 1)[:k]
+    else:
+        candidates = np.arange(size)
+    closest = candidates[np.argsort(distances[candidates], kind='stable')]
+    return closest.tolist(), distances[closest].tolist()
+
+
+def get_closest_driver(drivers, pickup_address):
+    """
+    Get the driver closest to the pickup address.
+
+    :param drivers: Iterable of ``Driver`` instances.
+    :param pickup_address: ``Address`` with ``coordinates``.
+    :return: Tuple ``(driver, distance_km)``; ``(None, inf)`` when there are no drivers.
+    """
+    drivers = [driver for driver in drivers if driver.location_coordinates is not None]
+    if not drivers:
+        return None, float('inf')
+
+    pickup = pickup_address.coordinates
+    indices, distances = top_k_closest(
+        pickup.x, pickup.y,
+        [driver.location_coordinates.x for driver in drivers],
+        [driver.location_coordinates.y for driver in drivers],
+        k=1,
+    )
+    return drivers[indices[0]], distances[0]
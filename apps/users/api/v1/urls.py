@@ -1,6 +1,7 @@
 from rest_framework.routers import DefaultRouter
 from django.urls import path
 from apps.users.api.v1 import views as v
+from common.views import offload_sync_view
 
 
 router = DefaultRouter()
@@ -8,6 +9,6 @@ router.register(r'user', v.UserViewSet, basename='user')
 
 
 urlpatterns = [
-    path('register/', v.RegisterView.as_view(), name='register'),
+    path('register/', offload_sync_view(v.RegisterView.as_view()), name='register'),
     path('me/', v.MeView.as_view(), name='me'),
     ] + router.urls
\ No newline at end of file
@@ -4,6 +4,16 @@ from drf_spectacular.utils import extend_schema_view, extend_schema, OpenApiPara
 
 from apps.users.api.v1.serializers import UserSerializer, UserDetailSerializer
 from apps.users.models import User
+from common.pagination import KeysetPagination
+from common.views import ReplicaReadMixin
+
+
+class UserPagination(KeysetPagination):
+    """
+    Users, most recently joined first; keyset-paginated on ``-date_joined, -id``.
+    """
+    ordering = ('-date_joined', '-id')
+    max_page_size = 100
 
 
 @extend_schema_view(
@@ -32,11 +42,12 @@ from apps.users.models import User
         summary="Delete a user",
     ),
 )
-class UserViewSet(ModelViewSet):
+class UserViewSet(ReplicaReadMixin, ModelViewSet):
     """
     ViewSet for managing users.
     """
-    queryset = User.objects.all().order_by('-date_joined')
+    queryset = User.objects.all().order_by('-date_joined', '-id')
+    pagination_class = UserPagination
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
     # lookup_field = 'username'
@@ -59,6 +59,8 @@ class User(AbstractUser, PermissionsMixin):
         indexes = [
             models.Index(fields=['username']),
             models.Index(fields=['email']),
+            # Keyset pagination on (date_joined, id); also serves the driver list.
+            models.Index(fields=['date_joined', 'id'], name='users_date_joined_id'),
         ]
 
     def __str__(self):
@@ -1 +1,3 @@
-from .base_model import BaseModel
\ No newline at end of file
+from .base_model import BaseModel
+from .pool import close_connection_pools, warm_up_connection_pools
+from .routers import ReplicaRouter, replica_reads
\ No newline at end of file
@@ -0,0 +1,47 @@
+import logging
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up_connection_pools(timeout=30.0):
+    """
+    Open the connection pool of every database that has one and wait until
+    it holds its ``min_size`` connections.
+
+    Pools are otherwise opened by the first query of a process, so the first
+    requests of every new worker would pay for connecting.
+
+    :return: Aliases of the pools that were warmed up.
+    """
+    warmed = []
+    for connection in connections.all():
+        pool = getattr(connection, 'pool', None)
+        if pool is None:
+            continue
+        try:
+            # Django creates pools closed and only opens them on the first connection.
+            pool.open(wait=True, timeout=timeout)
+        except Exception:
+            # The pool keeps retrying in the background; requests wait on it.
+            logger.exception('Connection pool of %r did not fill up in %.0fs', connection.alias, timeout)
+            continue
+        warmed.append(connection.alias)
+    return warmed
+
+
+def close_connection_pools():
+    """
+    Close every database connection and connection pool of this process.
+
+    Call it before forking: ``connections.close_all()`` only returns
+    connections to their pool, and a forked child would inherit the pool's
+    open sockets and share their server sessions with the parent and its
+    siblings. Pools are recreated, closed, on the next connection.
+    """
+    for connection in connections.all():
+        if getattr(connection, 'pool', None) is not None:
+            connection.close_pool()
+        else:
+            connection.close()
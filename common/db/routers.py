@@ -0,0 +1,69 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+# Set for the duration of a request that may read from the replicas.
+_replica_reads = ContextVar('replica_reads', default=False)
+# Set by the first write of that request: later reads see it on the primary.
+_wrote = ContextVar('wrote', default=False)
+
+# Signed cookie holding the id of a user who just wrote, timestamped by the signer.
+PIN_COOKIE = 'primary_pin'
+
+
+@contextmanager
+def replica_reads():
+    """
+    Route the reads of the block to a random replica until its first write.
+    """
+    reads_token = _replica_reads.set(True)
+    wrote_token = _wrote.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(reads_token)
+        _wrote.reset(wrote_token)
+
+
+def pin_to_primary(response, user_id):
+    """
+    Keep the user's reads on the primary for ``DATABASE_REPLICA_PIN_SECONDS``,
+    so they read their own writes despite replication lag.
+
+    The pin travels with the client as a signed cookie carrying the time of
+    the write, so every worker process sees it without shared state.
+    """
+    response.set_signed_cookie(PIN_COOKIE, str(user_id), salt=PIN_COOKIE,
+                               max_age=settings.DATABASE_REPLICA_PIN_SECONDS, httponly=True, samesite='Lax')
+
+
+def is_pinned_to_primary(request, user_id):
+    pinned = request.get_signed_cookie(PIN_COOKIE, default=None, salt=PIN_COOKIE,
+                                       max_age=settings.DATABASE_REPLICA_PIN_SECONDS)
+    return pinned == str(user_id)
+
+
+class ReplicaRouter:
+    """
+    Send reads inside :func:`replica_reads` to ``DATABASE_REPLICAS`` and
+    everything else, including all writes and migrations, to ``default``.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and not _wrote.get() and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        _wrote.set(True)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
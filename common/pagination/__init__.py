@@ -0,0 +1 @@
+from .keyset_pagination import KeysetPagination
\ No newline at end of file
@@ -0,0 +1,124 @@
+import json
+from base64 import b64decode, b64encode
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination over a unique composite ordering such as ``(-created_at, -id)``.
+
+    DRF's ``CursorPagination`` only stores the first ordering field and an
+    offset for ties. This class stores the values of every ordering field
+    and filters with ``(a, b) < (x, y)``. Each page is then a range scan on a
+    matching composite index, so a deep page costs the same as the first
+    one. No ``COUNT(*)`` is run.
+
+    All ordering fields must share one direction, and the last one must be
+    unique. Subclasses set ``ordering``, ``page_size`` and ``max_page_size``
+    per endpoint.
+    """
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.paginate_union([queryset], request, view=view)
+
+    def paginate_union(self, querysets, request, view=None):
+        """
+        Paginate the ``UNION ALL`` of disjoint querysets in one query.
+
+        Each branch is seeked and limited on its own composite index before
+        the union. Postgres can then serve an ``OR`` of two foreign keys with
+        two ordered range scans instead of a bitmap scan plus a sort.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.fields = [field.lstrip('-') for field in self.ordering]
+        self.descending = self.ordering[0].startswith('-')
+
+        reverse, position = self.decode_cursor(request) or (False, None)
+        # Walking back from a cursor scans the index in the opposite direction.
+        descending = reverse != self.descending
+        order = [f'-{field}' if descending else field for field in self.fields]
+        branches = []
+        for queryset in querysets:
+            queryset = queryset.order_by(*order)
+            if position is not None:
+                try:
+                    queryset = queryset.filter(self._after(queryset.model, position, descending))
+                except ValidationError:
+                    raise NotFound(self.invalid_cursor_message)
+            branches.append(queryset[:self.page_size + 1])
+        if len(branches) > 1:
+            branches = [branches[0].union(*branches[1:], all=True).order_by(*order)[:self.page_size + 1]]
+
+        results = list(branches[0])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        # Moving forwards, the previous page exists iff a cursor was given; moving
+        # backwards, the next page always exists.
+        self.has_next = has_more if not reverse else True
+        self.has_previous = position is not None if not reverse else has_more
+        self.display_page_controls = self.has_next or self.has_previous
+        return self.page
+
+    def _after(self, model, position, descending):
+        """
+        Build the row comparison ``fields > position`` (``<`` when ``descending``).
+
+        The leading field is also bounded on its own so the planner can use
+        it as an index condition.
+        """
+        lookup = 'lt' if descending else 'gt'
+        values = [model._meta.get_field(field).to_python(value) for field, value in zip(self.fields, position)]
+        condition = Q()
+        for index in reversed(range(len(self.fields))):
+            strict = Q(**{f'{self.fields[index]}__{lookup}': values[index]})
+            condition = strict if index == len(self.fields) - 1 else strict | (
+                Q(**{self.fields[index]: values[index]}) & condition)
+        return Q(**{f'{self.fields[0]}__{lookup}e': values[0]}) & condition
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            cursor = json.loads(b64decode(encoded.encode('ascii')).decode('ascii'))
+            reverse, position = bool(cursor['r']), list(cursor['p'])
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return reverse, position
+
+    def encode_cursor(self, reverse, instance):
+        position = []
+        for field in self.fields:
+            value = getattr(instance, field)
+            position.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        encoded = b64encode(json.dumps({'r': int(reverse), 'p': position}).encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # An empty backwards page: restart from the beginning.
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(False, self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(True, self.page[0])
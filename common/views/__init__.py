@@ -0,0 +1,2 @@
+from .offload import OffloadedViewMixin, offload_sync_view
+from .replica import ReplicaReadMixin
\ No newline at end of file
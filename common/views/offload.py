@@ -0,0 +1,58 @@
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(settings.ASGI_OFFLOAD_THREADS, thread_name_prefix='offloaded-view')
+    return _executor
+
+
+def offload_sync_view(view):
+    """
+    Serve a sync view from a pool of ``ASGI_OFFLOAD_THREADS`` threads instead
+    of Django's single thread-sensitive thread.
+
+    Under ASGI every sync view of a process runs on that one thread, one
+    request at a time, so a slow query or a password hash holds up all the
+    others. Offloaded views run concurrently, each thread with its own
+    database connection.
+
+    With ``ASGI_OFFLOAD_SYNC_VIEWS`` off the view is returned unchanged.
+    """
+    if not settings.ASGI_OFFLOAD_SYNC_VIEWS:
+        return view
+
+    def run(request, *args, **kwargs):
+        try:
+            response = view(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+            return response
+        finally:
+            # This thread is outside the request_finished handling of the handler.
+            close_old_connections()
+
+    @functools.wraps(view)
+    async def offloaded(request, *args, **kwargs):
+        return await sync_to_async(run, thread_sensitive=False, executor=_get_executor())(request, *args, **kwargs)
+
+    return offloaded
+
+
+class OffloadedViewMixin:
+    """
+    DRF view mixin that serves the view through :func:`offload_sync_view`.
+    """
+
+    @classmethod
+    def as_view(cls, *args, **kwargs):
+        return offload_sync_view(super().as_view(*args, **kwargs))
@@ -0,0 +1,36 @@
+from rest_framework.permissions import SAFE_METHODS
+
+from common.db.routers import is_pinned_to_primary, pin_to_primary, replica_reads
+
+
+class ReplicaReadMixin:
+    """
+    DRF viewset mixin that serves the safe ``replica_actions`` from the read
+    replicas (see ``common.db.routers.ReplicaRouter``).
+
+    Everything else stays on the primary: unsafe methods, custom actions
+    such as dispatch and ``complete``, and the reads a request makes after
+    its first write. A user who wrote is also pinned to the primary for
+    ``DATABASE_REPLICA_PIN_SECONDS``, so their next requests read their own
+    writes. The pin is a signed cookie (see ``pin_to_primary``), so clients
+    must send back the cookies they receive for it to apply.
+    """
+    replica_actions = ('list', 'retrieve')
+
+    def initial(self, request, *args, **kwargs):
+        # Authentication reads the user from the primary.
+        super().initial(request, *args, **kwargs)
+        self._replica_reads = None
+        if (request.method in SAFE_METHODS and self.action in self.replica_actions
+                and not is_pinned_to_primary(request, request.user.id)):
+            self._replica_reads = replica_reads()
+            self._replica_reads.__enter__()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        replica_block = getattr(self, '_replica_reads', None)
+        if replica_block is not None:
+            self._replica_reads = None
+            replica_block.__exit__(None, None, None)
+        if request.method not in SAFE_METHODS and request.user.is_authenticated and response.status_code < 400:
+            pin_to_primary(response, request.user.id)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -13,4 +13,24 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'configs.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up: these modules load models and settings.
+from django.conf import settings  # noqa: E402
+from apps.drivers.streaming import driver_location_stream  # noqa: E402
+from common.db import warm_up_connection_pools  # noqa: E402
+
+# Each worker process fills its database connection pool before taking traffic.
+warm_up_connection_pools()
+
+
+async def application(scope, receive, send):
+    """
+    Route WebSocket connections to the driver location stream and everything else to Django.
+    """
+    if scope['type'] == 'websocket':
+        if scope['path'] == settings.DRIVER_LOCATION_STREAM_PATH:
+            return await driver_location_stream(scope, receive, send)
+        await receive()
+        return await send({'type': 'websocket.close', 'code': 4404})
+    return await django_application(scope, receive, send)
@@ -11,8 +11,9 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+import copy
 import os
-from decouple import config
+from decouple import config, Csv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -104,6 +105,45 @@ DATABASES = {
     }
 }
 
+# Connection pooling (psycopg 3). Each process keeps between MIN_SIZE and
+# MAX_SIZE open connections and checks one before handing it out, so a
+# request no longer pays for connecting, authenticating and registering the
+# PostGIS types. MAX_SIZE should cover ASGI_OFFLOAD_THREADS plus the sync and
+# background threads; a request waits up to TIMEOUT seconds for a free one.
+# Without pooling, DATABASE_CONN_MAX_AGE keeps one connection per thread.
+DATABASE_POOL_ENABLED = config('DATABASE_POOL_ENABLED', default=True, cast=bool)
+# Health checks make Django hand ConnectionPool.check_connection to the pool.
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+if DATABASE_POOL_ENABLED:
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': config('DATABASE_POOL_MIN_SIZE', default=4, cast=int),
+            'max_size': config('DATABASE_POOL_MAX_SIZE', default=40, cast=int),
+            'timeout': config('DATABASE_POOL_TIMEOUT', default=10.0, cast=float),
+            'max_idle': config('DATABASE_POOL_MAX_IDLE', default=600.0, cast=float),
+        },
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = config('DATABASE_CONN_MAX_AGE', default=0, cast=int)
+
+# Read replicas: comma-separated "host" or "host:port" of streaming replicas
+# of the default database, with the same credentials and pool settings. The
+# list and retrieve endpoints read from them (common.db.routers); writes,
+# dispatch and a user's requests for DATABASE_REPLICA_PIN_SECONDS after one
+# of their writes stay on the primary (signed "primary_pin" cookie, so it
+# holds across worker processes). Tests mirror them onto default.
+for index, replica_host in enumerate(config('DATABASE_REPLICA_HOSTS', default='', cast=Csv())):
+    replica_host, _, replica_port = replica_host.partition(':')
+    DATABASES[f'replica_{index}'] = {
+        **copy.deepcopy(DATABASES['default']),
+        'HOST': replica_host,
+        'PORT': replica_port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_REPLICA_PIN_SECONDS = config('DATABASE_REPLICA_PIN_SECONDS', default=5, cast=int)
+DATABASE_ROUTERS = ['common.db.routers.ReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -123,6 +163,28 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Django's default hashers, with pbkdf2_sha256 computed on a bounded thread
+# pool (apps.authentication.hashing).
+PASSWORD_HASHERS = [
+    'apps.authentication.hashing.PooledPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+# Hashes run at once per process and hashes waiting for a thread; requests
+# beyond that get a 503 with Retry-After instead of queueing.
+PASSWORD_HASHING_WORKERS = config('PASSWORD_HASHING_WORKERS', default=os.cpu_count() or 1, cast=int)
+PASSWORD_HASHING_MAX_PENDING = config('PASSWORD_HASHING_MAX_PENDING', default=32, cast=int)
+PASSWORD_HASHING_RETRY_AFTER_SECONDS = config('PASSWORD_HASHING_RETRY_AFTER_SECONDS', default=1, cast=int)
+
+# Under ASGI, serve the hot sync views (login, registration, drivers, services,
+# driver locations) from ASGI_OFFLOAD_THREADS threads instead of Django's single
+# sync thread (see common.views.offload). Each thread holds its own database
+# connection, so keep threads x processes below the server's max_connections.
+ASGI_OFFLOAD_SYNC_VIEWS = config('ASGI_OFFLOAD_SYNC_VIEWS', default=True, cast=bool)
+ASGI_OFFLOAD_THREADS = config('ASGI_OFFLOAD_THREADS', default=32, cast=int)
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -174,6 +236,87 @@ REST_FRAMEWORK = {
     "VERSION_PARAM": "version",
 }
 
+# Dispatch
+# 'greedy' assigns the closest driver inside the request. 'batch' accepts the
+# service as PENDING and leaves assignment to `manage.py run_batch_dispatch`.
+# 'queue' accepts it as PENDING and queues a DispatchJob for
+# `manage.py run_dispatch_workers`.
+DISPATCH_MODE = config('DISPATCH_MODE', default='greedy')
+DISPATCH_BATCH_WINDOW_SECONDS = config('DISPATCH_BATCH_WINDOW_SECONDS', default=2.0, cast=float)
+DISPATCH_BATCH_MAX_DISTANCE_KM = config('DISPATCH_BATCH_MAX_DISTANCE_KM', default=50.0, cast=float)
+DISPATCH_QUEUE_WORKERS = config('DISPATCH_QUEUE_WORKERS', default=4, cast=int)
+DISPATCH_QUEUE_BATCH_SIZE = config('DISPATCH_QUEUE_BATCH_SIZE', default=10, cast=int)
+DISPATCH_QUEUE_POLL_SECONDS = config('DISPATCH_QUEUE_POLL_SECONDS', default=0.2, cast=float)
+# Jobs whose service found no driver are retried after this delay, up to MAX_ATTEMPTS times.
+DISPATCH_QUEUE_RETRY_SECONDS = config('DISPATCH_QUEUE_RETRY_SECONDS', default=5.0, cast=float)
+DISPATCH_QUEUE_MAX_ATTEMPTS = config('DISPATCH_QUEUE_MAX_ATTEMPTS', default=12, cast=int)
+# Queued jobs are sharded by pickup cell (DISPATCH_REGION_CELL_DEG degrees, ~55 km
+# by default); each worker process owns a disjoint set of the shards.
+DISPATCH_REGION_CELL_DEG = config('DISPATCH_REGION_CELL_DEG', default=0.5, cast=float)
+DISPATCH_REGION_SHARDS = config('DISPATCH_REGION_SHARDS', default=64, cast=int)
+
+# Radii (km) of the bounded nearest-driver searches tried in order before an
+# unbounded one; the claim stops at the first radius with enough drivers.
+DISPATCH_SEARCH_RADII_KM = config('DISPATCH_SEARCH_RADII_KM', default='2,5,15,50', cast=Csv(float))
+
+# In-process grid index of available drivers used to preselect nearest-driver
+# candidates before the PostGIS claim query.
+DISPATCH_INDEX_ENABLED = config('DISPATCH_INDEX_ENABLED', default=False, cast=bool)
+DISPATCH_INDEX_CELL_SIZE_DEG = config('DISPATCH_INDEX_CELL_SIZE_DEG', default=0.01, cast=float)
+DISPATCH_INDEX_CANDIDATES = config('DISPATCH_INDEX_CANDIDATES', default=10, cast=int)
+DISPATCH_INDEX_REFRESH_SECONDS = config('DISPATCH_INDEX_REFRESH_SECONDS', default=30, cast=int)
+# Number of straight-line nearest drivers re-ranked by ETA before claiming one.
+# 1 keeps the plain nearest-by-distance behaviour.
+DISPATCH_ETA_CANDIDATES = config('DISPATCH_ETA_CANDIDATES', default=1, cast=int)
+# Extra nearest drivers read past the ranked ones so that positions still in
+# the location buffer (at most DRIVER_LOCATION_FLUSH_MS old in PostGIS) can
+# reorder them before the claim.
+DISPATCH_READ_THROUGH_CANDIDATES = config('DISPATCH_READ_THROUGH_CANDIDATES', default=4, cast=int)
+
+# Hours a service Idempotency-Key and its stored response are kept
+# (`manage.py purge_idempotency_keys` deletes older ones).
+SERVICE_IDEMPOTENCY_KEY_TTL_HOURS = config('SERVICE_IDEMPOTENCY_KEY_TTL_HOURS', default=24, cast=int)
+
+# Ranked fallback drivers stored per service for reassignment (0 disables) and
+# how far a fallback may have moved before the stored list is recomputed.
+DISPATCH_FALLBACK_CANDIDATES = config('DISPATCH_FALLBACK_CANDIDATES', default=5, cast=int)
+DISPATCH_FALLBACK_MAX_DRIFT_KM = config('DISPATCH_FALLBACK_MAX_DRIFT_KM', default=1.0, cast=float)
+
+# Seconds a user's driver role (see apps.drivers.roles) is cached. Creating or
+# deleting a driver clears the entry in the process that made the change.
+DRIVER_ROLE_CACHE_SECONDS = config('DRIVER_ROLE_CACHE_SECONDS', default=60, cast=int)
+
+# Maximum pings accepted by the bulk driver location endpoint in one request.
+DRIVER_LOCATION_BATCH_MAX_SIZE = config('DRIVER_LOCATION_BATCH_MAX_SIZE', default=5000, cast=int)
+# WebSocket route for streamed driver positions (see configs/asgi.py).
+DRIVER_LOCATION_STREAM_PATH = config('DRIVER_LOCATION_STREAM_PATH', default='/ws/v1/drivers/location/')
+# Streamed positions always go through the in-process location buffer; set
+# DRIVER_LOCATION_BUFFER_ENABLED to buffer the bulk endpoint as well.
+DRIVER_LOCATION_BUFFER_ENABLED = config('DRIVER_LOCATION_BUFFER_ENABLED', default=False, cast=bool)
+DRIVER_LOCATION_FLUSH_MS = config('DRIVER_LOCATION_FLUSH_MS', default=500, cast=int)
+# Pings are accepted from DRIVER_LOCATION_MAX_AGE_SECONDS in the past up to
+# DRIVER_LOCATION_MAX_FUTURE_SECONDS ahead of the server clock.
+DRIVER_LOCATION_MAX_AGE_SECONDS = config('DRIVER_LOCATION_MAX_AGE_SECONDS', default=86400, cast=int)
+DRIVER_LOCATION_MAX_FUTURE_SECONDS = config('DRIVER_LOCATION_MAX_FUTURE_SECONDS', default=300, cast=int)
+# Append every ping to the day-partitioned DriverLocationPing history and keep
+# DRIVER_LOCATION_HISTORY_RETENTION_DAYS days of it. Partitions are only created
+# by `manage.py manage_location_partitions`, which must run daily; pings outside
+# the retention window or later than tomorrow are not recorded.
+DRIVER_LOCATION_HISTORY_ENABLED = config('DRIVER_LOCATION_HISTORY_ENABLED', default=False, cast=bool)
+DRIVER_LOCATION_HISTORY_RETENTION_DAYS = config('DRIVER_LOCATION_HISTORY_RETENTION_DAYS', default=30, cast=int)
+
+# ETA engine used for estimated_arrival_minutes and ETA ranking. Use
+# 'apps.services.eta.RoadNetworkEtaEngine' with a graph built by
+# `manage.py build_road_graph` for road-network travel times.
+ETA_ENGINE = config('ETA_ENGINE', default='apps.services.eta.StraightLineEtaEngine')
+ETA_AVERAGE_SPEED_KMH = config('ETA_AVERAGE_SPEED_KMH', default=60.0, cast=float)
+ETA_ROAD_GRAPH_PATH = config('ETA_ROAD_GRAPH_PATH', default='')
+ETA_ACCESS_SPEED_KMH = config('ETA_ACCESS_SPEED_KMH', default=20.0, cast=float)
+ETA_MAX_SNAP_KM = config('ETA_MAX_SNAP_KM', default=1.0, cast=float)
+# Limits of the /services/eta-matrix/ endpoint: items per side and origin rows computed per block.
+ETA_MATRIX_MAX_SIZE = config('ETA_MATRIX_MAX_SIZE', default=500, cast=int)
+ETA_MATRIX_CHUNK_SIZE = config('ETA_MATRIX_CHUNK_SIZE', default=50, cast=int)
+
 # DRF Spectacular settings
 SPECTACULAR_SETTINGS = {
     "TITLE": "API - Assignment of Home Services",
@@ -19,4 +19,7 @@ SECRET_KEY = config('SECRET_KEY', default='unsafe-secret-key')
 # Use a faster password hasher for testing
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.MD5PasswordHasher',
-]
\ No newline at end of file
+]
+
+# Offloaded views would query on another thread's connection, outside the test transaction.
+ASGI_OFFLOAD_SYNC_VIEWS = False